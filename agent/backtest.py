@@ -13,6 +13,11 @@ accumulating in predictions/history.csv are the honest test.
 Usage:
     python -m agent.backtest --n-per-phase 5 --seed 42
     python -m agent.backtest --n-per-phase 3 --phase free-agent
+    python -m agent.backtest --http-fixtures record   # then: --http-fixtures replay
+
+--http-fixtures replay serves every stats tool call from responses saved by
+an earlier record run (agent/predict/http_fixtures.py), with no statsapi
+network I/O; a prediction that asks for anything not recorded fails.
 """
 
 import json
@@ -21,9 +26,11 @@ from datetime import datetime, timezone
 
 import pandas as pd
 
-from agent.config import BACKTESTS_DIR, CONTRACTS_CSV, DEFAULT_MODEL_ID, PLAYERS_CSV
+from agent import datasets
+from agent.config import BACKTESTS_DIR, CONTRACTS_CSV, DEFAULT_MODEL_ID, PLAYERS_CSV, STATS_API_FIXTURES
 from agent.metrics import calculate_all_metrics, format_metrics_report
-from agent.predict import run_prediction
+from agent.predict import mlb_stats_api, run_prediction
+from agent.predict.http_fixtures import add_fixture_arguments
 
 PHASES = ["pre-arb", "arb", "free-agent"]
 
@@ -43,8 +50,7 @@ CAVEAT = (
 
 def sample_contracts(n_per_phase, seed, phases):
     contracts = (
-        pd.read_csv(CONTRACTS_CSV)
-        .drop_duplicates(subset="contract_id")
+        datasets.load_contracts(CONTRACTS_CSV)
         .query("duration >= 1 and value > 0")
         .sort_values("contract_id")
         .reset_index(drop=True)
@@ -64,16 +70,23 @@ def main():
     parser.add_argument("--phase", choices=PHASES, action="append", dest="phases",
                         help="Restrict to one or more phases (default: all)")
     parser.add_argument("--model", default=DEFAULT_MODEL_ID, help="OpenAI model id")
+    add_fixture_arguments(parser)
     args = parser.parse_args()
     phases = args.phases or PHASES
+    if args.http_fixtures or args.http_fixtures_dir:
+        mlb_stats_api.use_http_fixtures(args.http_fixtures or STATS_API_FIXTURES, args.http_fixtures_dir)
+    fixtures = mlb_stats_api.HTTP_FIXTURES
 
     print(CAVEAT)
     print()
 
-    players = pd.read_csv(PLAYERS_CSV).set_index("player_id")
+    players = datasets.load_players(PLAYERS_CSV).set_index("player_id")
     sampled = sample_contracts(args.n_per_phase, args.seed, phases)
     print(f"Backtesting {len(sampled)} contracts ({args.n_per_phase}/phase, seed {args.seed}, "
-          f"model {args.model})\n")
+          f"model {args.model})")
+    if fixtures.active:
+        print(f"statsapi fixtures: {fixtures.mode} ({fixtures.directory})")
+    print()
 
     results = []
     for _, contract in sampled.iterrows():
@@ -95,7 +108,10 @@ def main():
             # force_predict: the backtest deliberately measures LLM accuracy against
             # known historical outcomes, so it must not take the known-contract shortcut.
             prediction, _ = run_prediction(player_row, year, args.model, quiet=True, force_predict=True)
+            # a replay gap reaches the model only as a tool error; fail the prediction instead
+            fixtures.raise_for_misses()
         except Exception as error:
+            fixtures.clear_misses()
             print(f"  FAILED: {error}")
             results.append({
                 "contract_id": contract["contract_id"],
@@ -144,6 +160,8 @@ def main():
             "model_id": args.model,
             "seed": args.seed,
             "n_per_phase": args.n_per_phase,
+            "http_fixtures": fixtures.mode,
+            "statsapi": mlb_stats_api.stats_api_status(),
             "caveat": CAVEAT,
             "results": results,
         }
@@ -153,6 +171,13 @@ def main():
     with open(summary_path, mode="w") as file:
         json.dump(summary, file, indent=2, default=str)
     print(f"\nSummary written to {summary_path}")
+    limiter = mlb_stats_api.STATS_LIMITER.snapshot()
+    if limiter["throttled"] or limiter["decreases"]:
+        print(f"statsapi throttled {limiter['throttled']} request(s) for {limiter['throttled_seconds']:.1f}s "
+              f"total; backed off {limiter['decreases']} time(s), now {limiter['rate']} req/s")
+    if fixtures.active:
+        print(f"statsapi fixtures: {fixtures.counters['recorded']} recorded, "
+              f"{fixtures.counters['replayed']} replayed")
     failures = len(results) - len(scored)
     if failures:
         print(f"{failures} prediction(s) failed — see summary JSON.")
@@ -15,6 +15,25 @@ load_dotenv(REPO_ROOT / ".env")
 CONTRACTS_CSV = REPO_ROOT / "dataset" / "contracts_spotrac.csv"
 PLAYERS_CSV = REPO_ROOT / "dataset" / "players.csv"
 
+# On-disk MLB Stats API response cache (agent/predict/stats_cache.py)
+STATS_CACHE_DIR = Path(os.environ.get("STATS_CACHE_DIR", REPO_ROOT / "dataset" / "statsapi_cache"))
+
+# Offline yearByYear history for every crosswalked player (agent/predict/stats_warehouse.py)
+STATS_WAREHOUSE_PATH = Path(os.environ.get("STATS_WAREHOUSE_PATH", REPO_ROOT / "dataset" / "statsapi_warehouse.parquet"))
+
+# Keep-alive connections held open to statsapi.mlb.com (agent/predict/mlb_stats_api.py)
+STATS_API_POOL_SIZE = int(os.environ.get("STATS_API_POOL_SIZE", "10"))
+
+# Most statsapi requests in flight at once, process-wide
+STATS_API_MAX_CONCURRENCY = int(os.environ.get("STATS_API_MAX_CONCURRENCY", "6"))
+
+# Starting (and highest) statsapi request rate, requests/second, process-wide (agent/predict/rate_limit.py)
+STATS_API_RATE_LIMIT = float(os.environ.get("STATS_API_RATE_LIMIT", "10"))
+
+# statsapi record/replay fixtures (agent/predict/http_fixtures.py): live, record, or replay
+STATS_API_FIXTURES = os.environ.get("STATS_API_FIXTURES", "live")
+STATS_API_FIXTURES_DIR = Path(os.environ.get("STATS_API_FIXTURES_DIR", REPO_ROOT / "dataset" / "statsapi_fixtures"))
+
 # Prediction output paths
 PREDICTIONS_DIR = REPO_ROOT / "predictions"
 TRACES_DIR = PREDICTIONS_DIR / "traces"
@@ -0,0 +1,188 @@
+"""Process-wide registry of the dataset CSVs the agent reads.
+
+One prediction touches the same two CSVs many times over: every
+query_comparable_contracts call, every resolve_phase, find_player, the
+actual-AAV lookup and the crosswalk all used to pd.read_csv their own copy
+(~25ms for contracts_spotrac.csv alone). The registry parses each file once
+per process and hands every caller the same frame until the file changes on
+disk -- a later call costs one os.stat().
+
+Frames are loaded the way every caller already wanted them:
+- deduplicated on their primary key (contracts by contract_id, players by
+  player_id -- players.csv carries exact duplicate rows from re-scrapes)
+- with tight dtypes: int16 year/age/duration, int32 fangraphs_id, category
+  for the low-cardinality contract type and position columns; value and
+  service_time stay float64 so arithmetic on them is unchanged
+- read-only: numeric columns are backed by non-writeable arrays, so an
+  in-place assignment raises instead of silently corrupting every other
+  caller's view. (String and category columns can't be locked the same way --
+  pandas' Cython helpers reject read-only object buffers -- so treat the whole
+  frame as read-only.) Filtering, merging and .copy() all produce ordinary writeable
+  frames; never add columns to a shared frame.
+
+Freshness is checked against the file's (mtime_ns, size) on every call, so a
+scrape that rewrites a CSV mid-session is picked up without a restart. The
+path is always the caller's, passed at call time: modules keep their own
+CONTRACTS_CSV/PLAYERS_CSV globals, so tests that monkeypatch those still point
+the registry at their fixture files.
+
+With DATASET_BACKEND=sqlite (data_generation/sqlite_store.py), the scrapers
+write contracts and players only to the SQLite database, so the registry
+reads those two from DATASET_DB_FILE instead of the (then stale) CSVs, and
+the caller's path is ignored. Unknown age/service_time come back as -1, as in
+the CSVs. Freshness is SQLite's PRAGMA data_version on a read connection kept
+per database (it changes whenever another connection commits), so a scrape
+committing mid-session is picked up the same way. The crosswalk is always
+read from its CSV.
+"""
+
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+# dataset kind -> (dedupe key column or None, {column: dtype})
+DATASET_SPECS = {
+    "contracts": (
+        "contract_id",
+        {"age": "int16", "year": "int16", "duration": "int16", "type": "category"},
+    ),
+    "players": ("player_id", {"fangraphs_id": "int32", "position": "category"}),
+    "crosswalk": ("player_id", {"mlbam_id": "Int64"}),
+}
+
+# Same settings data_generation/save.py and sqlite_store.py read
+DATASET_BACKEND = os.environ.get("DATASET_BACKEND", "csv")
+DATASET_DB_FILE = os.environ.get("DATASET_DB_FILE", "dataset/mlb_contracts.sqlite3")
+
+# dataset kind -> query against the SQLite backend, in CSV column order and sentinels
+SQLITE_QUERIES = {
+    "contracts": (
+        "SELECT contract_id, player_id, COALESCE(age, -1) AS age, COALESCE(service_time, -1) AS service_time, "
+        "year, duration, value, type FROM contracts ORDER BY rowid"
+    ),
+    "players": (
+        "SELECT player_id, fangraphs_id, first_name, last_name, position, spotrac_link FROM players ORDER BY rowid"
+    ),
+}
+
+_cache = {}  # (kind, path) -> (signature, DataFrame)
+_lock = threading.Lock()
+_sqlite_connections = {}  # database path -> (inode, read-only connection)
+_sqlite_lock = threading.Lock()
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _use_sqlite(kind):
+    return DATASET_BACKEND == "sqlite" and kind in SQLITE_QUERIES
+
+
+def _sqlite_connection(path):
+    """The kept-open read-only connection to a database, reopened if the file was replaced. Hold _sqlite_lock."""
+    inode = os.stat(path).st_ino
+    cached = _sqlite_connections.get(path)
+    if cached is not None and cached[0] == inode:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    _sqlite_connections[path] = (inode, conn)
+    return conn
+
+
+def _sqlite_signature(path):
+    """(inode, data_version): changes when the file is replaced or another connection commits."""
+    with _sqlite_lock:
+        conn = _sqlite_connection(path)
+        return (_sqlite_connections[path][0], conn.execute("PRAGMA data_version").fetchone()[0])
+
+
+def _read_sqlite(kind, path):
+    with _sqlite_lock:
+        return pd.read_sql_query(SQLITE_QUERIES[kind], _sqlite_connection(path))
+
+
+def _apply_dtype(series, dtype):
+    """series cast to dtype, or unchanged if the cast would lose information."""
+    if dtype == "category" or dtype == "Int64":
+        return series.astype(dtype)
+    if series.isna().any() or not pd.api.types.is_integer_dtype(series):
+        return series
+    info = np.iinfo(dtype)
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        return series
+    return series.astype(dtype)
+
+
+def _freeze(df):
+    """Rebuild df over non-writeable copies of its numeric column arrays."""
+    columns = {}
+    for name in df.columns:
+        values = df[name].array
+        if df[name].dtype.kind in "iufb":
+            values = df[name].to_numpy(copy=True)
+            values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)), copy=False)
+
+
+def _load(kind, path):
+    key_column, dtypes = DATASET_SPECS[kind]
+    df = _read_sqlite(kind, path) if _use_sqlite(kind) else pd.read_csv(path)
+    if key_column and key_column in df.columns:
+        df = df.drop_duplicates(subset=key_column)
+    for column, dtype in dtypes.items():
+        if column in df.columns:
+            df[column] = _apply_dtype(df[column], dtype)
+    return _freeze(df)
+
+
+def load(kind, path):
+    """The shared read-only frame for a dataset file, re-read only if it changed."""
+    if _use_sqlite(kind):
+        path = DATASET_DB_FILE
+        signature = _sqlite_signature(path)
+    else:
+        path = os.fspath(path)
+        signature = _signature(path)
+    cached = _cache.get((kind, path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _lock:
+        cached = _cache.get((kind, path))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        df = _load(kind, path)
+        _cache[(kind, path)] = (signature, df)
+        return df
+
+
+def load_contracts(path):
+    """contracts_spotrac.csv, deduplicated by contract_id."""
+    return load("contracts", path)
+
+
+def load_players(path):
+    """players.csv, deduplicated by player_id."""
+    return load("players", path)
+
+
+def load_crosswalk(path):
+    """mlbam_id_crosswalk.csv (player_id -> nullable mlbam_id)."""
+    return load("crosswalk", path)
+
+
+def clear():
+    """Drop every cached frame (tests; next load re-reads from disk)."""
+    with _lock:
+        _cache.clear()
+    with _sqlite_lock:
+        for _, conn in _sqlite_connections.values():
+            conn.close()
+        _sqlite_connections.clear()
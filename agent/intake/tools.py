@@ -8,6 +8,7 @@ itself so a parent (the orchestrator) can invoke it as a single tool call.
 import pandas as pd
 from strands import tool
 
+from agent import datasets
 from agent.config import PLAYERS_CSV
 from agent.phase import project_phase_timeline
 
@@ -32,7 +33,7 @@ def find_player(first_name: str = "", last_name: str = "", position: str = "") -
     if not first_name and not last_name:
         return {"matches": [], "note": "At least one of first_name or last_name is required."}
 
-    players = pd.read_csv(PLAYERS_CSV)
+    players = datasets.load_players(PLAYERS_CSV)
     mask = pd.Series(True, index=players.index)
     if first_name:
         mask &= players["first_name"].str.contains(first_name, case=False, na=False, regex=False)
@@ -16,6 +16,12 @@ agent/intake/resolver.py, which attach it as early as intake). Genuine
 forward/backward projections (method="projected") have no known_value — those
 years actually need a forecast.
 
+Lookups go through PhaseTable, which groups the whole contracts frame by
+player once per dataset version: resolve_phase is a binary search into it, and
+resolve_phases resolves arbitrary (player, year) arrays in one vectorized pass
+for league-wide jobs. _resolve_phase_scan is the original per-player
+filter-and-sort, kept as the reference the table is checked against.
+
 Known limitation (super-two): each year the top ~22% of 2+ service-time
 players qualify for arbitration a year early. Service-time thresholds alone
 will classify those players as pre-arb. Acceptable for Phase 0; a richer
@@ -29,10 +35,12 @@ can flow through the agent with the phase still resolved deterministically.
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+from agent import datasets
 from agent.config import CONTRACTS_CSV
-from agent.service_time import normalize_service_time
+from agent.service_time import normalize_service_time, normalize_service_time_array
 
 # Service time sentinel Spotrac uses when it stops tracking (free agents)
 UNKNOWN = -1
@@ -45,8 +53,6 @@ PHASE_PRE_ARB = "pre-arb"
 PHASE_ARB = "arb"
 PHASE_FA = "free-agent"
 
-_contracts_cache = None
-
 
 @dataclass
 class PhaseResolution:
@@ -61,14 +67,8 @@ class PhaseResolution:
 
 
 def load_contract_history(contracts_csv=None):
-    """Load the Spotrac contracts CSV, deduplicated by contract_id."""
-    global _contracts_cache
-    if contracts_csv is not None:
-        df = pd.read_csv(contracts_csv)
-        return df.drop_duplicates(subset="contract_id")
-    if _contracts_cache is None:
-        _contracts_cache = pd.read_csv(CONTRACTS_CSV).drop_duplicates(subset="contract_id")
-    return _contracts_cache
+    """Load the Spotrac contracts CSV, deduplicated by contract_id (shared, read-only)."""
+    return datasets.load_contracts(contracts_csv if contracts_csv is not None else CONTRACTS_CSV)
 
 
 def _phase_from_service_time(normalized_st):
@@ -79,6 +79,15 @@ def _phase_from_service_time(normalized_st):
     return PHASE_FA
 
 
+def _phase_from_service_time_array(normalized_st):
+    """_phase_from_service_time over an array (NaN, like the scalar, is free-agent)."""
+    return np.where(
+        normalized_st < ARB_THRESHOLD,
+        PHASE_PRE_ARB,
+        np.where(normalized_st < FA_THRESHOLD, PHASE_ARB, PHASE_FA),
+    ).astype(object)
+
+
 def _year_range(years):
     """[min, max] of a year collection, or None if empty."""
     if not years:
@@ -88,13 +97,16 @@ def _year_range(years):
 
 
 def _known_value(row):
-    """The actual on-record figure for a contract row, including its full year span."""
+    """The actual on-record figure for a contract row, including its full year span.
+
+    aav_millions is None for the odd zero-duration row (no per-year figure).
+    """
     duration = int(row["duration"])
     value = float(row["value"])
     start_year = int(row["year"])
     return {
         "contract_id": row["contract_id"],
-        "aav_millions": round(value / duration, 4),
+        "aav_millions": round(value / duration, 4) if duration else None,
         "duration_years": duration,
         "total_value_millions": value,
         "start_year": start_year,
@@ -111,6 +123,277 @@ def _estimate_age(rows, year):
     return int(latest["age"]) + (year - int(latest["year"]))
 
 
+# Resolution cases, in PhaseTable's vectorized decision order (mirrors the
+# branches of _resolve_phase_scan)
+_OBSERVED, _KNOWN, _PREDATES, _PREDATES_UNTRACKED, _AFTER_FA, _UNTRACKED, _PROJECTED = range(7)
+
+def _first_match(choices, default):
+    """np.select with (condition, value) pairs -- chained np.where, which is far
+    cheaper than np.select on the length-1 arrays of a single lookup."""
+    result = default
+    for condition, value in reversed(choices):
+        result = np.where(condition, value, result)
+    return result
+
+
+# Packs (player group, year) into one sortable int64: group in the high 32 bits
+_YEAR_OFFSET = 2**31
+
+
+class PhaseTable:
+    """Every player's contract history, grouped once, for bulk and O(log n) phase lookups.
+
+    Rows are deduplicated by contract_id and sorted by (player, year) -- stable,
+    so same-year contracts keep dataset order -- into flat column arrays, with
+    each player's history a contiguous [start, end) range. A (player, year)
+    query is one binary search over packed (player, year) keys: the insertion
+    point is the exact-year row if there is one, and everything before it in
+    the player's range is prior history. The per-player scalars resolve_phase
+    used to recompute (latest valid age, normalized service time per row) are
+    computed once for the whole table.
+
+    resolve_many() evaluates arbitrary (player, year) arrays with array
+    operations throughout; the only per-pair Python is formatting notes and
+    known_value dicts. resolve() is the same computation for a single pair.
+    """
+
+    def __init__(self, contracts_df):
+        df = contracts_df.drop_duplicates(subset="contract_id")
+        codes, players = pd.factorize(df["player_id"])
+        order = np.lexsort((df["year"].to_numpy(dtype=np.int64), codes))
+        order = order[codes[order] >= 0]
+        codes = codes[order]
+
+        self.players = players
+        self._group_of = {player_id: group for group, player_id in enumerate(players)}
+        self._starts = np.searchsorted(codes, np.arange(len(players)), side="left")
+        self._ends = np.searchsorted(codes, np.arange(len(players)), side="right")
+
+        # Raw columns keep their own dtypes so notes format exactly as the
+        # per-row scan's f-strings do
+        self.contract_id = df["contract_id"].to_numpy()[order]
+        self.type = df["type"].to_numpy()[order]
+        self.value = df["value"].to_numpy()[order]
+        self.raw_service_time = df["service_time"].to_numpy()[order]
+        self.year = df["year"].to_numpy(dtype=np.int64)[order]
+        self.duration = df["duration"].to_numpy(dtype=np.int64)[order]
+        self.age = df["age"].to_numpy()[order]
+
+        self._keys = self._pack(codes, self.year)
+        self._service_time_tracked = self.raw_service_time != UNKNOWN
+        self._service_time = normalize_service_time_array(
+            self.raw_service_time.astype(np.float64), unknown=None
+        )
+        # Latest row with a valid age per player (-1 if none), for _estimate_age
+        valid_age_rows = np.where(self.age != UNKNOWN, np.arange(len(order)), -1)
+        self._age_row = (
+            np.maximum.reduceat(valid_age_rows, self._starts)
+            if len(order) else np.array([], dtype=np.int64)
+        )
+
+    def __len__(self):
+        return len(self.year)
+
+    @staticmethod
+    def _pack(groups, years):
+        years = np.clip(np.asarray(years, dtype=np.int64), -_YEAR_OFFSET, _YEAR_OFFSET - 1)
+        return (np.asarray(groups, dtype=np.int64) << 32) | (years + _YEAR_OFFSET)
+
+    def _resolve_arrays(self, groups, years):
+        """Vectorized resolution for known player groups: a dict of per-pair arrays."""
+        groups = np.asarray(groups, dtype=np.int64)
+        years = np.asarray(years, dtype=np.int64)
+        starts, ends = self._starts[groups], self._ends[groups]
+        position = np.searchsorted(self._keys, self._pack(groups, years), side="left")
+        at = np.minimum(position, max(len(self) - 1, 0))
+        observed = (position < ends) & (self.year[at] == years)
+
+        # Latest earlier deal still running in the target year. Histories are
+        # short, so walk back one row per step across every pending pair.
+        covering = np.full(len(groups), -1, dtype=np.int64)
+        pending = ~observed
+        row = position - 1
+        while True:
+            active = pending & (row >= starts)
+            if not active.any():
+                break
+            safe = np.maximum(row, 0)
+            hit = active & (self.year[safe] + self.duration[safe] > years)
+            covering[hit] = row[hit]
+            pending &= ~hit
+            row -= 1
+
+        has_prior = position > starts
+        latest = np.maximum(position - 1, starts)
+        source = np.where(observed, position, covering)
+        case = _first_match(
+            [
+                (observed, _OBSERVED),
+                (covering >= 0, _KNOWN),
+                (~has_prior & self._service_time_tracked[starts], _PREDATES),
+                (~has_prior, _PREDATES_UNTRACKED),
+                (self.type[latest] == PHASE_FA, _AFTER_FA),
+                (~self._service_time_tracked[latest], _UNTRACKED),
+            ],
+            _PROJECTED,
+        )
+
+        safe_source = np.maximum(source, 0)
+        service_time = _first_match(
+            [
+                (case == _OBSERVED, self._service_time[safe_source]),
+                (case == _KNOWN, self._service_time[safe_source] + (years - self.year[safe_source])),
+                (case == _PREDATES, np.maximum(0.0, self._service_time[starts] - (self.year[starts] - years))),
+                (case == _PROJECTED, self._service_time[latest] + (years - self.year[latest])),
+            ],
+            np.nan,
+        )
+        on_record = (case == _OBSERVED) | (case == _KNOWN)
+        has_service_time = (case == _PREDATES) | (case == _PROJECTED) | (
+            on_record & self._service_time_tracked[safe_source]
+        )
+
+        projected_phase = _phase_from_service_time_array(service_time)
+        phase = _first_match(
+            [
+                (on_record, self.type[safe_source]),
+                (case == _PREDATES_UNTRACKED, PHASE_PRE_ARB),
+                (case == _AFTER_FA, PHASE_FA),
+                (case == _UNTRACKED, self.type[latest]),
+            ],
+            projected_phase,
+        )
+
+        age_row = self._age_row[groups]
+        safe_age_row = np.maximum(age_row, 0)
+        age = np.where(
+            age_row >= 0,
+            self.age[safe_age_row].astype(np.int64) + (years - self.year[safe_age_row]),
+            0,
+        )
+        return {
+            "case": case,
+            "phase": phase,
+            "service_time": service_time,
+            "has_service_time": has_service_time,
+            "age": age,
+            "has_age": age_row >= 0,
+            "source": source,
+            "start": starts,
+            "latest": latest,
+        }
+
+    def _known_value_at(self, row):
+        return _known_value({
+            "contract_id": self.contract_id[row],
+            "duration": self.duration[row],
+            "value": self.value[row],
+            "year": self.year[row],
+        })
+
+    def _notes(self, case, year, row_of, service_time):
+        """The notes _resolve_phase_scan attaches for one resolved pair."""
+        if case == _OBSERVED:
+            return []
+        if case == _KNOWN:
+            row = row_of["source"]
+            end_year = int(self.year[row]) + int(self.duration[row]) - 1
+            return [
+                f"under contract through {end_year} "
+                f"({self.contract_id[row]}: {int(self.duration[row])}yr/${self.value[row]}M {self.type[row]})"
+            ]
+        if case in (_PREDATES, _PREDATES_UNTRACKED):
+            return [f"target year {year} predates first recorded contract ({int(self.year[row_of['start']])})"]
+        latest = row_of["latest"]
+        if case == _AFTER_FA:
+            return [f"latest known contract ({int(self.year[latest])}) was free-agent"]
+        if case == _UNTRACKED:
+            return [
+                f"latest contract ({int(self.year[latest])}) has unknown service time; "
+                f"falling back to its type '{self.type[latest]}'"
+            ]
+        notes = [
+            f"projected from {int(self.year[latest])} service time "
+            f"{self.raw_service_time[latest]} -> {service_time:.2f} normalized service years"
+        ]
+        if service_time < ARB_THRESHOLD and service_time >= 2.0:
+            notes.append("super-two caveat: player may be arb-eligible a year early")
+        return notes
+
+    def _resolution(self, resolved, i, player_id, year):
+        case = int(resolved["case"][i])
+        row_of = {key: int(resolved[key][i]) for key in ("source", "start", "latest")}
+        service_time = float(resolved["service_time"][i]) if resolved["has_service_time"][i] else None
+        return PhaseResolution(
+            player_id=player_id,
+            year=year,
+            phase=resolved["phase"][i],
+            method="observed" if case == _OBSERVED else "known" if case == _KNOWN else "projected",
+            service_time_estimate=service_time,
+            age_estimate=int(resolved["age"][i]) if resolved["has_age"][i] else None,
+            notes=self._notes(case, year, row_of, service_time),
+            known_value=self._known_value_at(row_of["source"]) if case in (_OBSERVED, _KNOWN) else None,
+        )
+
+    def resolve(self, player_id, year):
+        """resolve_phase for one pair: a dict lookup plus one binary search.
+
+        Raises:
+            ValueError: if the player has no contract history at all
+        """
+        group = self._group_of.get(player_id)
+        if group is None:
+            raise ValueError(f"No contract history found for player_id={player_id}")
+        return self._resolution(self._resolve_arrays([group], [year]), 0, player_id, year)
+
+    def resolve_many(self, player_ids, years):
+        """Resolve arbitrary (player, year) arrays at once: a DataFrame, one row per pair.
+
+        Columns mirror PhaseResolution (service_time_estimate is NaN and
+        age_estimate <NA> where the scalar result would be None). Players with
+        no contract history get phase/method None instead of raising, so one
+        unknown id doesn't sink a league-wide job.
+        """
+        player_ids = list(player_ids)
+        years = [int(year) for year in years]
+        if len(player_ids) != len(years):
+            raise ValueError("player_ids and years must be the same length")
+        groups = np.array([self._group_of.get(player_id, -1) for player_id in player_ids], dtype=np.int64)
+        found = np.flatnonzero(groups >= 0)
+        resolved = self._resolve_arrays(groups[found], np.asarray(years, dtype=np.int64)[found])
+
+        records = [
+            {"player_id": player_id, "year": year, "phase": None, "method": None, "service_time_estimate": None,
+             "age_estimate": None, "notes": [], "known_value": None}
+            for player_id, year in zip(player_ids, years)
+        ]
+        for i, pair in enumerate(found.tolist()):
+            records[pair] = vars(self._resolution(resolved, i, player_ids[pair], years[pair]))
+        table = pd.DataFrame.from_records(records, columns=list(PhaseResolution.__dataclass_fields__))
+        table["service_time_estimate"] = table["service_time_estimate"].astype(np.float64)
+        table["age_estimate"] = table["age_estimate"].astype("Int64")
+        return table
+
+
+_table_cache = None
+
+
+def phase_table(contracts_df=None):
+    """The PhaseTable for this contracts frame, rebuilt only when the frame object changes.
+
+    The dataset registry hands out the same frame object until the CSV changes
+    on disk, so in practice this builds once per dataset version.
+    """
+    global _table_cache
+    df = contracts_df if contracts_df is not None else load_contract_history()
+    cached = _table_cache
+    if cached is not None and cached[0] is df:
+        return cached[1]
+    table = PhaseTable(df)
+    _table_cache = (df, table)
+    return table
+
+
 def resolve_phase(player_id, year, contracts_df=None):
     """Resolve a player's contract phase for a target year.
 
@@ -125,11 +408,25 @@ def resolve_phase(player_id, year, contracts_df=None):
     Raises:
         ValueError: if the player has no contract history at all
     """
+    return phase_table(contracts_df).resolve(player_id, year)
+
+
+def resolve_phases(player_ids, years, contracts_df=None):
+    """Bulk resolve_phase over (player, year) arrays; see PhaseTable.resolve_many."""
+    return phase_table(contracts_df).resolve_many(player_ids, years)
+
+
+def _resolve_phase_scan(player_id, year, contracts_df=None):
+    """Reference implementation: filter and sort the player's rows on every call.
+
+    Same arguments and output as resolve_phase; PhaseTable must match it
+    exactly (see agent/tests/test_phase.py and benchmarks/bench_phase.py).
+    """
     df = contracts_df if contracts_df is not None else load_contract_history()
     rows = (
         df[df["player_id"] == player_id]
         .drop_duplicates(subset="contract_id")
-        .sort_values("year")
+        .sort_values("year", kind="stable")
         .reset_index(drop=True)
     )
     if rows.empty:
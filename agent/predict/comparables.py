@@ -32,24 +32,236 @@ zero matches; service_time filtering elsewhere (pre-arb/arb, or no phase
 filter) works normally and just excludes untracked rows.
 """
 
+import inspect
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from strands import tool
 
+from agent import datasets
 from agent.config import CONTRACTS_CSV, PLAYERS_CSV
-from agent.service_time import normalize_service_time
+from agent.predict.comparables_index import ComparablesIndex
+from agent.service_time import normalize_service_time_array
 
 # Spotrac's sentinel for "service time not tracked" (free agents)
 UNKNOWN_SERVICE_TIME = -1
 
 
 def _load_contracts():
-    return pd.read_csv(CONTRACTS_CSV).drop_duplicates(subset="contract_id")
+    return datasets.load_contracts(CONTRACTS_CSV)
 
 
 def _load_players():
-    return pd.read_csv(PLAYERS_CSV)
+    return datasets.load_players(PLAYERS_CSV)
+
+
+# Contract-year width of the comparables view's era buckets (2010-2014, 2015-2019, ...)
+ERA_BUCKET_YEARS = 5
+
+# Keys of each match record, in order -- also the view frame's output columns
+MATCH_FIELDS = [
+    "contract_id",
+    "player_id",
+    "player_name",
+    "position",
+    "age",
+    "service_time",
+    "year",
+    "duration_years",
+    "value_millions",
+    "aav_millions",
+    "phase",
+]
+
+
+class ComparablesView:
+    """contracts x players, denormalized once into everything a query filters or returns.
+
+    frame holds one row per contract with the match-record fields already in
+    their final form (None, not NaN/-1, for missing values; AAV rounded), plus
+    the era bucket, so a query's output is just those columns at the matched rows.
+    The filter inputs are kept alongside as plain numpy arrays -- raw age
+    (including the -1 sentinel, which the age bounds have always compared
+    against as-is), year, phase, normalized service time (NaN if untracked) --
+    so a query is a handful of vectorized comparisons and no pandas indexing.
+    Positions are stored as codes into the unique position strings: a
+    substring match is evaluated once per distinct position, not per row.
+    """
+
+    def __init__(self, contracts_df, players_df):
+        df = contracts_df.merge(
+            players_df[["player_id", "first_name", "last_name", "position"]],
+            on="player_id",
+            how="left",
+        )
+        n = len(df)
+
+        normalized = normalize_service_time_array(df["service_time"].to_numpy(), unknown=UNKNOWN_SERVICE_TIME)
+        tracked = ~np.isnan(normalized)
+
+        first_names = df["first_name"].astype(object).to_numpy()
+        last_names = df["last_name"].astype(object).to_numpy()
+        has_name = pd.notna(first_names) & pd.notna(last_names)
+        player_names = np.full(n, None, dtype=object)
+        player_names[has_name] = [f"{first} {last}" for first, last in zip(first_names[has_name], last_names[has_name])]
+
+        positions = df["position"].astype(object).to_numpy()
+        has_position = pd.notna(positions)
+        self.position_values, position_codes = np.unique(positions[has_position].astype(str), return_inverse=True)
+        self.position_codes = np.full(n, -1, dtype=np.int32)
+        self.position_codes[has_position] = position_codes
+
+        ages = df["age"].to_numpy()
+        age_values = np.full(n, None, dtype=object)
+        known_age = pd.notna(ages) & (ages != -1)
+        age_values[known_age] = [int(age) for age in ages[known_age]]
+
+        values = df["value"].to_numpy(dtype=float)
+        durations = df["duration"].to_numpy()
+        years = df["year"].to_numpy()
+
+        self.frame = pd.DataFrame(
+            {
+                "contract_id": df["contract_id"].to_numpy(),
+                "player_id": df["player_id"].to_numpy(),
+                "player_name": player_names,
+                "position": np.where(has_position, positions, None),
+                "age": age_values,
+                "service_time": np.where(tracked, normalized, None),
+                "year": years.astype(np.int64),
+                "duration_years": durations.astype(np.int64),
+                "value_millions": values,
+                # duration-0 rows exist in the Spotrac data; they have no AAV
+                "aav_millions": np.array(
+                    [round(float(v) / int(d), 4) if d >= 1 else None for v, d in zip(values, durations)],
+                    dtype=object,
+                ),
+                "phase": df["type"].astype(object).to_numpy(),
+                "era": years - years % ERA_BUCKET_YEARS,
+            }
+        )
+        self.player_id = self.frame["player_id"].to_numpy()
+        self.phase = self.frame["phase"].to_numpy()
+        self.age = ages
+        self.year = years
+        self.service_time = normalized
+        self._index = None
+        self._output_columns = None
+
+    def __len__(self):
+        return len(self.frame)
+
+    def matching_positions(self, position):
+        """Per distinct position string: case-insensitive substring match (str.contains semantics)."""
+        needle = position.upper()
+        return np.array([needle in value.upper() for value in self.position_values], dtype=bool)
+
+    def position_mask(self, position):
+        matching_codes = self.matching_positions(position)
+        mask = np.zeros(len(self), dtype=bool)
+        known = self.position_codes >= 0
+        mask[known] = matching_codes[self.position_codes[known]]
+        return mask
+
+    @property
+    def index(self):
+        """ComparablesIndex over this view, built on first use."""
+        if self._index is None:
+            self._index = ComparablesIndex(self)
+        return self._index
+
+    def records(self, rows):
+        """Match records for view row positions, in the given order.
+
+        Zips per-column .tolist() slices rather than frame.iloc[rows].to_dict(
+        "records"): same native-Python values, but ~40us for a page of 15
+        instead of ~1ms of pandas overhead.
+        """
+        if self._output_columns is None:
+            self._output_columns = [self.frame[name].to_numpy() for name in MATCH_FIELDS]
+        rows = np.asarray(rows, dtype=np.int64)
+        return [dict(zip(MATCH_FIELDS, values)) for values in zip(*(column[rows].tolist() for column in self._output_columns))]
+
+
+_view_cache = None  # (contracts_df, players_df, ComparablesView) for the last pair seen
+
+
+def comparables_view(contracts_df, players_df):
+    """The ComparablesView for these frames, rebuilt only when either frame object changes.
+
+    The dataset registry hands out the same frame objects until a CSV changes
+    on disk, so in practice this builds once per dataset version.
+    """
+    global _view_cache
+    cached = _view_cache
+    if cached is not None and cached[0] is contracts_df and cached[1] is players_df:
+        return cached[2]
+    view = ComparablesView(contracts_df, players_df)
+    _view_cache = (contracts_df, players_df, view)
+    return view
+
+
+def _validate_query(phase, min_service_time, max_service_time):
+    has_service_time_bound = min_service_time is not None or max_service_time is not None
+    if phase == "free-agent" and has_service_time_bound:
+        raise ValueError(
+            "service_time is never tracked for free-agent contracts (Spotrac doesn't "
+            "record it once a player reaches free agency), so phase='free-agent' "
+            "combined with min_service_time/max_service_time can never match anything. "
+            "Drop the service_time bound and use age/position/phase instead for "
+            "free-agent comparables."
+        )
+    return has_service_time_bound
+
+
+def _query_mask(
+    view,
+    player_id="",
+    position="",
+    phase="",
+    min_age=None,
+    max_age=None,
+    min_service_time=None,
+    max_service_time=None,
+    min_year=None,
+    max_year=None,
+    exclude_player_id="",
+    before_year=None,
+):
+    has_service_time_bound = _validate_query(phase, min_service_time, max_service_time)
+
+    mask = np.ones(len(view), dtype=bool)
+    if before_year is not None:
+        mask &= view.year < before_year
+    if player_id:
+        mask &= view.player_id == player_id
+    if exclude_player_id:
+        mask &= view.player_id != exclude_player_id
+    if position:
+        mask &= view.position_mask(position)
+    if phase:
+        mask &= view.phase == phase
+    if min_age is not None:
+        mask &= view.age >= min_age
+    if max_age is not None:
+        mask &= view.age <= max_age
+    if min_year is not None:
+        mask &= view.year >= min_year
+    if max_year is not None:
+        mask &= view.year <= max_year
+
+    if has_service_time_bound:
+        # Not free-agent-restricted (that case already raised above), but rows
+        # with no tracked service time (all free-agent rows, if phase is unset)
+        # still can't be meaningfully compared -- exclude rather than error,
+        # since this call didn't specifically ask for free-agent rows.
+        mask &= ~np.isnan(view.service_time)
+        if min_service_time is not None:
+            mask &= view.service_time >= min_service_time
+        if max_service_time is not None:
+            mask &= view.service_time <= max_service_time
+    return mask
 
 
 def _query_comparable_contracts(
@@ -81,87 +293,84 @@ def _query_comparable_contracts(
     no-lookahead guard described in the module docstring. None here means
     "no cutoff," used only by tests; real callers always go through
     make_comparable_contracts_tool(), which always supplies it.
-    """
-    has_service_time_bound = min_service_time is not None or max_service_time is not None
-    if phase == "free-agent" and has_service_time_bound:
-        raise ValueError(
-            "service_time is never tracked for free-agent contracts (Spotrac doesn't "
-            "record it once a player reaches free agency), so phase='free-agent' "
-            "combined with min_service_time/max_service_time can never match anything. "
-            "Drop the service_time bound and use age/position/phase instead for "
-            "free-agent comparables."
-        )
 
-    df = contracts_df.merge(
-        players_df[["player_id", "first_name", "last_name", "position"]],
-        on="player_id",
-        how="left",
-    )
-    df["service_time_normalized"] = df["service_time"].apply(
-        lambda st: None if st == UNKNOWN_SERVICE_TIME else normalize_service_time(st)
+    Matches are ordered newest year first; contracts from the same year keep
+    their dataset order.
+    """
+    has_service_time_bound = _validate_query(phase, min_service_time, max_service_time)
+    view = comparables_view(contracts_df, players_df)
+    rows, total = view.index.query(
+        player_id=player_id,
+        position=position,
+        phase=phase,
+        min_age=min_age,
+        max_age=max_age,
+        min_service_time=min_service_time,
+        max_service_time=max_service_time,
+        min_year=min_year,
+        max_year=max_year,
+        exclude_player_id=exclude_player_id,
+        before_year=before_year,
+        limit=limit,
+        has_service_time_bound=has_service_time_bound,
     )
+    return {"matches": view.records(rows), "n_matches_before_limit": total}
 
-    mask = pd.Series(True, index=df.index)
-    if before_year is not None:
-        mask &= df["year"] < before_year
-    if player_id:
-        mask &= df["player_id"] == player_id
-    if exclude_player_id:
-        mask &= df["player_id"] != exclude_player_id
-    if position:
-        mask &= df["position"].str.contains(position, case=False, na=False, regex=False)
-    if phase:
-        mask &= df["type"] == phase
-    if min_age is not None:
-        mask &= df["age"] >= min_age
-    if max_age is not None:
-        mask &= df["age"] <= max_age
-    if min_year is not None:
-        mask &= df["year"] >= min_year
-    if max_year is not None:
-        mask &= df["year"] <= max_year
 
-    if has_service_time_bound:
-        # Not free-agent-restricted (that case already raised above), but rows
-        # with no tracked service time (all free-agent rows, if phase is unset)
-        # still can't be meaningfully compared -- exclude rather than error,
-        # since this call didn't specifically ask for free-agent rows.
-        mask &= df["service_time_normalized"].notna()
-        if min_service_time is not None:
-            mask &= df["service_time_normalized"] >= min_service_time
-        if max_service_time is not None:
-            mask &= df["service_time_normalized"] <= max_service_time
+def _scan_comparable_contracts(contracts_df, players_df, limit=15, **filters):
+    """Reference implementation: full boolean-mask scan of the view, then a stable year sort.
 
-    matches = df[mask].sort_values("year", ascending=False)
-    total_before_limit = len(matches)
-    matches = matches.head(limit)
+    Same arguments and output as _query_comparable_contracts; the indexed
+    engine must match it exactly (see benchmarks/bench_comparables.py).
+    """
+    view = comparables_view(contracts_df, players_df)
+    rows = np.flatnonzero(_query_mask(view, **filters))
+    rows = rows[np.argsort(-view.year[rows].astype(np.int64), kind="stable")]
+    return {"matches": view.records(rows[:limit]), "n_matches_before_limit": len(rows)}
 
-    records = []
-    for _, row in matches.iterrows():
-        has_name = pd.notna(row.get("first_name")) and pd.notna(row.get("last_name"))
-        records.append(
-            {
-                "contract_id": row["contract_id"],
-                "player_id": row["player_id"],
-                "player_name": f"{row['first_name']} {row['last_name']}" if has_name else None,
-                "position": row["position"] if pd.notna(row["position"]) else None,
-                "age": None if pd.isna(row["age"]) or row["age"] == -1 else int(row["age"]),
-                # pandas coerces the None from the lambda above to NaN in a float
-                # Series -- normalize back to None here (same pattern as age above).
-                "service_time": (
-                    None
-                    if pd.isna(row["service_time_normalized"])
-                    else row["service_time_normalized"]
-                ),
-                "year": int(row["year"]),
-                "duration_years": int(row["duration"]),
-                "value_millions": float(row["value"]),
-                "aav_millions": round(float(row["value"]) / int(row["duration"]), 4),
-                "phase": row["type"],
-            }
+
+# Keyword arguments (and defaults) a batch query spec may carry
+_QUERY_DEFAULTS = {
+    name: parameter.default
+    for name, parameter in inspect.signature(_query_comparable_contracts).parameters.items()
+    if parameter.default is not inspect.Parameter.empty
+}
+
+
+def _query_comparable_contracts_batch(contracts_df, players_df, specs):
+    """Answer many query specs in one pass; a list of results in input order.
+
+    Each spec is a dict of _query_comparable_contracts keyword arguments and
+    gets exactly the result that call would return. Unlike the single-query
+    entry point, before_year is REQUIRED in every spec -- batches come from
+    backtests and league-wide jobs, which evaluate many different as-of
+    years at once, so there's no safe default cutoff and a spec without one
+    raises ValueError instead of silently seeing future contracts.
+
+    Every spec is validated before any is evaluated; the filters are then
+    computed together by ComparablesIndex.query_batch.
+    """
+    normalized = []
+    for position, spec in enumerate(specs):
+        unknown = set(spec) - set(_QUERY_DEFAULTS)
+        if unknown:
+            raise TypeError(f"spec {position}: unexpected query arguments {sorted(unknown)}")
+        if spec.get("before_year") is None:
+            raise ValueError(
+                f"spec {position}: before_year is required for batch queries -- every spec "
+                "needs its own no-lookahead cutoff"
+            )
+        spec = {**_QUERY_DEFAULTS, **spec}
+        spec["has_service_time_bound"] = _validate_query(
+            spec["phase"], spec["min_service_time"], spec["max_service_time"]
         )
+        normalized.append(spec)
 
-    return {"matches": records, "n_matches_before_limit": total_before_limit}
+    view = comparables_view(contracts_df, players_df)
+    return [
+        {"matches": view.records(rows), "n_matches_before_limit": total}
+        for rows, total in view.index.query_batch(normalized)
+    ]
 
 
 def make_comparable_contracts_tool(before_year):
@@ -0,0 +1,267 @@
+"""In-memory index over a ComparablesView, for query_comparable_contracts.
+
+The full-scan query (comparables._scan_comparable_contracts) evaluates every
+filter against all ~15k contracts and then sorts the matches by year, on
+every call -- and a prediction makes several calls, a backtest hundreds.
+ComparablesIndex is built once per view (i.e. once per dataset version) and
+answers the same queries from a smaller candidate set:
+
+- Rows are stored pre-sorted by year descending (stable, so same-year
+  contracts keep dataset order). That is the result order, so the year
+  bounds and the no-lookahead before_year cutoff are a single contiguous
+  slice found by binary search, and the top-k matches are simply the first k
+  surviving candidates -- the match set is never sorted.
+- player_id, phase and each distinct position string have an inverted list
+  of (sorted) row positions. A position query is a case-insensitive
+  substring match, evaluated once per distinct position string, and its
+  candidates are the union of the matching strings' lists.
+- age and normalized service time have argsorted copies, so a range bound is
+  two binary searches.
+
+A query takes the most selective of those candidate sources, restricted to
+the year slice, and evaluates every filter on just those rows -- the index
+only ever narrows candidates, it never decides a match on its own, so results
+are identical to the full scan's by construction (and checked in
+agent/predict/tests/test_comparables_index.py and
+benchmarks/bench_comparables.py).
+
+query_batch() answers many specs in one pass (league-wide jobs, backtests):
+specs are grouped by their year slice and the filters become broadcast
+comparisons over a (specs x contracts) boolean matrix per group, with each
+distinct categorical value matched once per group.
+"""
+
+import numpy as np
+
+# Specs evaluated per (specs x contracts) boolean matrix in query_batch --
+# 256 x 15k contracts is a ~4MB matrix
+BATCH_CHUNK_SPECS = 256
+
+
+def _inverted_lists(keys):
+    """{key: sorted positions} for a 1-D array of hashable keys."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    starts = np.concatenate([[0], boundaries]) if len(keys) else np.array([], dtype=np.int64)
+    ends = np.concatenate([boundaries, [len(keys)]]) if len(keys) else np.array([], dtype=np.int64)
+    return {sorted_keys[start]: order[start:end] for start, end in zip(starts, ends)}
+
+
+def _range_positions(order, sorted_values, low, high):
+    """Positions whose value lies in [low, high], from an argsort; NaNs are never included."""
+    start = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+    if high is None:
+        end = len(sorted_values) - int(np.isnan(sorted_values).sum()) if sorted_values.dtype.kind == "f" else len(sorted_values)
+    else:
+        end = int(np.searchsorted(sorted_values, high, side="right"))
+    return np.sort(order[start:max(start, end)])
+
+
+class ComparablesIndex:
+    """Year-sorted columns plus inverted lists and range arrays over one ComparablesView."""
+
+    def __init__(self, view):
+        self.view = view
+        self.order = np.argsort(-view.year.astype(np.int64), kind="stable")
+
+        self.year = view.year[self.order].astype(np.int64)
+        self._neg_year = -self.year  # ascending, for searchsorted
+        self.age = view.age[self.order]
+        self.service_time = view.service_time[self.order]
+        self.player_id = view.player_id[self.order]
+        self.phase = view.phase[self.order]
+        self.position_codes = view.position_codes[self.order]
+
+        self.by_player = _inverted_lists(self.player_id)
+        self.by_phase = _inverted_lists(self.phase.astype(str))
+        by_code = _inverted_lists(self.position_codes)
+        self.by_position = [by_code.get(code, np.array([], dtype=np.int64)) for code in range(len(view.position_values))]
+
+        self._age_order = np.argsort(self.age, kind="stable")
+        self._age_sorted = self.age[self._age_order]
+        self._service_time_order = np.argsort(self.service_time, kind="stable")
+        self._service_time_sorted = self.service_time[self._service_time_order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def _year_slice(self, min_year, max_year, before_year):
+        """[start, end) of positions whose year satisfies every year bound."""
+        start, end = 0, len(self)
+        if max_year is not None:
+            start = max(start, int(np.searchsorted(self._neg_year, -max_year, side="left")))
+        if before_year is not None:
+            start = max(start, int(np.searchsorted(self._neg_year, -before_year, side="right")))
+        if min_year is not None:
+            end = min(end, int(np.searchsorted(self._neg_year, -min_year, side="right")))
+        return start, max(start, end)
+
+    def query(
+        self,
+        player_id="",
+        position="",
+        phase="",
+        min_age=None,
+        max_age=None,
+        min_service_time=None,
+        max_service_time=None,
+        min_year=None,
+        max_year=None,
+        exclude_player_id="",
+        before_year=None,
+        limit=15,
+        has_service_time_bound=False,
+    ):
+        """(view rows of the first `limit` matches in result order, total match count)."""
+        start, end = self._year_slice(min_year, max_year, before_year)
+
+        position_match = None
+        sources = []
+        if player_id:
+            sources.append(self.by_player.get(player_id, np.array([], dtype=np.int64)))
+        if phase:
+            sources.append(self.by_phase.get(phase, np.array([], dtype=np.int64)))
+        if position:
+            position_match = self.view.matching_positions(position)
+            lists = [self.by_position[code] for code in np.flatnonzero(position_match)]
+            sources.append(np.sort(np.concatenate(lists)) if lists else np.array([], dtype=np.int64))
+        if min_age is not None or max_age is not None:
+            sources.append(_range_positions(self._age_order, self._age_sorted, min_age, max_age))
+        if has_service_time_bound:
+            sources.append(
+                _range_positions(
+                    self._service_time_order, self._service_time_sorted, min_service_time, max_service_time
+                )
+            )
+
+        if sources:
+            smallest = min(sources, key=len)
+            lo, hi = np.searchsorted(smallest, [start, end])
+            candidates = smallest[lo:hi]
+        else:
+            candidates = np.arange(start, end)
+
+        mask = np.ones(len(candidates), dtype=bool)
+        if player_id:
+            mask &= self.player_id[candidates] == player_id
+        if exclude_player_id:
+            mask &= self.player_id[candidates] != exclude_player_id
+        if position_match is not None:
+            codes = self.position_codes[candidates]
+            mask &= (codes >= 0) & position_match[np.maximum(codes, 0)]
+        if phase:
+            mask &= self.phase[candidates] == phase
+        if min_age is not None:
+            mask &= self.age[candidates] >= min_age
+        if max_age is not None:
+            mask &= self.age[candidates] <= max_age
+        if has_service_time_bound:
+            service_time = self.service_time[candidates]
+            mask &= ~np.isnan(service_time)
+            if min_service_time is not None:
+                mask &= service_time >= min_service_time
+            if max_service_time is not None:
+                mask &= service_time <= max_service_time
+
+        matches = candidates[mask]
+        return self.order[matches[:limit]], len(matches)
+
+    def query_batch(self, specs, chunk_size=None):
+        """query() for many specs at once: [(view rows, total), ...] in spec order.
+
+        Each spec is a dict with every query() keyword. The year bounds of all
+        specs become column slices in one vectorized binary search; specs are
+        then grouped by slice into chunks, and each chunk is evaluated as one
+        (chunk x columns) boolean matrix over just the columns its slices
+        span -- every numeric bound is a broadcast comparison across the
+        chunk, and each distinct player_id / phase / position value is
+        matched once per chunk however many specs share it. Results are
+        identical to calling query() per spec.
+        """
+        chunk_size = chunk_size or BATCH_CHUNK_SPECS
+        starts, ends = self._year_slices(specs)
+        by_slice = np.lexsort((ends, starts))
+        results = [None] * len(specs)
+        for offset in range(0, len(specs), chunk_size):
+            chunk = by_slice[offset:offset + chunk_size]
+            chunk_results = self._query_chunk([specs[i] for i in chunk], starts[chunk], ends[chunk])
+            for i, result in zip(chunk, chunk_results):
+                results[i] = result
+        return results
+
+    def _year_slices(self, specs):
+        """Vectorized _year_slice over every spec: (starts, ends) arrays."""
+        def bounds(key, missing):
+            return np.array(
+                [missing if spec[key] is None else spec[key] for spec in specs], dtype=np.float64
+            )
+
+        starts = np.maximum(
+            np.searchsorted(self._neg_year, -bounds("max_year", np.inf), side="left"),
+            np.searchsorted(self._neg_year, -bounds("before_year", np.inf), side="right"),
+        )
+        ends = np.searchsorted(self._neg_year, -bounds("min_year", -np.inf), side="right")
+        return starts, np.maximum(starts, ends)
+
+    def _query_chunk(self, specs, starts, ends):
+        lo = int(starts.min())
+        hi = max(lo, int(ends.max()))
+        columns = np.arange(lo, hi)
+        mask = (columns[None, :] >= starts[:, None]) & (columns[None, :] < ends[:, None])
+
+        def apply_bound(key, values, compare):
+            rows = np.flatnonzero([spec[key] is not None for spec in specs])
+            if not len(rows):
+                return
+            bounds = np.array([specs[row][key] for row in rows], dtype=np.float64)[:, None]
+            mask[rows] &= compare(values[None, lo:hi], bounds)
+
+        apply_bound("min_age", self.age, np.greater_equal)
+        apply_bound("max_age", self.age, np.less_equal)
+
+        service_time_rows = np.flatnonzero([spec["has_service_time_bound"] for spec in specs])
+        if len(service_time_rows):
+            mask[service_time_rows] &= ~np.isnan(self.service_time[lo:hi])[None, :]
+            apply_bound("min_service_time", self.service_time, np.greater_equal)
+            apply_bound("max_service_time", self.service_time, np.less_equal)
+
+        player_masks = {}
+        phase_masks = {}
+        position_masks = {}
+        for row, spec in enumerate(specs):
+            for key, memo, negate in (
+                ("player_id", player_masks, False),
+                ("exclude_player_id", player_masks, True),
+                ("phase", phase_masks, False),
+                ("position", position_masks, False),
+            ):
+                value = spec[key]
+                if not value:
+                    continue
+                if value not in memo:
+                    memo[value] = self._value_mask(key, value)[lo:hi]
+                mask[row] &= ~memo[value] if negate else memo[value]
+
+        counts = mask.sum(axis=1)
+        return [
+            (self.order[lo + np.flatnonzero(mask[row])[:spec["limit"]]], int(counts[row]))
+            for row, spec in enumerate(specs)
+        ]
+
+    def _value_mask(self, key, value):
+        """Full-length mask (in index order) for one categorical filter value.
+
+        Built from the inverted lists rather than by comparing the object
+        arrays, which costs a string comparison per contract.
+        """
+        if key in ("player_id", "exclude_player_id"):
+            positions = [self.by_player.get(value, np.array([], dtype=np.int64))]
+        elif key == "phase":
+            positions = [self.by_phase.get(value, np.array([], dtype=np.int64))]
+        else:
+            positions = [self.by_position[code] for code in np.flatnonzero(self.view.matching_positions(value))]
+        mask = np.zeros(len(self), dtype=bool)
+        for rows in positions:
+            mask[rows] = True
+        return mask
@@ -0,0 +1,119 @@
+"""Record/replay fixtures for statsapi responses, for deterministic backtests.
+
+    python -m agent.backtest --http-fixtures record    # live, saving every response
+    python -m agent.backtest --http-fixtures replay    # no statsapi network I/O at all
+
+(or STATS_API_FIXTURES=record|replay in the environment; agent.predict takes
+the same flag). Every request mlb_stats_api._get_json makes is keyed by the
+SHA-256 of its canonical (url, params) and stored as one JSON file under
+STATS_API_FIXTURES_DIR/<first 2 hex>/<key>.json, so the same request always
+maps to the same file, whoever recorded it and in whatever order.
+
+While a fixture mode is active, mlb_stats_api skips the disk cache, the
+offline warehouse and batched /people prefetches: every lookup is one
+per-player request, so what gets recorded (and replayed) depends only on
+which players and groups were asked for, never on what happened to be
+cached locally or which other players shared a batch.
+
+Replay never touches the network. A request with no recorded response
+raises FixtureMissError, and is also remembered in `misses`: the stats tools
+run inside the agent framework, which hands tool exceptions back to the
+model as tool errors, so callers check raise_for_misses() after each
+prediction to make a replay gap fail the run instead of quietly changing
+the model's inputs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+MODES = ("live", "record", "replay")
+
+
+class FixtureMissError(LookupError):
+    """A replayed request had no recorded response."""
+
+
+def add_fixture_arguments(parser):
+    """The shared --http-fixtures / --http-fixtures-dir CLI flags."""
+    parser.add_argument("--http-fixtures", choices=MODES,
+                        help="Record statsapi responses, or replay them with no network I/O "
+                             "(default: $STATS_API_FIXTURES, else live)")
+    parser.add_argument("--http-fixtures-dir", type=Path,
+                        help="Fixture store directory (default: $STATS_API_FIXTURES_DIR)")
+
+
+class FixtureStore:
+    """Request-keyed response store in one mode: live (unused), record, or replay."""
+
+    def __init__(self, directory, mode="live"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP fixture mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.misses = []
+        self.counters = {"recorded": 0, "replayed": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.mode != "live"
+
+    @staticmethod
+    def key(url, params):
+        canonical = json.dumps(
+            {"url": url, "params": {name: str(value) for name, value in (params or {}).items()}},
+            sort_keys=True,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def record(self, url, params, body):
+        """Save one response, atomically (temp file + os.replace)."""
+        path = self._path(self.key(url, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump({"url": url, "params": params, "body": body}, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self.counters["recorded"] += 1
+
+    def replay(self, url, params):
+        """The recorded body for this request; FixtureMissError if there isn't one."""
+        key = self.key(url, params)
+        try:
+            with open(self._path(key)) as file:
+                body = json.load(file)["body"]
+        except FileNotFoundError:
+            with self._lock:
+                self.misses.append((url, params))
+            raise FixtureMissError(
+                f"No recorded statsapi response for GET {url} {params or {}} (fixture {key[:12]} "
+                f"in {self.directory}); re-run with --http-fixtures record"
+            ) from None
+        with self._lock:
+            self.counters["replayed"] += 1
+        return body
+
+    def clear_misses(self):
+        with self._lock:
+            self.misses = []
+
+    def raise_for_misses(self):
+        """Raise FixtureMissError listing every replay miss since the last call, then reset."""
+        with self._lock:
+            misses, self.misses = self.misses, []
+        if misses:
+            listed = "; ".join(f"{url} {params or {}}" for url, params in misses[:5])
+            more = f" (+{len(misses) - 5} more)" if len(misses) > 5 else ""
+            raise FixtureMissError(f"{len(misses)} statsapi request(s) missing from {self.directory}: {listed}{more}")
@@ -36,21 +36,93 @@ with exponential backoff (3 attempts: 0.5s/1s/2s) before raising; a
 definitive client error (e.g. 404) raises immediately, no wasted retries.
 Either way the model sees a real tool failure, not a silent empty result --
 same principle as the free-agent+service_time guard in comparables.py.
+
+Pacing: every attempt also goes through one process-wide AdaptiveRateLimiter
+(STATS_API_RATE_LIMIT requests/second, agent/config.py), which slows down on
+429/5xx and speeds back up on success, and a CircuitBreaker that fails calls
+fast once the API looks down (agent/predict/rate_limit.py). A stale cached
+copy is still served while the circuit is open; stats_api_status() reports
+both alongside the cache and coalescing counters.
+
+Connections: every request goes through one process-wide requests.Session
+whose HTTPAdapter keeps up to STATS_API_POOL_SIZE (agent/config.py) keep-alive
+connections open, so only the first request pays the TCP+TLS handshake. The
+adapter's own retries are off -- retrying stays in _get_json, above.
+
+Fan-out: a multi-player lookup fetches its players concurrently on one
+process-wide pool of STATS_API_MAX_CONCURRENCY threads (agent/config.py), so
+a 12-comparable call costs about one round trip instead of twelve, and
+however many tool calls run at once the API never sees more than that many
+requests in flight from us.
+
+Batching: before fanning out, _query_stats asks the cache which players it
+can't already answer and fetches all of them at once --
+
+    GET /api/v1/people?personIds=a,b,c&hydrate=stats(group=[hitting,pitching],type=yearByYear)
+
+in chunks of STATS_BATCH_SIZE ids, caching both groups per player. One
+prediction's batting AND pitching lookups for the target and every
+comparable then cost one request (per chunk) instead of one per player per
+group, and the per-player calls that follow are cache hits. Any player the
+batch can't answer -- the batch request failed, or the person is missing
+from its response -- simply falls through to the per-player call.
+
+Coalescing: concurrent callers (parallel web sessions, backtest workers)
+asking for the same (mlbam_id, group) share one in-flight request, batched
+or per-player, via STATS_FLIGHT (agent/predict/single_flight.py); its
+counters report how many requests were coalesced away.
+
+Caching: responses go through the on-disk StatsCache
+(agent/predict/stats_cache.py). Seasons already complete when fetched are
+never refetched; a request reaching into the in-progress season refetches
+after a short TTL, serving the stale copy if the API is slow.
+
+Warehouse: ahead of all of the above, a player covered by the offline stats
+warehouse (agent/predict/stats_warehouse.py, built by its `refresh` command)
+has every season before the warehouse's refresh season answered locally;
+only later seasons -- the in-progress one -- are still fetched, and a
+lookup that doesn't reach them makes no request at all.
+
+Fixtures: with HTTP_FIXTURES in record or replay mode
+(agent/predict/http_fixtures.py), every response is saved to / served from
+a request-keyed fixture store instead, and the cache, warehouse and batched
+prefetch are all bypassed so backtests replay deterministically.
 """
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 import requests
 from strands import tool
 
+from agent.config import (
+    STATS_API_FIXTURES,
+    STATS_API_FIXTURES_DIR,
+    STATS_API_MAX_CONCURRENCY,
+    STATS_API_POOL_SIZE,
+    STATS_API_RATE_LIMIT,
+    STATS_CACHE_DIR,
+)
+from agent.predict import stats_warehouse
+from agent.predict.http_fixtures import FixtureStore
+from agent.predict.rate_limit import AdaptiveRateLimiter, CircuitBreaker
 from agent.predict.player_id_crosswalk import resolve_mlbam_id
+from agent.predict.single_flight import SingleFlight
+from agent.predict.stats_cache import StatsCache
 
 STATS_API_BASE = "https://statsapi.mlb.com/api/v1"
+STATS_GROUPS = ("hitting", "pitching")
+# personIds per batched /people request -- keeps the URL comfortably short
+STATS_BATCH_SIZE = 50
 REQUEST_TIMEOUT_SECONDS = 10
 MAX_HTTP_ATTEMPTS = 3
 BACKOFF_BASE_SECONDS = 0.5
+# Consecutive transient failures before the circuit opens, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
 
 # Curated fields, not everything the API returns -- these are the standard
 # counting/rate stats the old local pipeline consumed too (see CLAUDE.md).
@@ -66,6 +138,76 @@ PITCHING_FIELDS = [
 ]
 
 
+# Process-wide response cache; tests swap in one rooted at a temp directory
+STATS_CACHE = StatsCache(STATS_CACHE_DIR)
+
+# Coalesces concurrent fetches of the same (mlbam_id, group); see its counters
+STATS_FLIGHT = SingleFlight()
+
+# Shared pacing for every request this process sends; see stats_api_status()
+STATS_LIMITER = AdaptiveRateLimiter(STATS_API_RATE_LIMIT)
+STATS_BREAKER = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+
+# Record/replay store; live (inactive) unless STATS_API_FIXTURES or use_http_fixtures() says otherwise
+HTTP_FIXTURES = FixtureStore(STATS_API_FIXTURES_DIR, STATS_API_FIXTURES)
+
+
+def use_http_fixtures(mode, directory=None):
+    """Switch the process to record/replay/live statsapi fixtures; returns the new store."""
+    global HTTP_FIXTURES
+    HTTP_FIXTURES = FixtureStore(directory if directory is not None else STATS_API_FIXTURES_DIR, mode)
+    return HTTP_FIXTURES
+
+
+def stats_api_status():
+    """Instrumentation: limiter, circuit breaker, cache and coalescing state for this process."""
+    return {
+        "limiter": STATS_LIMITER.snapshot(),
+        "breaker": STATS_BREAKER.snapshot(),
+        "cache": dict(STATS_CACHE.counters),
+        "flight": dict(STATS_FLIGHT.counters),
+    }
+
+
+_session = None
+_session_lock = threading.Lock()
+_fetch_pool = None
+
+
+def _http_session():
+    """The shared keep-alive session, created on first use.
+
+    requests.Session is safe to share across threads for plain GETs like
+    these (urllib3's pool hands each thread its own connection); the pool is
+    sized so that many threads can each hold one without blocking.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1, pool_maxsize=STATS_API_POOL_SIZE, max_retries=0
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept": "application/json", "User-Agent": "Mozilla/5.0"})
+                _session = session
+    return _session
+
+
+def _fetch_executor():
+    """The shared, bounded pool multi-player lookups fan out on, created on first use."""
+    global _fetch_pool
+    if _fetch_pool is None:
+        with _session_lock:
+            if _fetch_pool is None:
+                _fetch_pool = ThreadPoolExecutor(
+                    max_workers=STATS_API_MAX_CONCURRENCY, thread_name_prefix="statsapi"
+                )
+    return _fetch_pool
+
+
 def _is_transient(error):
     if isinstance(error, (requests.Timeout, requests.ConnectionError)):
         return True
@@ -75,24 +217,50 @@ def _is_transient(error):
     return False
 
 
+def _is_throttle(error):
+    """429 or 5xx: the API asking us to slow down, not a network blip."""
+    return isinstance(error, requests.HTTPError) and error.response is not None and (
+        error.response.status_code >= 500 or error.response.status_code == 429
+    )
+
+
+def _retry_after(error):
+    """A 429's Retry-After in seconds, if it gave one as a number."""
+    try:
+        return float(error.response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
 def _get_json(url, params):
     """GET with retry+backoff on transient failures; raises immediately otherwise."""
+    if HTTP_FIXTURES.mode == "replay":
+        return HTTP_FIXTURES.replay(url, params)
     last_error = None
     for attempt in range(MAX_HTTP_ATTEMPTS):
+        STATS_BREAKER.before_call()
+        STATS_LIMITER.acquire()
         try:
-            response = requests.get(
-                url,
-                params=params,
-                timeout=REQUEST_TIMEOUT_SECONDS,
-                headers={"Accept": "application/json", "User-Agent": "Mozilla/5.0"},
-            )
+            response = _http_session().get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
             response.raise_for_status()
-            return response.json()
+            body = response.json()
         except requests.RequestException as error:
             last_error = error
+            if _is_transient(error):
+                STATS_BREAKER.on_failure()
+                if _is_throttle(error):
+                    STATS_LIMITER.on_throttle(_retry_after(error))
+            else:
+                STATS_BREAKER.on_success()  # a definitive answer: the API itself is up
             if not _is_transient(error) or attempt == MAX_HTTP_ATTEMPTS - 1:
                 raise RuntimeError(f"MLB Stats API request failed: {error}") from error
             time.sleep(BACKOFF_BASE_SECONDS * (2**attempt))
+            continue
+        STATS_BREAKER.on_success()
+        STATS_LIMITER.on_success()
+        if HTTP_FIXTURES.mode == "record":
+            HTTP_FIXTURES.record(url, params, body)
+        return body
     raise RuntimeError(f"MLB Stats API request failed: {last_error}") from last_error  # pragma: no cover
 
 
@@ -106,6 +274,88 @@ def _coerce(value):
     return value
 
 
+def _fetch_splits(mlbam_id, group):
+    """The network call: every yearByYear split for one player and group."""
+    data = _get_json(
+        f"{STATS_API_BASE}/people/{mlbam_id}/stats",
+        params={"stats": "yearByYear", "group": group},
+    )
+    stats_blocks = data.get("stats", [])
+    if not stats_blocks:
+        return []
+    return stats_blocks[0].get("splits", [])
+
+
+def _fetch_splits_batch(mlbam_ids):
+    """One batched /people request: {(mlbam_id, group): splits} for every person returned.
+
+    Both groups are hydrated; a returned person with no splits in a group
+    gets [] for it, same as the per-player endpoint's empty "stats".
+    """
+    data = _get_json(
+        f"{STATS_API_BASE}/people",
+        params={
+            "personIds": ",".join(str(mlbam_id) for mlbam_id in mlbam_ids),
+            "hydrate": f"stats(group=[{','.join(STATS_GROUPS)}],type=yearByYear)",
+        },
+    )
+    splits = {}
+    for person in data.get("people", []):
+        mlbam_id = person.get("id")
+        if mlbam_id is None:
+            continue
+        for group in STATS_GROUPS:
+            splits[(int(mlbam_id), group)] = []
+        for block in person.get("stats", []):
+            group = (block.get("group") or {}).get("displayName")
+            stats_type = (block.get("type") or {}).get("displayName")
+            if group in STATS_GROUPS and stats_type == "yearByYear":
+                splits[(int(mlbam_id), group)] = block.get("splits", [])
+    return splits
+
+
+def _prefetch_year_by_year(mlbam_ids, group, through_season):
+    """Warm the cache for every id it can't already answer, via batched requests.
+
+    Best effort: a failed chunk is skipped, and its players fall through to
+    the per-player call in _fetch_year_by_year. Ids another caller is already
+    fetching are waited on rather than requested again (STATS_FLIGHT). Chunks
+    run one after another on the calling thread, never on the fan-out pool,
+    whose threads may themselves be waiting on this flight.
+    """
+    if HTTP_FIXTURES.active:
+        return
+    current_season = datetime.now().year
+    warehouse = stats_warehouse.load_warehouse()
+    needed = [
+        (int(mlbam_id), group) for mlbam_id in dict.fromkeys(mlbam_ids)
+        if not (warehouse is not None and warehouse.answers(mlbam_id, through_season))
+        and not STATS_CACHE.has_fresh(mlbam_id, group, current_season, through_season)
+    ]
+    if not needed:
+        return
+
+    def fetch_and_cache(keys):
+        ids = [mlbam_id for mlbam_id, _ in keys]
+        fetched = {}
+        for i in range(0, len(ids), STATS_BATCH_SIZE):
+            try:
+                fetched.update(_fetch_splits_batch(ids[i:i + STATS_BATCH_SIZE]))
+            except RuntimeError:
+                continue
+        for (mlbam_id, fetched_group), splits in fetched.items():
+            STATS_CACHE.write(mlbam_id, fetched_group, splits, current_season)
+        return fetched
+
+    STATS_FLIGHT.do_many(needed, fetch_and_cache)
+
+
+def _latest_needed_season(before_year, max_year):
+    """The last season a request can return, or None if it's open-ended."""
+    bounds = [year for year in (before_year - 1 if before_year is not None else None, max_year) if year is not None]
+    return min(bounds) if bounds else None
+
+
 def _fetch_year_by_year(mlbam_id, group, fields, before_year, min_year, max_year):
     # A season matching the real current calendar year is still being played --
     # its counting stats (IP, PA, HR, ...) are a partial total, not a full-season
@@ -115,17 +365,29 @@ def _fetch_year_by_year(mlbam_id, group, fields, before_year, min_year, max_year
     # concern to justify a cheaper contract. Rate stats (ERA, WHIP, K/9, AVG,
     # OPS, ...) don't have this problem -- they're already normalized.
     current_season = datetime.now().year
-
-    data = _get_json(
-        f"{STATS_API_BASE}/people/{mlbam_id}/stats",
-        params={"stats": "yearByYear", "group": group},
-    )
-    stats_blocks = data.get("stats", [])
-    if not stats_blocks:
-        return []
+    through_season = _latest_needed_season(before_year, max_year)
+
+    def live_splits():
+        return STATS_CACHE.get(
+            mlbam_id,
+            group,
+            lambda: STATS_FLIGHT.do((int(mlbam_id), group), lambda: _fetch_splits(mlbam_id, group)),
+            current_season,
+            through_season,
+        )
+
+    warehouse = None if HTTP_FIXTURES.active else stats_warehouse.load_warehouse()
+    if HTTP_FIXTURES.active:
+        splits = _fetch_splits(mlbam_id, group)
+    elif warehouse is not None and warehouse.covers(mlbam_id):
+        splits = warehouse.splits(mlbam_id, group)
+        if not warehouse.answers(mlbam_id, through_season):
+            splits += [split for split in live_splits() if int(split["season"]) >= warehouse.fetched_season]
+    else:
+        splits = live_splits()
 
     rows = []
-    for split in stats_blocks[0].get("splits", []):
+    for split in splits:
         year = int(split["season"])
         if before_year is not None and year >= before_year:
             continue
@@ -147,15 +409,35 @@ def _fetch_year_by_year(mlbam_id, group, fields, before_year, min_year, max_year
 
 def _query_stats(player_ids, group, fields, before_year, min_year, max_year):
     """Shared lookup logic for both tools. Pure aside from the network call,
-    which _fetch_year_by_year/_get_json own -- tests monkeypatch those."""
-    stats = {}
+    which _fetch_year_by_year/_get_json own -- tests monkeypatch those.
+
+    Ids are mapped serially (a local lookup), uncached players are batch
+    prefetched, then the mapped players are fetched concurrently on the
+    shared pool (cache hits, unless the batch missed them). "stats" keeps the order the ids
+    were passed in, and if any fetch fails the first failure (in that order)
+    is raised, same as the serial loop did.
+    """
+    mapped = {}
     unmapped = []
     for player_id in player_ids:
         mlbam_id = resolve_mlbam_id(player_id)
         if mlbam_id is None:
             unmapped.append(player_id)
-            continue
-        stats[player_id] = _fetch_year_by_year(mlbam_id, group, fields, before_year, min_year, max_year)
+        else:
+            mapped[player_id] = mlbam_id
+
+    if mapped:
+        _prefetch_year_by_year(list(mapped.values()), group, _latest_needed_season(before_year, max_year))
+
+    def fetch(mlbam_id):
+        return _fetch_year_by_year(mlbam_id, group, fields, before_year, min_year, max_year)
+
+    if len(mapped) <= 1:
+        stats = {player_id: fetch(mlbam_id) for player_id, mlbam_id in mapped.items()}
+    else:
+        pool = _fetch_executor()
+        futures = {player_id: pool.submit(fetch, mlbam_id) for player_id, mlbam_id in mapped.items()}
+        stats = {player_id: future.result() for player_id, future in futures.items()}
     result = {"stats": stats}
     if unmapped:
         result["unmapped_player_ids"] = unmapped
@@ -21,6 +21,7 @@ new players not yet in the cached crosswalk).
 
 import pandas as pd
 
+from agent import datasets
 from agent.config import PLAYERS_CSV, REPO_ROOT
 
 CROSSWALK_CSV = REPO_ROOT / "dataset" / "mlbam_id_crosswalk.csv"
@@ -51,13 +52,13 @@ def build_crosswalk(players_df, register_df):
 
 def _load_or_build_crosswalk():
     if CROSSWALK_CSV.exists():
-        return pd.read_csv(CROSSWALK_CSV)
+        return datasets.load_crosswalk(CROSSWALK_CSV)
 
     import pybaseball  # deferred: slow first-time register download
 
     print("Building player_id -> MLBAM id crosswalk (one-time; caches to "
           f"{CROSSWALK_CSV})...")
-    players_df = pd.read_csv(PLAYERS_CSV)
+    players_df = datasets.load_players(PLAYERS_CSV)
     register_df = pybaseball.chadwick_register()
     crosswalk = build_crosswalk(players_df, register_df)
     CROSSWALK_CSV.parent.mkdir(parents=True, exist_ok=True)
@@ -4,15 +4,17 @@ Usage:
     python -m agent.predict --player-id Scherzer_5166 --year 2026
     python -m agent.predict --name "Max Scherzer" --year 2026
     python -m agent.predict --player-id X --year Y --model gpt-5
+    python -m agent.predict --player-id X --year Y --http-fixtures replay
 """
 
 from argparse import ArgumentParser
 from datetime import datetime
 
-import pandas as pd
-
-from agent.config import CONTRACTS_CSV, DEFAULT_MODEL_ID, PLAYERS_CSV
+from agent import datasets
+from agent.config import CONTRACTS_CSV, DEFAULT_MODEL_ID, PLAYERS_CSV, STATS_API_FIXTURES
 from agent.phase import PhaseResolution, resolve_phase
+from agent.predict import mlb_stats_api
+from agent.predict.http_fixtures import add_fixture_arguments
 from agent.predict.predictor import predict_contract
 from agent.predict.prompts import PROMPT_VERSION, SYSTEM_PROMPT, build_prediction_prompt
 from agent.predict.schema import Citation, ContractPrediction
@@ -59,7 +61,7 @@ def _known_prediction(resolution):
 
 def lookup_player(player_id=None, name=None):
     """Find a player row in players.csv by id or 'First Last' name."""
-    players = pd.read_csv(PLAYERS_CSV)
+    players = datasets.load_players(PLAYERS_CSV)
     if player_id:
         matches = players[players["player_id"] == player_id]
     else:
@@ -76,7 +78,7 @@ def lookup_player(player_id=None, name=None):
 
 def actual_aav_for(player_id, year):
     """Actual AAV if an observed contract row exists for that year, else None."""
-    contracts = pd.read_csv(CONTRACTS_CSV).drop_duplicates(subset="contract_id")
+    contracts = datasets.load_contracts(CONTRACTS_CSV)
     row = contracts[(contracts["player_id"] == player_id) & (contracts["year"] == year)]
     if row.empty:
         return None
@@ -225,10 +227,14 @@ def main():
     who.add_argument("--name", help='Player name, e.g. "Max Scherzer"')
     parser.add_argument("--year", type=int, default=datetime.now().year, help="Target season")
     parser.add_argument("--model", default=DEFAULT_MODEL_ID, help="OpenAI model id")
+    add_fixture_arguments(parser)
     args = parser.parse_args()
+    if args.http_fixtures or args.http_fixtures_dir:
+        mlb_stats_api.use_http_fixtures(args.http_fixtures or STATS_API_FIXTURES, args.http_fixtures_dir)
 
     player_row = lookup_player(args.player_id, args.name)
     run_prediction(player_row, args.year, args.model)
+    mlb_stats_api.HTTP_FIXTURES.raise_for_misses()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+"""Process-wide request pacing for statsapi: an adaptive token bucket and a circuit breaker.
+
+Every _get_json attempt (agent/predict/mlb_stats_api.py) first asks the
+CircuitBreaker whether the API is worth calling, then takes a token from the
+AdaptiveRateLimiter. Both are shared by every thread in the process, so
+parallel tool calls, backtest workers and warehouse refreshes are paced as
+one client rather than each retrying on its own schedule.
+
+AdaptiveRateLimiter: a token bucket refilling at `rate` requests/second,
+adjusted AIMD-style -- each success adds `increase` req/s (up to max_rate);
+a 429 or 5xx multiplies the rate by `decrease` (down to min_rate), at most
+once per `cooldown_seconds` so one burst of simultaneous 429s counts as one
+signal, not twenty. A 429's Retry-After pauses the whole bucket.
+
+CircuitBreaker: after `failure_threshold` consecutive transient failures
+(timeouts, connection errors, 429, 5xx) it opens, and every call fails fast
+with CircuitOpenError for `reset_seconds`. Then one probe request is let
+through (half-open): success closes the circuit, failure reopens it.
+CircuitOpenError is a RuntimeError like every other statsapi failure, so
+callers handle it the same way -- StatsCache serves its stale copy when a
+refresh fails, and a cold miss surfaces as a tool error.
+
+Both keep counters and a snapshot() for instrumentation; mlb_stats_api's
+stats_api_status() collects them.
+"""
+
+import threading
+import time
+
+# Refill arithmetic can land a hair under a whole token after sleeping exactly long enough
+_TOKEN_EPSILON = 1e-9
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The circuit breaker is open: the call was rejected without being sent."""
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with AIMD rate control; thread-safe."""
+
+    def __init__(self, rate, min_rate=0.5, max_rate=None, burst=None, increase=0.1, decrease=0.5,
+                 cooldown_seconds=1.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown_seconds = cooldown_seconds
+        self.counters = {"acquired": 0, "throttled": 0, "throttled_seconds": 0.0, "decreases": 0, "pauses": 0}
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._last_decrease = None
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self):
+        """Block until a token is available and take it; returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1 - _TOKEN_EPSILON:
+                    self._tokens = max(0.0, self._tokens - 1)
+                    self.counters["acquired"] += 1
+                    if waited:
+                        self.counters["throttled"] += 1
+                        self.counters["throttled_seconds"] += waited
+                    return waited
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after=None):
+        """A 429/5xx came back: back off multiplicatively, and pause for Retry-After if given."""
+        with self._lock:
+            now = self._clock()
+            if self._last_decrease is None or now - self._last_decrease >= self.cooldown_seconds:
+                self._refill(now)
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._tokens = min(self._tokens, 1.0)
+                self._last_decrease = now
+                self.counters["decreases"] += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self.counters["pauses"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "tokens": round(self._tokens, 3),
+                "paused_for": round(max(0.0, self._paused_until - now), 3),
+                **self.counters,
+            }
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe -> closed; thread-safe."""
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.counters = {"opened": 0, "rejected": 0}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = self._clock()
+            if self.state == OPEN and now - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probe_started = None
+            if self.state == HALF_OPEN:
+                # one probe at a time; a probe that never reported back doesn't block forever
+                if self._probe_started is None or now - self._probe_started >= self.reset_seconds:
+                    self._probe_started = now
+                    return
+            self.counters["rejected"] += 1
+            retry_in = max(0.0, self._opened_at + self.reset_seconds - now)
+        raise CircuitOpenError(
+            f"MLB Stats API request failed: circuit open after {self.failure_threshold} consecutive "
+            f"failures (next probe in {retry_in:.0f}s)"
+        )
+
+    def on_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = CLOSED
+
+    def on_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counters["opened"] += 1
+                self.state = OPEN
+                self._opened_at = self._clock()
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self._failures, **self.counters}
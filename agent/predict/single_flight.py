@@ -0,0 +1,116 @@
+"""Single-flight call coalescing: concurrent callers for the same key share one call.
+
+When parallel web sessions or backtest workers ask for the same player's
+stats at the same moment, each would otherwise send its own identical
+statsapi request. SingleFlight makes the first caller for a key the leader,
+which runs the call; everyone else who asks for that key while it's in
+flight waits for the leader and gets the same result (or the same
+exception). Nothing is cached beyond the flight itself -- once it lands, the
+next caller starts a new one (the on-disk StatsCache handles reuse after
+that).
+
+do_many() lets one batched call (agent/predict/mlb_stats_api.py's /people
+prefetch) lead several keys at once. A key the batch didn't return -- or
+every key of a batch that failed -- lands as "no result": the batch's
+waiters then run their own call rather than inherit the gap.
+
+counters tracks leaders (calls actually made) and coalesced (callers that
+waited on someone else's call instead of making their own).
+"""
+
+import threading
+
+# A do_many flight that landed without a value for its key
+_NO_RESULT = object()
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = _NO_RESULT
+        self.error = None
+
+
+class SingleFlight:
+    """Per-key in-flight call registry; thread-safe."""
+
+    def __init__(self):
+        self.counters = {"leaders": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _claim(self, key):
+        """(flight, is_leader) for key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.counters["coalesced"] += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.counters["leaders"] += 1
+            return flight, True
+
+    def _land(self, key, flight, value=_NO_RESULT, error=None):
+        flight.value = value
+        flight.error = error
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.done.set()
+
+    def do(self, key, fn):
+        """fn()'s result, running it only if no call for key is already in flight."""
+        while True:
+            flight, leader = self._claim(key)
+            if leader:
+                try:
+                    value = fn()
+                except BaseException as error:
+                    self._land(key, flight, error=error)
+                    raise
+                self._land(key, flight, value=value)
+                return value
+
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.value is not _NO_RESULT:
+                return flight.value
+            # led by a do_many that came back without this key: call it ourselves
+
+    def do_many(self, keys, fn):
+        """Lead every key not already in flight with one fn(claimed_keys) -> {key: value} call.
+
+        Returns {key: value} for every key that got a value, whether from this
+        call or from a concurrent flight it waited on; keys with no value
+        (not returned, or their call failed) are left out. If fn raises, the
+        claimed keys land with no result and the exception propagates.
+        """
+        claimed = []
+        joined = {}
+        for key in dict.fromkeys(keys):
+            flight, leader = self._claim(key)
+            if leader:
+                claimed.append((key, flight))
+            else:
+                joined[key] = flight
+
+        results = {}
+        if claimed:
+            try:
+                fetched = fn([key for key, _ in claimed])
+            except BaseException:
+                for key, flight in claimed:
+                    self._land(key, flight)
+                raise
+            for key, flight in claimed:
+                self._land(key, flight, value=fetched.get(key, _NO_RESULT))
+                if key in fetched:
+                    results[key] = fetched[key]
+
+        for key, flight in joined.items():
+            flight.done.wait()
+            if flight.error is None and flight.value is not _NO_RESULT:
+                results[key] = flight.value
+        return results
@@ -0,0 +1,160 @@
+"""On-disk cache of MLB Stats API yearByYear splits, keyed by (mlbam_id, group).
+
+Every query_batting_stats / query_pitching_stats call used to refetch each
+player's full history from statsapi.mlb.com -- for the target player, every
+comparable, every prediction, every backtest row -- although completed
+seasons never change. This cache stores each (mlbam_id, group) response's
+splits as one small JSON file under STATS_CACHE_DIR (agent/config.py),
+stamped with when it was fetched, and decides freshness per request:
+
+- Seasons that were already complete when the entry was fetched (anything
+  before the fetch's calendar year) are permanent. A request that only needs
+  those -- every backtest, and every prediction whose no-lookahead cutoff is
+  at or before the current season -- is served from disk forever, with no
+  network call.
+- A request that reaches into the in-progress season (or a season after the
+  fetch) is served from disk while the entry is younger than
+  IN_PROGRESS_TTL_SECONDS and from the current calendar year.
+- Otherwise the entry is stale: a background refresh starts and the caller
+  waits up to REVALIDATE_WAIT_SECONDS for it. If the API is slow (or down),
+  the stale entry is served and the refresh finishes on its own, updating
+  the file for the next caller (stale-while-revalidate). Only a missing
+  entry blocks on the network outright.
+
+Files are written atomically (temp file + os.replace), so a crash or a
+concurrent writer never leaves a half-written entry; an unreadable entry is
+treated as missing. Delete the directory to drop the cache.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# How long a cached in-progress season is served without refetching
+IN_PROGRESS_TTL_SECONDS = 6 * 60 * 60
+
+# How long a caller holding a stale entry waits for the refresh before
+# falling back to the stale data
+REVALIDATE_WAIT_SECONDS = 2.0
+
+REFRESH_WORKERS = 4
+
+
+class StatsCache:
+    """Disk-backed (mlbam_id, group) -> splits cache with season-aware freshness."""
+
+    def __init__(
+        self,
+        directory,
+        ttl_seconds=IN_PROGRESS_TTL_SECONDS,
+        revalidate_wait_seconds=REVALIDATE_WAIT_SECONDS,
+        clock=time.time,
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.revalidate_wait_seconds = revalidate_wait_seconds
+        self.clock = clock
+        self.counters = {"hits": 0, "misses": 0, "refreshes": 0, "stale_served": 0}
+        self._lock = threading.Lock()
+        self._refreshes = {}
+        self._executor = None
+
+    def _path(self, mlbam_id, group):
+        return self.directory / group / f"{int(mlbam_id)}.json"
+
+    def read(self, mlbam_id, group):
+        """The cached entry ({"fetched_at", "fetched_season", "splits"}), or None."""
+        try:
+            with open(self._path(mlbam_id, group), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not {"fetched_at", "fetched_season", "splits"} <= entry.keys():
+            return None
+        return entry
+
+    def write(self, mlbam_id, group, splits, current_season):
+        """Atomically store a fresh response's splits; returns the entry."""
+        entry = {"fetched_at": self.clock(), "fetched_season": current_season, "splits": splits}
+        path = self._path(mlbam_id, group)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return entry
+
+    def is_fresh(self, entry, current_season, through_season):
+        """Whether entry can answer a request needing seasons up to through_season (None = all)."""
+        if through_season is not None and through_season < entry["fetched_season"]:
+            return True  # every needed season was already complete when fetched
+        return (
+            entry["fetched_season"] == current_season
+            and self.clock() - entry["fetched_at"] < self.ttl_seconds
+        )
+
+    def has_fresh(self, mlbam_id, group, current_season, through_season=None):
+        """Whether get() would answer this request from disk without fetching."""
+        entry = self.read(mlbam_id, group)
+        return entry is not None and self.is_fresh(entry, current_season, through_season)
+
+    def get(self, mlbam_id, group, fetch, current_season, through_season=None):
+        """Splits for (mlbam_id, group), calling fetch() only when the cache can't answer.
+
+        fetch is the network call: no arguments, returns the splits list.
+        through_season is the latest season the caller will use (None if it
+        may use the in-progress one).
+        """
+        entry = self.read(mlbam_id, group)
+        if entry is not None and self.is_fresh(entry, current_season, through_season):
+            self._count("hits")
+            return entry["splits"]
+
+        if entry is None:
+            self._count("misses")
+            return self.write(mlbam_id, group, fetch(), current_season)["splits"]
+
+        refresh = self._refresh(mlbam_id, group, fetch, current_season)
+        try:
+            return refresh.result(timeout=self.revalidate_wait_seconds)["splits"]
+        except Exception:
+            # Slow or failing API: the stale copy is still the best answer we
+            # have, and the refresh (if still running) updates it for later.
+            self._count("stale_served")
+            return entry["splits"]
+
+    def _refresh(self, mlbam_id, group, fetch, current_season):
+        """One background refresh per key, shared by every caller that finds it stale."""
+        key = (int(mlbam_id), group)
+        with self._lock:
+            running = self._refreshes.get(key)
+            if running is not None:
+                return running
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=REFRESH_WORKERS, thread_name_prefix="stats-cache-refresh"
+                )
+            self.counters["refreshes"] += 1
+
+            def run():
+                try:
+                    return self.write(mlbam_id, group, fetch(), current_season)
+                finally:
+                    with self._lock:
+                        self._refreshes.pop(key, None)
+
+            future = self._executor.submit(run)
+            self._refreshes[key] = future
+            return future
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
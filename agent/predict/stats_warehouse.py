@@ -0,0 +1,300 @@
+"""Offline stats warehouse: every crosswalked player's completed seasons in one Parquet file.
+
+    python -m agent.predict.stats_warehouse refresh [--concurrency N] [--limit N]
+    python -m agent.predict.stats_warehouse info
+
+refresh walks dataset/mlbam_id_crosswalk.csv and fetches hitting AND
+pitching yearByYear for every mapped player (~3.6k ids) through the batched
+/people hydrate endpoint (agent/predict/mlb_stats_api.py), STATS_BATCH_SIZE
+ids per request, with at most --concurrency requests in flight; ids a batch
+misses fall back to per-player calls. Every split from a season already
+complete at refresh time is written to STATS_WAREHOUSE_PATH
+(dataset/statsapi_warehouse.parquet, see agent/config.py): one row per
+split, in the API's split order, with each stat field as its own typed
+"stat.<field>" column -- counts stay integers and the API's rate strings (".313") stay
+strings, so rows rebuilt from the warehouse are exactly the splits the live
+API returned and the tools parse them through the same code.
+
+query_batting_stats / query_pitching_stats read the warehouse first: a
+covered player's history up to the refresh season is answered from it with
+no network call at all, and only seasons from the refresh season on (the
+in-progress one) are fetched live, through the usual cache. Players the
+last refresh didn't cover go fully live, as before. Since completed seasons
+never change, a refresh is only needed for new players or once a year.
+
+The warehouse also stands in for the stalled dataset/batter_stats.csv as a
+local, queryable stats source: warehouse_frame() returns it as a DataFrame.
+
+Requires pyarrow (installed with pybaseball). Without it, WAREHOUSE_AVAILABLE
+is False and the tools stay on live fetches.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from agent import datasets
+from agent.config import STATS_API_MAX_CONCURRENCY, STATS_WAREHOUSE_PATH
+from agent.predict.player_id_crosswalk import CROSSWALK_CSV
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    WAREHOUSE_AVAILABLE = True
+except ImportError:  # pragma: no cover - pyarrow ships with pybaseball
+    WAREHOUSE_AVAILABLE = False
+
+# Where load_warehouse() looks by default; tests point it at a temp file
+WAREHOUSE_PATH = STATS_WAREHOUSE_PATH
+
+# Non-stat columns; every other column is STAT_PREFIX + one stat field
+KEY_COLUMNS = ["mlbam_id", "group", "season", "team"]
+STAT_PREFIX = "stat."
+
+# Parquet metadata keys
+_FETCHED_SEASON_KEY = b"fetched_season"
+_FETCHED_AT_KEY = b"fetched_at"
+_MLBAM_IDS_KEY = b"mlbam_ids"
+
+
+def _require_pyarrow():
+    if not WAREHOUSE_AVAILABLE:
+        raise ImportError("The stats warehouse requires pyarrow (pip install pyarrow)")
+
+
+def _stat_array(values):
+    """A typed Arrow array for one stat field, keeping the API's own value types."""
+    present = [value for value in values if value is not None]
+    if all(isinstance(value, bool) for value in present):
+        return pa.array(values, type=pa.bool_())
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return pa.array(values, type=pa.int64())
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return pa.array([None if value is None else float(value) for value in values], type=pa.float64())
+    return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+def build_table(splits_by_key, mlbam_ids, fetched_season, fetched_at=None):
+    """The warehouse table for {(mlbam_id, group): splits}. Pure, for testing.
+
+    Only seasons before fetched_season (complete at refresh time) are kept.
+    mlbam_ids is the set of players the refresh covered (both groups
+    fetched), stored in the file's metadata -- a covered player with no rows
+    in a group genuinely has no stats there.
+    """
+    _require_pyarrow()
+    rows = []
+    for (mlbam_id, group) in sorted(splits_by_key):
+        for split in splits_by_key[(mlbam_id, group)]:
+            season = int(split["season"])
+            if season >= fetched_season:
+                continue
+            rows.append((mlbam_id, group, season, (split.get("team") or {}).get("name"), split.get("stat", {})))
+
+    stat_fields = list(dict.fromkeys(field for *_, stat in rows for field in stat))
+    columns = {
+        "mlbam_id": pa.array([row[0] for row in rows], type=pa.int32()),
+        "group": pa.array([row[1] for row in rows], type=pa.string()).dictionary_encode(),
+        "season": pa.array([row[2] for row in rows], type=pa.int16()),
+        "team": pa.array([row[3] for row in rows], type=pa.string()),
+    }
+    for field in stat_fields:
+        columns[STAT_PREFIX + field] = _stat_array([row[4].get(field) for row in rows])
+    table = pa.table(columns)
+    return table.replace_schema_metadata({
+        _FETCHED_SEASON_KEY: str(fetched_season).encode(),
+        _FETCHED_AT_KEY: str(fetched_at if fetched_at is not None else datetime.now().timestamp()).encode(),
+        _MLBAM_IDS_KEY: json.dumps(sorted(int(mlbam_id) for mlbam_id in mlbam_ids)).encode(),
+    })
+
+
+def write_table(table, path=None):
+    """Atomically write a warehouse table (temp file + os.replace)."""
+    path = path if path is not None else WAREHOUSE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class StatsWarehouse:
+    """A loaded warehouse file: per-(mlbam_id, group) row ranges over one Arrow table."""
+
+    def __init__(self, table):
+        metadata = table.schema.metadata or {}
+        self.table = table
+        self.fetched_season = int(metadata[_FETCHED_SEASON_KEY])
+        self.fetched_at = float(metadata[_FETCHED_AT_KEY])
+        self.mlbam_ids = frozenset(json.loads(metadata[_MLBAM_IDS_KEY]))
+        self.stat_fields = [name[len(STAT_PREFIX):] for name in table.column_names if name.startswith(STAT_PREFIX)]
+
+        # build_table sorts by (mlbam_id, group), so each key is one contiguous range
+        ids = table["mlbam_id"].to_numpy()
+        groups = np.asarray(table["group"].to_pylist(), dtype=object)
+        boundaries = np.flatnonzero((ids[1:] != ids[:-1]) | (groups[1:] != groups[:-1])) + 1
+        starts = np.concatenate([[0], boundaries]) if len(ids) else []
+        ends = np.concatenate([boundaries, [len(ids)]]) if len(ids) else []
+        self._ranges = {(int(ids[start]), groups[start]): (int(start), int(end)) for start, end in zip(starts, ends)}
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def covers(self, mlbam_id):
+        """Whether the last refresh fetched this player (an empty history still counts)."""
+        return int(mlbam_id) in self.mlbam_ids
+
+    def answers(self, mlbam_id, through_season):
+        """Whether a request needing seasons up to through_season needs no live fetch."""
+        return self.covers(mlbam_id) and through_season is not None and through_season < self.fetched_season
+
+    def splits(self, mlbam_id, group):
+        """The player's completed-season splits, shaped exactly as the API returned them."""
+        start, end = self._ranges.get((int(mlbam_id), group), (0, 0))
+        splits = []
+        for row in self.table.slice(start, end - start).to_pylist():
+            split = {
+                "season": str(row["season"]),
+                "stat": {
+                    field: row[STAT_PREFIX + field] for field in self.stat_fields
+                    if row[STAT_PREFIX + field] is not None
+                },
+            }
+            if row["team"] is not None:
+                split["team"] = {"name": row["team"]}
+            splits.append(split)
+        return splits
+
+
+_cache_lock = threading.Lock()
+_cache = None
+
+
+def load_warehouse(path=None):
+    """The StatsWarehouse at path (default WAREHOUSE_PATH), or None if there isn't one.
+
+    Reloaded only when the file's (mtime, size) changes, so a refresh in
+    another process is picked up without a restart.
+    """
+    global _cache
+    if not WAREHOUSE_AVAILABLE:
+        return None
+    path = path if path is not None else WAREHOUSE_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    version = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        if _cache is not None and _cache[0] == version:
+            return _cache[1]
+        warehouse = StatsWarehouse(pq.read_table(path, memory_map=True))
+        _cache = (version, warehouse)
+        return warehouse
+
+
+def warehouse_frame(group=None, path=None):
+    """The warehouse as a DataFrame (optionally one group), or None if there isn't one."""
+    warehouse = load_warehouse(path)
+    if warehouse is None:
+        return None
+    frame = warehouse.table.to_pandas()
+    if group is not None:
+        frame = frame[frame["group"] == group].reset_index(drop=True)
+    return frame
+
+
+def fetch_all(mlbam_ids, concurrency=STATS_API_MAX_CONCURRENCY, progress=None):
+    """({(mlbam_id, group): splits}, covered ids) for every id, batched with per-player fallback."""
+    from agent.predict import mlb_stats_api as api  # deferred: mlb_stats_api reads the warehouse
+
+    chunks = [mlbam_ids[i:i + api.STATS_BATCH_SIZE] for i in range(0, len(mlbam_ids), api.STATS_BATCH_SIZE)]
+
+    def fetch_chunk(chunk):
+        try:
+            fetched = api._fetch_splits_batch(chunk)
+        except RuntimeError:
+            fetched = {}
+        for mlbam_id in chunk:
+            for group in api.STATS_GROUPS:
+                if (mlbam_id, group) not in fetched:
+                    try:
+                        fetched[(mlbam_id, group)] = api._fetch_splits(mlbam_id, group)
+                    except RuntimeError:
+                        pass
+        return fetched
+
+    splits_by_key = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="warehouse") as pool:
+        for done, fetched in enumerate(pool.map(fetch_chunk, chunks), start=1):
+            splits_by_key.update(fetched)
+            if progress is not None:
+                progress(done, len(chunks))
+    covered = [
+        mlbam_id for mlbam_id in mlbam_ids
+        if all((mlbam_id, group) in splits_by_key for group in api.STATS_GROUPS)
+    ]
+    return splits_by_key, covered
+
+
+def refresh(path=None, concurrency=STATS_API_MAX_CONCURRENCY, limit=None, crosswalk_df=None):
+    """Fetch every crosswalked player's history and rewrite the warehouse; returns the table."""
+    _require_pyarrow()
+    crosswalk = crosswalk_df if crosswalk_df is not None else datasets.load_crosswalk(CROSSWALK_CSV)
+    mlbam_ids = sorted({int(mlbam_id) for mlbam_id in crosswalk["mlbam_id"].dropna()})
+    if limit is not None:
+        mlbam_ids = mlbam_ids[:limit]
+    fetched_season = datetime.now().year
+
+    print(f"Refreshing stats warehouse: {len(mlbam_ids)} players, hitting + pitching, "
+          f"seasons before {fetched_season}...")
+
+    def progress(done, total):
+        if done == total or done % 10 == 0:
+            print(f"  {done}/{total} batches")
+
+    splits_by_key, covered = fetch_all(mlbam_ids, concurrency, progress)
+    table = build_table(splits_by_key, covered, fetched_season)
+    write_table(table, path)
+    missing = len(mlbam_ids) - len(covered)
+    print(f"Wrote {table.num_rows} season rows for {len(covered)} players to "
+          f"{path if path is not None else WAREHOUSE_PATH}" + (f" ({missing} failed, left to live fetches)" if missing else ""))
+    return table
+
+
+def main():
+    parser = ArgumentParser(description="Offline MLB Stats API warehouse for the stats tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    refresh_parser = commands.add_parser("refresh", help="Fetch every crosswalked player's history")
+    refresh_parser.add_argument("--concurrency", type=int, default=STATS_API_MAX_CONCURRENCY,
+                                help="Most batch requests in flight at once")
+    refresh_parser.add_argument("--limit", type=int, help="Only the first N players (for a quick check)")
+    commands.add_parser("info", help="Summarize the current warehouse file")
+    args = parser.parse_args()
+
+    if args.command == "refresh":
+        refresh(concurrency=args.concurrency, limit=args.limit)
+        return
+
+    warehouse = load_warehouse()
+    if warehouse is None:
+        print(f"No stats warehouse at {WAREHOUSE_PATH}; run: python -m agent.predict.stats_warehouse refresh")
+        return
+    fetched = datetime.fromtimestamp(warehouse.fetched_at).strftime("%Y-%m-%d %H:%M")
+    print(f"{WAREHOUSE_PATH}: {len(warehouse)} season rows, {len(warehouse.mlbam_ids)} players, "
+          f"seasons before {warehouse.fetched_season} (refreshed {fetched}), "
+          f"{os.path.getsize(WAREHOUSE_PATH) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""A local stand-in for statsapi.mlb.com, for tests and benchmarks.
+
+Serves deterministic yearByYear responses for any player id -- per player
+(/people/{id}/stats) and batched (/people?personIds=...&hydrate=stats(...)),
+the latter optionally failing or omitting ids -- over HTTP/1.1
+keep-alive on 127.0.0.1, with optional injected latency: `latency` per
+request (server think time + round trip) and `connect_latency` once per new
+TCP connection (standing in for the TCP+TLS handshake a pooled connection
+avoids). Counts requests and connections so callers can assert on them.
+
+    with StubStatsApi(latency=0.05) as stub:
+        monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+        ...
+        assert stub.requests == 3
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIRST_SEASON = 2015
+LAST_SEASON = 2025
+
+
+def year_by_year(mlbam_id, group, first_season=FIRST_SEASON, last_season=LAST_SEASON):
+    """The stub's deterministic yearByYear response body for one player."""
+    splits = [
+        {
+            "season": str(season),
+            "team": {"name": f"Team{mlbam_id % 30}"},
+            "stat": {
+                "gamesPlayed": (mlbam_id + season) % 162,
+                "avg": f".{(mlbam_id * 7 + season) % 400:03d}",
+                "era": f"{((mlbam_id + season) % 600) / 100:.2f}",
+                "group": group,
+            },
+        }
+        for season in range(first_season, last_season + 1)
+    ]
+    return {"stats": [_stats_block(group, splits)]}
+
+
+def _stats_block(group, splits):
+    return {"type": {"displayName": "yearByYear"}, "group": {"displayName": group}, "splits": splits}
+
+
+def people(mlbam_ids, groups):
+    """The stub's batched /people response body: each person with hydrated stats."""
+    return {
+        "people": [
+            {
+                "id": mlbam_id,
+                "fullName": f"Player {mlbam_id}",
+                "stats": [year_by_year(mlbam_id, group)["stats"][0] for group in groups],
+            }
+            for mlbam_id in mlbam_ids
+        ]
+    }
+
+
+class StubStatsApi:
+    """Threaded local HTTP server answering /api/v1/people/{id}/stats and /api/v1/people."""
+
+    def __init__(self, latency=0.0, connect_latency=0.0, fail_batches=False, omit_ids=()):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.fail_batches = fail_batches
+        self.omit_ids = set(omit_ids)
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.paths = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out as separate writes; without TCP_NODELAY
+            # the body waits on the client's delayed ACK (~40ms) every response
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+                if stub.connect_latency:
+                    time.sleep(stub.connect_latency)
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.paths.append(self.path)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    status, body = stub.respond(self.path)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def respond(self, path):
+        """(status, JSON body) for a request path."""
+        url = urlparse(path)
+        parts = url.path.strip("/").split("/")
+        query = parse_qs(url.query)
+        if len(parts) == 5 and parts[:3] == ["api", "v1", "people"] and parts[4] == "stats":
+            try:
+                mlbam_id = int(parts[3])
+            except ValueError:
+                return 404, {"message": "Object not found"}
+            return 200, year_by_year(mlbam_id, query.get("group", ["hitting"])[0])
+        if parts == ["api", "v1", "people"] and "personIds" in query:
+            if self.fail_batches:
+                return 500, {"message": "Internal error"}
+            ids = [int(i) for i in query["personIds"][0].split(",") if i]
+            match = re.search(r"group=\[([^\]]*)\]", query.get("hydrate", [""])[0])
+            groups = match.group(1).split(",") if match else []
+            return 200, people([i for i in ids if i not in self.omit_ids], groups)
+        return 404, {"message": "Object not found"}
@@ -8,7 +8,11 @@ injected directly into _query_comparable_contracts (the pure function the
 import pandas as pd
 import pytest
 
-from agent.predict.comparables import _query_comparable_contracts, make_comparable_contracts_tool
+from agent.predict.comparables import (
+    _query_comparable_contracts,
+    comparables_view,
+    make_comparable_contracts_tool,
+)
 
 CONTRACT_COLUMNS = ["contract_id", "player_id", "age", "service_time", "year", "duration", "value", "type"]
 PLAYER_COLUMNS = ["player_id", "fangraphs_id", "first_name", "last_name", "position", "spotrac_link"]
@@ -150,6 +154,37 @@ def test_aav_computed_from_value_and_duration():
     assert result["matches"][0]["aav_millions"] == 36.0  # 324.0 / 9
 
 
+def test_zero_duration_contract_has_no_aav_instead_of_crashing():
+    rows = [
+        ["Zero_5_2021", "Skubal_1", 25, 1.0, 2021, 0, 0.0, "pre-arb"],
+        ["Skubal_1_2020", "Skubal_1", 24, 0.5, 2020, 1, 0.6, "pre-arb"],
+    ]
+    result = _query_comparable_contracts(contracts(rows), _players_fixture())
+    assert result["matches"][0]["aav_millions"] is None
+    assert result["matches"][0]["duration_years"] == 0
+    assert result["matches"][1]["aav_millions"] == 0.6
+
+
+def test_same_year_matches_keep_dataset_order():
+    rows = [
+        ["Skubal_1_2024", "Skubal_1", 27, 3.114, 2024, 1, 2.65, "arb"],
+        ["Gore_4_2024", "Gore_4", 25, 3.100, 2024, 1, 3.0, "arb"],
+        ["Cole_2_2024", "Cole_2", 33, -1, 2024, 1, 30.0, "free-agent"],
+        ["Skubal_1_2025", "Skubal_1", 28, 4.114, 2025, 1, 10.0, "arb"],
+    ]
+    result = _query_comparable_contracts(contracts(rows), _players_fixture())
+    assert [m["contract_id"] for m in result["matches"]] == [
+        "Skubal_1_2025", "Skubal_1_2024", "Gore_4_2024", "Cole_2_2024",
+    ]
+
+
+def test_view_is_reused_for_the_same_frames_and_rebuilt_for_new_ones():
+    contracts_df, players_df = _contracts_fixture(), _players_fixture()
+    view = comparables_view(contracts_df, players_df)
+    assert comparables_view(contracts_df, players_df) is view
+    assert comparables_view(_contracts_fixture(), players_df) is not view
+
+
 def test_unknown_player_in_contracts_but_missing_from_players_df_does_not_crash():
     orphan_contracts = contracts([["Ghost_9_2020", "Ghost_9", 30, 5.0, 2020, 1, 1.0, "arb"]])
     result = _query_comparable_contracts(orphan_contracts, _players_fixture(), player_id="Ghost_9")
@@ -0,0 +1,174 @@
+"""Tests for the comparables index: it must agree exactly with the full scan."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent.predict.comparables import (
+    _query_comparable_contracts,
+    _query_comparable_contracts_batch,
+    _scan_comparable_contracts,
+    comparables_view,
+)
+
+CONTRACT_COLUMNS = ["contract_id", "player_id", "age", "service_time", "year", "duration", "value", "type"]
+PLAYER_COLUMNS = ["player_id", "fangraphs_id", "first_name", "last_name", "position", "spotrac_link"]
+POSITIONS = ["SP", "RP", "SP/SP1", "C", "1B/3B", "3B/DH", "OF", "SS"]
+PHASES = ["pre-arb", "arb", "free-agent"]
+
+
+def synthetic_dataset(seed=0, n_players=60, n_contracts=600):
+    rng = random.Random(seed)
+    players = pd.DataFrame(
+        [
+            [f"P_{i}", i, f"First{i}", f"Last{i}", rng.choice(POSITIONS), "x"]
+            for i in range(n_players)
+        ],
+        columns=PLAYER_COLUMNS,
+    )
+    rows = []
+    for n in range(n_contracts):
+        phase = rng.choice(PHASES)
+        service_time = -1 if phase == "free-agent" else round(rng.uniform(0, 6), 3)
+        rows.append([
+            f"C_{n}",
+            # a few contracts belong to players missing from players.csv
+            f"P_{rng.randrange(n_players + 5)}",
+            rng.choice([-1] + list(range(21, 40))),
+            service_time,
+            rng.randint(2011, 2026),
+            rng.choice([0, 1, 1, 1, 2, 5]),
+            round(rng.uniform(0.5, 40), 2),
+            phase,
+        ])
+    return pd.DataFrame(rows, columns=CONTRACT_COLUMNS), players
+
+
+def random_spec(rng, n_players):
+    spec = {"limit": rng.choice([0, 1, 3, 15, 1000])}
+    if rng.random() < 0.3:
+        spec["player_id"] = f"P_{rng.randrange(n_players + 5)}"
+    if rng.random() < 0.5:
+        spec["position"] = rng.choice(["sp", "SP", "3B", "b", "DH", "zz"])
+    if rng.random() < 0.5:
+        spec["phase"] = rng.choice(PHASES)
+    if rng.random() < 0.4:
+        spec["min_age"] = rng.choice([-1, 20, 25.5, 30])
+    if rng.random() < 0.4:
+        spec["max_age"] = rng.choice([-1, 24, 28.5, 35])
+    if spec.get("phase") != "free-agent":
+        if rng.random() < 0.3:
+            spec["min_service_time"] = rng.uniform(0, 4)
+        if rng.random() < 0.3:
+            spec["max_service_time"] = rng.uniform(1, 6)
+    if rng.random() < 0.4:
+        spec["min_year"] = rng.randint(2010, 2026)
+    if rng.random() < 0.4:
+        spec["max_year"] = rng.randint(2011, 2027)
+    if rng.random() < 0.7:
+        spec["before_year"] = rng.randint(2011, 2028)
+    if rng.random() < 0.3:
+        spec["exclude_player_id"] = f"P_{rng.randrange(n_players)}"
+    return spec
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return synthetic_dataset()
+
+
+def test_matches_full_scan_on_random_specs(dataset):
+    contracts_df, players_df = dataset
+    rng = random.Random(1)
+    for _ in range(500):
+        spec = random_spec(rng, 60)
+        assert _query_comparable_contracts(contracts_df, players_df, **spec) == _scan_comparable_contracts(
+            contracts_df, players_df, **spec
+        ), spec
+
+
+def test_rows_are_year_descending_with_stable_ties(dataset):
+    index = comparables_view(*dataset).index
+    assert (np.diff(index.year) <= 0).all()
+    for year in np.unique(index.year):
+        same_year = index.order[index.year == year]
+        assert (np.diff(same_year) > 0).all()
+
+
+def test_before_year_is_a_contiguous_slice(dataset):
+    index = comparables_view(*dataset).index
+    start, end = index._year_slice(None, None, 2020)
+    assert (index.year[start:end] < 2020).all()
+    assert (index.year[:start] >= 2020).all()
+    assert end == len(index)
+
+
+def test_empty_year_window(dataset):
+    result = _query_comparable_contracts(*dataset, min_year=2024, max_year=2020)
+    assert result == {"matches": [], "n_matches_before_limit": 0}
+
+
+def test_nan_ages_never_match_an_age_bound():
+    contracts_df = pd.DataFrame(
+        [
+            ["A_1", "P_1", np.nan, 1.0, 2020, 1, 1.0, "arb"],
+            ["A_2", "P_1", 27, 1.0, 2021, 1, 1.0, "arb"],
+        ],
+        columns=CONTRACT_COLUMNS,
+    )
+    players_df = pd.DataFrame([["P_1", 1, "A", "B", "SP", "x"]], columns=PLAYER_COLUMNS)
+    for spec in [{"min_age": 20}, {"max_age": 30}, {"min_age": 20, "max_age": 30}]:
+        result = _query_comparable_contracts(contracts_df, players_df, **spec)
+        assert [m["contract_id"] for m in result["matches"]] == ["A_2"]
+        assert result == _scan_comparable_contracts(contracts_df, players_df, **spec)
+
+
+def test_batch_matches_single_queries_in_input_order(dataset):
+    contracts_df, players_df = dataset
+    rng = random.Random(2)
+    specs = []
+    for _ in range(700):
+        spec = random_spec(rng, 60)
+        spec.setdefault("before_year", rng.randint(2011, 2028))
+        specs.append(spec)
+    results = _query_comparable_contracts_batch(contracts_df, players_df, specs)
+    assert len(results) == len(specs)
+    for spec, result in zip(specs, results):
+        assert result == _query_comparable_contracts(contracts_df, players_df, **spec), spec
+
+
+def test_batch_chunks_agree(dataset):
+    index = comparables_view(*dataset).index
+    rng = random.Random(3)
+    specs = [
+        {**dict.fromkeys(["min_age", "max_age", "min_service_time", "max_service_time", "min_year", "max_year"]),
+         "player_id": "", "position": "SP", "phase": rng.choice(PHASES), "exclude_player_id": "",
+         "before_year": rng.randint(2012, 2027), "limit": 5, "has_service_time_bound": False}
+        for _ in range(20)
+    ]
+    whole = index.query_batch(specs)
+    chunked = index.query_batch(specs, chunk_size=3)
+    for (rows_a, total_a), (rows_b, total_b) in zip(whole, chunked):
+        assert np.array_equal(rows_a, rows_b) and total_a == total_b
+
+
+def test_batch_requires_before_year_per_spec(dataset):
+    with pytest.raises(ValueError, match="spec 1: before_year is required"):
+        _query_comparable_contracts_batch(*dataset, [{"before_year": 2020}, {"phase": "arb"}])
+    with pytest.raises(ValueError, match="spec 0: before_year is required"):
+        _query_comparable_contracts_batch(*dataset, [{"before_year": None}])
+
+
+def test_batch_validates_every_spec(dataset):
+    with pytest.raises(ValueError, match="free-agent"):
+        _query_comparable_contracts_batch(
+            *dataset, [{"before_year": 2020}, {"before_year": 2020, "phase": "free-agent", "min_service_time": 1}]
+        )
+    with pytest.raises(TypeError, match="has_service_time_bound"):
+        _query_comparable_contracts_batch(*dataset, [{"before_year": 2020, "has_service_time_bound": True}])
+
+
+def test_batch_of_nothing(dataset):
+    assert _query_comparable_contracts_batch(*dataset, []) == []
@@ -0,0 +1,104 @@
+"""Tests for agent/predict/http_fixtures.py: the request-keyed store on its
+own, and mlb_stats_api recording against the local stub statsapi then
+replaying with the stub shut down."""
+
+import pytest
+
+from agent.predict import mlb_stats_api as api
+from agent.predict.http_fixtures import FixtureMissError, FixtureStore
+from agent.predict.rate_limit import AdaptiveRateLimiter, CircuitBreaker
+from agent.predict.single_flight import SingleFlight
+from agent.predict.stats_cache import StatsCache
+from agent.predict.tests.stub_statsapi import StubStatsApi
+
+PLAYERS = {f"P_{i}": 660000 + i for i in range(3)}
+URL = "https://statsapi.mlb.com/api/v1/people/1/stats"
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(api, "STATS_CACHE", StatsCache(tmp_path / "statsapi_cache"))
+    monkeypatch.setattr(api, "STATS_FLIGHT", SingleFlight())
+    monkeypatch.setattr(api, "_session", None)
+    monkeypatch.setattr(api, "resolve_mlbam_id", lambda pid: PLAYERS.get(pid))
+    monkeypatch.setattr(api.stats_warehouse, "WAREHOUSE_PATH", tmp_path / "statsapi_warehouse.parquet")
+    monkeypatch.setattr(api, "HTTP_FIXTURES", FixtureStore(tmp_path / "statsapi_fixtures"))
+    monkeypatch.setattr(api, "STATS_LIMITER", AdaptiveRateLimiter(1000))
+    monkeypatch.setattr(api, "STATS_BREAKER", CircuitBreaker(api.BREAKER_FAILURE_THRESHOLD, api.BREAKER_RESET_SECONDS))
+
+
+class TestFixtureStore:
+    def test_key_ignores_param_order_and_value_types(self):
+        assert FixtureStore.key(URL, {"stats": "yearByYear", "group": "hitting"}) == FixtureStore.key(
+            URL, {"group": "hitting", "stats": "yearByYear"}
+        )
+        assert FixtureStore.key(URL, {"limit": 5}) == FixtureStore.key(URL, {"limit": "5"})
+        assert FixtureStore.key(URL, {"group": "hitting"}) != FixtureStore.key(URL, {"group": "pitching"})
+
+    def test_record_then_replay(self, tmp_path):
+        FixtureStore(tmp_path, "record").record(URL, {"group": "hitting"}, {"stats": []})
+        store = FixtureStore(tmp_path, "replay")
+        assert store.replay(URL, {"group": "hitting"}) == {"stats": []}
+        assert store.counters["replayed"] == 1
+
+    def test_miss_raises_and_is_remembered(self, tmp_path):
+        store = FixtureStore(tmp_path, "replay")
+        with pytest.raises(FixtureMissError, match="re-run with --http-fixtures record"):
+            store.replay(URL, {"group": "hitting"})
+        with pytest.raises(FixtureMissError, match="1 statsapi request"):
+            store.raise_for_misses()
+        store.raise_for_misses()  # reset after raising
+
+    def test_clear_misses(self, tmp_path):
+        store = FixtureStore(tmp_path, "replay")
+        with pytest.raises(FixtureMissError):
+            store.replay(URL, None)
+        store.clear_misses()
+        store.raise_for_misses()
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown HTTP fixture mode"):
+            FixtureStore(tmp_path, "playback")
+
+
+class TestRecordReplay:
+    def query(self, before_year=2024):
+        return api._query_stats(list(PLAYERS), "hitting", ["gamesPlayed", "avg"], before_year, None, None)
+
+    def record(self, monkeypatch, tmp_path):
+        with StubStatsApi() as stub:
+            monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+            api.use_http_fixtures("record", tmp_path / "fixtures")
+            recorded = self.query()
+        return stub, recorded
+
+    def test_replay_matches_recording_with_no_network(self, monkeypatch, tmp_path):
+        stub, recorded = self.record(monkeypatch, tmp_path)
+        # one per-player request each: no batched prefetch while recording
+        assert stub.requests == len(PLAYERS)
+        assert all("/stats?" in path for path in stub.paths)
+
+        store = api.use_http_fixtures("replay", tmp_path / "fixtures")
+        monkeypatch.setattr(api, "_http_session", lambda: pytest.fail("replay touched the network"))
+        assert self.query() == recorded
+        assert store.counters["replayed"] == len(PLAYERS)
+        store.raise_for_misses()
+
+    def test_replay_bypasses_the_cache(self, monkeypatch, tmp_path):
+        self.record(monkeypatch, tmp_path)
+        # recording skipped the cache, so nothing local can hide a replay gap
+        assert api.STATS_CACHE.read(660000, "hitting") is None
+        store = api.use_http_fixtures("replay", tmp_path / "empty")
+        with pytest.raises(FixtureMissError):
+            self.query()
+        with pytest.raises(FixtureMissError, match="660000"):
+            store.raise_for_misses()
+
+    def test_use_http_fixtures_live_restores_network_path(self, monkeypatch, tmp_path):
+        with StubStatsApi() as stub:
+            monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+            store = api.use_http_fixtures("live", tmp_path / "fixtures")
+            self.query()
+        assert not store.active
+        assert stub.paths[0].startswith("/api/v1/people?personIds=")
+        assert not (tmp_path / "fixtures").exists()
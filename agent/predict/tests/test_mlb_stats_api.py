@@ -1,16 +1,38 @@
 """Tests for agent/predict/mlb_stats_api.py (no real network calls).
 
-requests.get is monkeypatched at the module boundary so retry/backoff logic
+The shared HTTP session is monkeypatched at the module boundary so retry/backoff logic
 can be exercised deterministically; time.sleep is monkeypatched to a no-op so
-these run instantly despite testing exponential backoff timing.
+these run instantly despite testing exponential backoff timing. Every test
+gets a fresh on-disk stats cache under tmp_path, so nothing leaks between
+tests or into dataset/.
 """
 
+import threading
+import time
 import types
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import pytest
 
 from agent.predict import mlb_stats_api as api
+from agent.predict.http_fixtures import FixtureStore
+from agent.predict.rate_limit import AdaptiveRateLimiter, CircuitBreaker
+from agent.predict.single_flight import SingleFlight
+from agent.predict.stats_cache import StatsCache
+from agent.predict.tests.stub_statsapi import StubStatsApi
+
+
+@pytest.fixture(autouse=True)
+def isolated_stats_cache(monkeypatch, tmp_path):
+    cache = StatsCache(tmp_path / "statsapi_cache")
+    monkeypatch.setattr(api, "STATS_CACHE", cache)
+    monkeypatch.setattr(api, "STATS_FLIGHT", SingleFlight())
+    monkeypatch.setattr(api.stats_warehouse, "WAREHOUSE_PATH", tmp_path / "statsapi_warehouse.parquet")
+    monkeypatch.setattr(api, "HTTP_FIXTURES", FixtureStore(tmp_path / "statsapi_fixtures"))
+    monkeypatch.setattr(api, "STATS_LIMITER", AdaptiveRateLimiter(1000))
+    monkeypatch.setattr(api, "STATS_BREAKER", CircuitBreaker(api.BREAKER_FAILURE_THRESHOLD, api.BREAKER_RESET_SECONDS))
+    return cache
 
 
 def _http_error(status_code):
@@ -50,7 +72,7 @@ class TestGetJsonRetry:
             calls.append(1)
             return FakeResponse()
 
-        monkeypatch.setattr(api.requests, "get", fake_get)
+        monkeypatch.setattr(api, "_http_session", lambda: types.SimpleNamespace(get=fake_get))
         monkeypatch.setattr(api.time, "sleep", lambda _: None)
 
         result = api._get_json("http://x", params={})
@@ -74,7 +96,7 @@ class TestGetJsonRetry:
                 raise requests.Timeout("slow")
             return FakeResponse()
 
-        monkeypatch.setattr(api.requests, "get", fake_get)
+        monkeypatch.setattr(api, "_http_session", lambda: types.SimpleNamespace(get=fake_get))
         monkeypatch.setattr(api.time, "sleep", lambda s: sleeps.append(s))
 
         result = api._get_json("http://x", params={})
@@ -90,7 +112,7 @@ class TestGetJsonRetry:
             calls.append(1)
             raise requests.ConnectionError("down")
 
-        monkeypatch.setattr(api.requests, "get", fake_get)
+        monkeypatch.setattr(api, "_http_session", lambda: types.SimpleNamespace(get=fake_get))
         monkeypatch.setattr(api.time, "sleep", lambda _: None)
 
         with pytest.raises(RuntimeError, match="MLB Stats API request failed"):
@@ -108,7 +130,7 @@ class TestGetJsonRetry:
             calls.append(1)
             return FakeResponse()
 
-        monkeypatch.setattr(api.requests, "get", fake_get)
+        monkeypatch.setattr(api, "_http_session", lambda: types.SimpleNamespace(get=fake_get))
         monkeypatch.setattr(api.time, "sleep", lambda _: (_ for _ in ()).throw(AssertionError("should not sleep")))
 
         with pytest.raises(RuntimeError, match="MLB Stats API request failed"):
@@ -116,6 +138,26 @@ class TestGetJsonRetry:
         assert len(calls) == 1  # no retry wasted on a definitive client error
 
 
+class TestHttpSession:
+    def test_one_shared_pooled_session(self):
+        session = api._http_session()
+        assert api._http_session() is session
+        adapter = session.get_adapter("https://statsapi.mlb.com")
+        assert adapter._pool_maxsize == api.STATS_API_POOL_SIZE
+        # retrying is _get_json's job, not the adapter's
+        assert adapter.max_retries.total == 0
+        assert session.headers["Accept"] == "application/json"
+
+    def test_requests_reuse_one_keep_alive_connection(self, monkeypatch):
+        monkeypatch.setattr(api, "_session", None)
+        with StubStatsApi() as stub:
+            for mlbam_id in (1, 2, 3, 4, 5):
+                data = api._get_json(f"{stub.base_url}/people/{mlbam_id}/stats", {"group": "hitting"})
+                assert data["stats"][0]["splits"]
+            assert stub.requests == 5
+            assert stub.connections == 1
+
+
 class TestCoerce:
     def test_numeric_strings_become_floats(self):
         assert api._coerce(".313") == pytest.approx(0.313)
@@ -212,6 +254,52 @@ class TestSeasonStatus:
         assert all(r["season_status"] == "complete" for r in rows)
 
 
+class TestResponseCache:
+    def _splits(self, years):
+        return {"stats": [{"splits": [{"season": str(y), "stat": {"avg": ".250"}} for y in years]}]}
+
+    def test_completed_seasons_served_from_disk(self, monkeypatch, isolated_stats_cache):
+        calls = []
+
+        def fake_get_json(url, params):
+            calls.append(url)
+            return self._splits([2023, 2024, 2025])
+
+        monkeypatch.setattr(api, "datetime", _FixedDatetime(2025))
+        monkeypatch.setattr(api, "_get_json", fake_get_json)
+        first = api._fetch_year_by_year(7, "hitting", ["avg"], before_year=2025, min_year=None, max_year=None)
+        second = api._fetch_year_by_year(7, "hitting", ["avg"], before_year=2025, min_year=None, max_year=None)
+        assert first == second
+        assert [r["year"] for r in second] == [2023, 2024]
+        assert len(calls) == 1
+        assert isolated_stats_cache.counters["hits"] == 1
+
+    def test_groups_cached_separately(self, monkeypatch):
+        calls = []
+
+        def fake_get_json(url, params):
+            calls.append(params["group"])
+            return self._splits([2020])
+
+        monkeypatch.setattr(api, "_get_json", fake_get_json)
+        for group in ("hitting", "pitching", "hitting"):
+            api._fetch_year_by_year(7, group, ["avg"], before_year=2021, min_year=None, max_year=None)
+        assert calls == ["hitting", "pitching"]
+
+    def test_latest_needed_season(self):
+        assert api._latest_needed_season(None, None) is None
+        assert api._latest_needed_season(2026, None) == 2025
+        assert api._latest_needed_season(2026, 2020) == 2020
+        assert api._latest_needed_season(None, 2020) == 2020
+
+
+@pytest.fixture
+def no_batching(monkeypatch):
+    """Exercise the per-player path: skip the batched prefetch."""
+    monkeypatch.setattr(api, "_prefetch_year_by_year", lambda *args: None)
+
+
+@pytest.mark.usefixtures("no_batching")
 class TestQueryStats:
     def test_unmapped_players_reported_separately(self, monkeypatch):
         monkeypatch.setattr(api, "resolve_mlbam_id", lambda pid: None)
@@ -227,6 +315,167 @@ class TestQueryStats:
         assert "unmapped_player_ids" not in result
 
 
+@pytest.mark.usefixtures("no_batching")
+class TestConcurrentFanOut:
+    """Multi-player lookups against the local stub statsapi with injected latency."""
+
+    PLAYERS = {f"P_{i}": 660000 + i for i in range(6)}
+
+    @pytest.fixture
+    def stub(self, monkeypatch):
+        monkeypatch.setattr(api, "_session", None)
+        monkeypatch.setattr(api, "resolve_mlbam_id", lambda pid: self.PLAYERS.get(pid))
+        with StubStatsApi(latency=0.2) as stub:
+            monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+            yield stub
+
+    def test_players_fetched_in_parallel(self, stub):
+        start = time.perf_counter()
+        result = api._query_stats(list(self.PLAYERS), "hitting", ["avg"], 2024, None, None)
+        elapsed = time.perf_counter() - start
+        assert stub.requests == 6
+        assert stub.max_in_flight > 1
+        assert elapsed < 6 * 0.2 * 0.75  # well under the serial 1.2s
+        assert list(result["stats"]) == list(self.PLAYERS)
+
+    def test_concurrency_is_capped(self, stub, monkeypatch):
+        monkeypatch.setattr(api, "_fetch_pool", ThreadPoolExecutor(max_workers=2))
+        api._query_stats(list(self.PLAYERS), "pitching", ["era"], None, None, None)
+        assert stub.requests == 6
+        assert stub.max_in_flight <= 2
+
+    def test_order_unmapped_and_before_year_preserved(self, stub):
+        player_ids = ["P_3", "Ghost_1", "P_0", "P_5", "Ghost_2"]
+        result = api._query_stats(player_ids, "hitting", ["avg"], 2020, 2017, None)
+        assert list(result["stats"]) == ["P_3", "P_0", "P_5"]
+        assert result["unmapped_player_ids"] == ["Ghost_1", "Ghost_2"]
+        for rows in result["stats"].values():
+            assert [r["year"] for r in rows] == [2017, 2018, 2019]
+
+    def test_first_failure_in_input_order_is_raised(self, monkeypatch):
+        monkeypatch.setattr(api, "resolve_mlbam_id", lambda pid: int(pid))
+
+        def fake_fetch(mlbam_id, *args):
+            time.sleep(0.05 * (4 - mlbam_id))  # later ids fail first
+            if mlbam_id >= 2:
+                raise RuntimeError(f"MLB Stats API request failed: player {mlbam_id}")
+            return []
+
+        monkeypatch.setattr(api, "_fetch_year_by_year", fake_fetch)
+        with pytest.raises(RuntimeError, match="player 2"):
+            api._query_stats(["1", "2", "3"], "hitting", ["avg"], None, None, None)
+
+
+class TestBatchedFetch:
+    PLAYERS = {f"P_{i}": 660000 + i for i in range(6)}
+
+    @pytest.fixture
+    def serve(self, monkeypatch):
+        monkeypatch.setattr(api, "_session", None)
+        monkeypatch.setattr(api, "resolve_mlbam_id", lambda pid: self.PLAYERS.get(pid))
+        stubs = []
+
+        def serve(**options):
+            stub = StubStatsApi(**options)
+            stub.start()
+            stubs.append(stub)
+            monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+            return stub
+
+        yield serve
+        for stub in stubs:
+            stub.stop()
+
+    def per_player_rows(self, monkeypatch, tmp_path, group, fields):
+        """The same lookup through the per-player path only, for comparison."""
+        monkeypatch.setattr(api, "STATS_CACHE", StatsCache(tmp_path / "per_player"))
+        monkeypatch.setattr(api, "_prefetch_year_by_year", lambda *args: None)
+        return api._query_stats(list(self.PLAYERS), group, fields, 2024, None, None)
+
+    def test_one_request_for_all_players_and_both_groups(self, serve, monkeypatch, tmp_path):
+        stub = serve()
+        batting = api._query_stats(list(self.PLAYERS), "hitting", ["avg"], 2024, None, None)
+        pitching = api._query_stats(list(self.PLAYERS), "pitching", ["era"], 2024, None, None)
+        assert stub.requests == 1
+        assert stub.paths[0].startswith("/api/v1/people?personIds=")
+
+        assert batting == self.per_player_rows(monkeypatch, tmp_path, "hitting", ["avg"])
+        assert pitching == self.per_player_rows(monkeypatch, tmp_path, "pitching", ["era"])
+
+    def test_ids_are_chunked(self, serve, monkeypatch):
+        stub = serve()
+        monkeypatch.setattr(api, "STATS_BATCH_SIZE", 4)
+        api._query_stats(list(self.PLAYERS), "hitting", ["avg"], 2024, None, None)
+        assert stub.requests == 2
+        assert all("personIds" in path for path in stub.paths)
+
+    def test_failed_batch_falls_back_to_per_player_calls(self, serve, monkeypatch):
+        monkeypatch.setattr(api.time, "sleep", lambda _: None)
+        stub = serve(fail_batches=True)
+        result = api._query_stats(list(self.PLAYERS), "hitting", ["avg"], 2024, None, None)
+        assert set(result["stats"]) == set(self.PLAYERS)
+        per_player = [path for path in stub.paths if "/stats?" in path]
+        assert len(per_player) == len(self.PLAYERS)
+
+    def test_player_missing_from_batch_fetched_individually(self, serve):
+        stub = serve(omit_ids={660002})
+        result = api._query_stats(list(self.PLAYERS), "hitting", ["avg"], 2024, None, None)
+        assert result["stats"]["P_2"]
+        assert stub.paths[1:] == [f"/api/v1/people/660002/stats?stats=yearByYear&group=hitting"]
+
+    def test_cached_players_not_refetched(self, serve):
+        stub = serve()
+        api._query_stats(["P_0", "P_1"], "hitting", ["avg"], 2024, None, None)
+        api._query_stats(list(self.PLAYERS), "hitting", ["avg"], 2024, None, None)
+        assert stub.requests == 2
+        assert "660000" not in stub.paths[1] and "660005" in stub.paths[1]
+
+    def test_concurrent_identical_lookups_coalesced(self, serve):
+        stub = serve(latency=0.2)
+        threads = [
+            threading.Thread(target=api._query_stats, args=(["P_0", "P_1"], "hitting", ["avg"], 2024, None, None))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stub.requests == 1
+        assert api.STATS_FLIGHT.counters["coalesced"] >= 1
+
+    @pytest.mark.usefixtures("no_batching")
+    def test_concurrent_per_player_lookups_coalesced(self, serve):
+        stub = serve(latency=0.2)
+        threads = [
+            threading.Thread(target=api._fetch_year_by_year, args=(660003, "pitching", ["era"], None, None, None))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stub.requests == 1
+        assert api.STATS_FLIGHT.counters == {"leaders": 1, "coalesced": 4}
+
+    def test_batch_response_parsing(self, monkeypatch):
+        monkeypatch.setattr(api, "_get_json", lambda url, params: {
+            "people": [
+                {"id": 1, "stats": [
+                    {"type": {"displayName": "yearByYear"}, "group": {"displayName": "hitting"}, "splits": [{"season": "2024"}]},
+                    {"type": {"displayName": "career"}, "group": {"displayName": "hitting"}, "splits": [{"season": "x"}]},
+                ]},
+                {"id": 2},
+            ]
+        })
+        assert api._fetch_splits_batch([1, 2, 3]) == {
+            (1, "hitting"): [{"season": "2024"}],
+            (1, "pitching"): [],
+            (2, "hitting"): [],
+            (2, "pitching"): [],
+        }
+
+
+@pytest.mark.usefixtures("no_batching")
 class TestToolFactories:
     def test_before_year_not_exposed_to_the_model(self):
         for factory in (api.make_batting_stats_tool, api.make_pitching_stats_tool):
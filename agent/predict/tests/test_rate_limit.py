@@ -0,0 +1,191 @@
+"""Tests for agent/predict/rate_limit.py: the AIMD token bucket and circuit
+breaker on an injected clock, and _get_json pacing through them (no network)."""
+
+import types
+
+import pytest
+import requests
+
+from agent.predict import mlb_stats_api as api
+from agent.predict.rate_limit import CLOSED, HALF_OPEN, OPEN, AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError
+from agent.predict.stats_cache import StatsCache
+
+
+class Clock:
+    """A fake monotonic clock whose sleep() just advances it."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def limiter(clock, rate=10.0, **options):
+    return AdaptiveRateLimiter(rate, clock=clock, sleep=clock.sleep, **options)
+
+
+class TestAdaptiveRateLimiter:
+    def test_burst_then_paced_at_rate(self, clock):
+        bucket = limiter(clock, rate=10.0, burst=3)
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(0.1)
+        assert bucket.counters["throttled"] == 1
+        assert bucket.counters["throttled_seconds"] == pytest.approx(0.1)
+
+    def test_throttle_halves_rate_once_per_cooldown(self, clock):
+        bucket = limiter(clock, rate=8.0, cooldown_seconds=1.0)
+        for _ in range(5):  # one burst of simultaneous 429s
+            bucket.on_throttle()
+        assert bucket.rate == 4.0
+        clock.now += 1.0
+        bucket.on_throttle()
+        assert bucket.rate == 2.0
+        assert bucket.counters["decreases"] == 2
+
+    def test_rate_floor(self, clock):
+        bucket = limiter(clock, rate=1.0, min_rate=0.5, cooldown_seconds=0)
+        for _ in range(5):
+            bucket.on_throttle()
+        assert bucket.rate == 0.5
+
+    def test_success_recovers_additively_up_to_max(self, clock):
+        bucket = limiter(clock, rate=10.0, increase=1.0)
+        bucket.on_throttle()
+        assert bucket.rate == 5.0
+        for _ in range(3):
+            bucket.on_success()
+        assert bucket.rate == 8.0
+        for _ in range(10):
+            bucket.on_success()
+        assert bucket.rate == 10.0
+
+    def test_retry_after_pauses_every_caller(self, clock):
+        bucket = limiter(clock, rate=100.0)
+        bucket.on_throttle(retry_after=2.0)
+        assert bucket.snapshot()["paused_for"] == 2.0
+        assert bucket.acquire() == pytest.approx(2.0)
+        assert bucket.counters["pauses"] == 1
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_and_rejects(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+        for _ in range(3):
+            breaker.before_call()
+            breaker.on_failure()
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError, match="circuit open"):
+            breaker.before_call()
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_success_resets_the_failure_count(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, clock=clock)
+        breaker.on_failure()
+        breaker.on_failure()
+        breaker.on_success()
+        breaker.on_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_one_probe(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30, clock=clock)
+        breaker.on_failure()
+        clock.now += 30
+        breaker.before_call()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # a second caller while the probe is out
+        breaker.on_success()
+        assert breaker.state == CLOSED
+        breaker.before_call()
+
+    def test_failed_probe_reopens(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30, clock=clock)
+        breaker.on_failure()
+        clock.now += 30
+        breaker.before_call()
+        breaker.on_failure()
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.counters["opened"] == 2
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b'{"ok": true}'
+    return response
+
+
+class TestGetJsonPacing:
+    @pytest.fixture(autouse=True)
+    def shared(self, monkeypatch, tmp_path, clock):
+        monkeypatch.setattr(api, "STATS_LIMITER", limiter(clock, rate=10.0))
+        monkeypatch.setattr(api, "STATS_BREAKER", CircuitBreaker(3, 30, clock=clock))
+        monkeypatch.setattr(api, "STATS_CACHE", StatsCache(tmp_path / "statsapi_cache"))
+        monkeypatch.setattr(api.time, "sleep", lambda _: None)
+
+    def serve(self, monkeypatch, statuses):
+        """Answer successive GETs with these status codes (the last one repeats)."""
+        calls = []
+
+        def fake_get(*args, **kwargs):
+            calls.append(1)
+            status = statuses[min(len(calls), len(statuses)) - 1]
+            return _response(status, {"Retry-After": "1"} if status == 429 else None)
+
+        monkeypatch.setattr(api, "_http_session", lambda: types.SimpleNamespace(get=fake_get))
+        return calls
+
+    def test_429_slows_the_shared_limiter(self, monkeypatch, clock):
+        self.serve(monkeypatch, [429, 200])
+        assert api._get_json("http://x", {}) == {"ok": True}
+        status = api.stats_api_status()["limiter"]
+        assert status["decreases"] == 1
+        assert status["pauses"] == 1
+        assert status["rate"] == pytest.approx(5.1)  # halved, then one success
+        assert clock.sleeps == [pytest.approx(1.0)]  # the Retry-After pause
+
+    def test_outage_opens_circuit_then_fails_fast(self, monkeypatch):
+        calls = self.serve(monkeypatch, [503])
+        with pytest.raises(RuntimeError):
+            api._get_json("http://x", {})
+        assert len(calls) == api.MAX_HTTP_ATTEMPTS
+        assert api.STATS_BREAKER.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            api._get_json("http://x", {})
+        assert len(calls) == api.MAX_HTTP_ATTEMPTS  # rejected without a request
+
+    def test_client_errors_do_not_open_the_circuit(self, monkeypatch):
+        self.serve(monkeypatch, [404])
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                api._get_json("http://x", {})
+        assert api.STATS_BREAKER.state == CLOSED
+
+    def test_stale_cache_served_while_open(self, monkeypatch, tmp_path, clock):
+        cache = StatsCache(tmp_path / "stale", ttl_seconds=60, clock=clock)
+        splits = [{"season": "2026", "stat": {"avg": ".250"}}]
+        cache.write(1, "hitting", splits, current_season=2026)
+        clock.now += 61
+        for _ in range(3):
+            api.STATS_BREAKER.on_failure()
+
+        calls = self.serve(monkeypatch, [200])
+        assert cache.get(1, "hitting", lambda: api._fetch_splits(1, "hitting"), 2026) == splits
+        cache._executor.shutdown(wait=True)
+        assert calls == []
+        assert cache.counters["stale_served"] == 1
@@ -0,0 +1,147 @@
+"""Tests for agent/predict/single_flight.py: concurrent callers share one call."""
+
+import threading
+import time
+
+import pytest
+
+from agent.predict.single_flight import SingleFlight
+
+
+def run_concurrently(n, target):
+    """Start n threads running target(i) together; returns their results in order."""
+    results = [None] * n
+    errors = [None] * n
+    barrier = threading.Barrier(n)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target(i)
+        except Exception as error:  # collected for the assertion
+            errors[i] = error
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestDo:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"splits": [1, 2]}
+
+        results, errors = run_concurrently(8, lambda i: flight.do(("660271", "hitting"), slow))
+        assert errors == [None] * 8
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.counters == {"leaders": 1, "coalesced": 7}
+
+    def test_error_shared_with_waiters(self):
+        flight = SingleFlight()
+
+        def failing():
+            time.sleep(0.2)
+            raise RuntimeError("MLB Stats API request failed: 503")
+
+        _, errors = run_concurrently(4, lambda i: flight.do("key", failing))
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert flight.counters["leaders"] == 1
+
+    def test_distinct_keys_not_coalesced(self):
+        flight = SingleFlight()
+        results, _ = run_concurrently(4, lambda i: flight.do(i, lambda: i * 10))
+        assert results == [0, 10, 20, 30]
+        assert flight.counters == {"leaders": 4, "coalesced": 0}
+
+    def test_sequential_calls_each_run(self):
+        flight = SingleFlight()
+        calls = []
+        for _ in range(3):
+            flight.do("key", lambda: calls.append(1))
+        assert len(calls) == 3
+
+
+class TestDoMany:
+    def test_single_callers_wait_on_a_batch(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def batch(keys):
+            started.set()
+            release.wait(5)
+            return {key: f"batch-{key}" for key in keys}
+
+        leader = threading.Thread(target=lambda: flight.do_many(["a", "b"], batch))
+        leader.start()
+        started.wait(5)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(flight.do("a", lambda: "own-call")))
+        waiter.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        waiter.join()
+        assert results == ["batch-a"]
+        assert flight.counters == {"leaders": 2, "coalesced": 1}
+
+    def test_key_missing_from_batch_makes_waiter_call_itself(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def batch(keys):
+            started.set()
+            release.wait(5)
+            return {"a": "batch-a"}  # "b" not returned
+
+        leader = threading.Thread(target=lambda: flight.do_many(["a", "b"], batch))
+        leader.start()
+        started.wait(5)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(flight.do("b", lambda: "own-call")))
+        waiter.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        waiter.join()
+        assert results == ["own-call"]
+
+    def test_batches_join_keys_already_in_flight(self):
+        flight = SingleFlight()
+        requested = []
+
+        def batch(keys):
+            requested.append(sorted(keys))
+            time.sleep(0.2)
+            return {key: key.upper() for key in keys}
+
+        key_sets = [["a", "b", "c"], ["b", "c", "d"]]
+
+        def call(i):
+            time.sleep(0.05 * i)  # second batch starts while the first is in flight
+            return flight.do_many(key_sets[i], batch)
+
+        results, errors = run_concurrently(2, call)
+        assert errors == [None, None]
+        assert requested == [["a", "b", "c"], ["d"]]
+        assert results[1] == {"b": "B", "c": "C", "d": "D"}
+
+    def test_failed_batch_raises_and_releases_keys(self):
+        flight = SingleFlight()
+
+        def failing(keys):
+            raise RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            flight.do_many(["a"], failing)
+        assert flight.do("a", lambda: "retry") == "retry"
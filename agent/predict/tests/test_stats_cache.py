@@ -0,0 +1,138 @@
+"""Tests for agent/predict/stats_cache.py: season-aware freshness and
+stale-while-revalidate, with an injected clock and fake fetch functions (no
+network)."""
+
+import threading
+
+import pytest
+
+from agent.predict.stats_cache import StatsCache
+
+SPLITS = [{"season": "2024", "stat": {"avg": ".300"}}]
+NEWER = [{"season": "2024", "stat": {"avg": ".300"}}, {"season": "2025", "stat": {"avg": ".280"}}]
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return StatsCache(tmp_path, ttl_seconds=100, revalidate_wait_seconds=1.0, clock=clock)
+
+
+def counting(splits):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return splits
+
+    return fetch, calls
+
+
+class TestFreshness:
+    def test_miss_fetches_and_stores(self, cache):
+        fetch, calls = counting(SPLITS)
+        assert cache.get(1, "hitting", fetch, current_season=2025) == SPLITS
+        assert cache.read(1, "hitting")["splits"] == SPLITS
+        assert len(calls) == 1
+        assert cache.counters["misses"] == 1
+
+    def test_completed_seasons_never_expire(self, cache, clock):
+        fetch, calls = counting(SPLITS)
+        cache.get(1, "hitting", fetch, current_season=2025, through_season=2024)
+        clock.now += 10 * 365 * 24 * 3600
+        # years later, a request that only needs seasons complete at fetch time
+        assert cache.get(1, "hitting", fetch, current_season=2035, through_season=2024) == SPLITS
+        assert len(calls) == 1
+
+    def test_in_progress_season_served_within_ttl(self, cache, clock):
+        fetch, calls = counting(SPLITS)
+        cache.get(1, "hitting", fetch, current_season=2025)
+        clock.now += 50
+        cache.get(1, "hitting", fetch, current_season=2025)
+        assert len(calls) == 1
+        assert cache.counters["hits"] == 1
+
+    def test_in_progress_season_refetched_after_ttl(self, cache, clock):
+        cache.get(1, "hitting", counting(SPLITS)[0], current_season=2025)
+        clock.now += 101
+        fetch, calls = counting(NEWER)
+        assert cache.get(1, "hitting", fetch, current_season=2025) == NEWER
+        assert len(calls) == 1
+        assert cache.read(1, "hitting")["splits"] == NEWER
+
+    def test_new_calendar_year_refetches(self, cache):
+        cache.get(1, "hitting", counting(SPLITS)[0], current_season=2025)
+        fetch, calls = counting(NEWER)
+        # needs 2025, which was in progress when fetched
+        assert cache.get(1, "hitting", fetch, current_season=2026, through_season=2025) == NEWER
+        assert len(calls) == 1
+
+    def test_keys_are_independent(self, cache):
+        cache.get(1, "hitting", counting(SPLITS)[0], current_season=2025)
+        fetch, calls = counting(NEWER)
+        assert cache.get(1, "pitching", fetch, current_season=2025) == NEWER
+        assert cache.get(2, "hitting", fetch, current_season=2025) == NEWER
+        assert len(calls) == 2
+
+
+class TestStaleWhileRevalidate:
+    def test_slow_refresh_serves_stale_then_updates(self, tmp_path, clock):
+        cache = StatsCache(tmp_path, ttl_seconds=100, revalidate_wait_seconds=0.05, clock=clock)
+        cache.get(1, "hitting", counting(SPLITS)[0], current_season=2025)
+        clock.now += 101
+
+        release = threading.Event()
+
+        def slow_fetch():
+            release.wait(5)
+            return NEWER
+
+        assert cache.get(1, "hitting", slow_fetch, current_season=2025) == SPLITS
+        assert cache.counters["stale_served"] == 1
+        release.set()
+        cache._executor.shutdown(wait=True)
+        assert cache.read(1, "hitting")["splits"] == NEWER
+
+    def test_failed_refresh_serves_stale(self, cache, clock):
+        cache.get(1, "hitting", counting(SPLITS)[0], current_season=2025)
+        clock.now += 101
+
+        def failing_fetch():
+            raise RuntimeError("MLB Stats API request failed: 503")
+
+        assert cache.get(1, "hitting", failing_fetch, current_season=2025) == SPLITS
+        assert cache.read(1, "hitting")["splits"] == SPLITS
+
+    def test_miss_propagates_fetch_errors(self, cache):
+        def failing_fetch():
+            raise RuntimeError("MLB Stats API request failed: 503")
+
+        with pytest.raises(RuntimeError):
+            cache.get(1, "hitting", failing_fetch, current_season=2025)
+        assert cache.read(1, "hitting") is None
+
+
+class TestStorage:
+    def test_corrupt_entry_treated_as_missing(self, cache):
+        path = cache._path(1, "hitting")
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+        fetch, calls = counting(SPLITS)
+        assert cache.get(1, "hitting", fetch, current_season=2025) == SPLITS
+        assert len(calls) == 1
+
+    def test_no_temp_files_left_behind(self, cache):
+        cache.get(1, "hitting", counting(SPLITS)[0], current_season=2025)
+        assert [p.name for p in cache._path(1, "hitting").parent.iterdir()] == ["1.json"]
@@ -0,0 +1,155 @@
+"""Tests for agent/predict/stats_warehouse.py: exact round trips of API splits,
+refresh against the local stub statsapi, and the stats tools reading the
+warehouse before the network. Everything lives under tmp_path."""
+
+import os
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from agent.predict import mlb_stats_api as api
+from agent.predict import stats_warehouse as warehouse_module
+from agent.predict.http_fixtures import FixtureStore
+from agent.predict.rate_limit import AdaptiveRateLimiter, CircuitBreaker
+from agent.predict.single_flight import SingleFlight
+from agent.predict.stats_cache import StatsCache
+from agent.predict.stats_warehouse import build_table, load_warehouse, refresh, warehouse_frame, write_table
+from agent.predict.tests.stub_statsapi import StubStatsApi, year_by_year
+
+pytestmark = pytest.mark.skipif(not warehouse_module.WAREHOUSE_AVAILABLE, reason="pyarrow not installed")
+
+PLAYERS = {f"P_{i}": 660000 + i for i in range(4)}
+
+
+def stub_splits(mlbam_id, group):
+    return year_by_year(mlbam_id, group)["stats"][0]["splits"]
+
+
+def all_splits(ids):
+    return {(mlbam_id, group): stub_splits(mlbam_id, group) for mlbam_id in ids for group in api.STATS_GROUPS}
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(api, "STATS_CACHE", StatsCache(tmp_path / "statsapi_cache"))
+    monkeypatch.setattr(api, "STATS_FLIGHT", SingleFlight())
+    monkeypatch.setattr(api, "_session", None)
+    monkeypatch.setattr(api, "resolve_mlbam_id", lambda pid: PLAYERS.get(pid))
+    monkeypatch.setattr(warehouse_module, "WAREHOUSE_PATH", tmp_path / "statsapi_warehouse.parquet")
+    monkeypatch.setattr(api, "HTTP_FIXTURES", FixtureStore(tmp_path / "statsapi_fixtures"))
+    monkeypatch.setattr(api, "STATS_LIMITER", AdaptiveRateLimiter(1000))
+    monkeypatch.setattr(api, "STATS_BREAKER", CircuitBreaker(api.BREAKER_FAILURE_THRESHOLD, api.BREAKER_RESET_SECONDS))
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with StubStatsApi() as stub:
+        monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+        yield stub
+
+
+def save(splits_by_key, mlbam_ids, fetched_season):
+    write_table(build_table(splits_by_key, mlbam_ids, fetched_season))
+    return load_warehouse()
+
+
+class TestStorage:
+    def test_round_trip_reproduces_completed_splits_exactly(self):
+        warehouse = save(all_splits([660000, 660001]), [660000, 660001], fetched_season=2023)
+        for mlbam_id in (660000, 660001):
+            for group in api.STATS_GROUPS:
+                expected = [s for s in stub_splits(mlbam_id, group) if int(s["season"]) < 2023]
+                assert warehouse.splits(mlbam_id, group) == expected
+
+    def test_value_types_and_missing_fields_preserved(self):
+        splits = [
+            {"season": "2020", "team": {"name": "A"}, "stat": {"homeRuns": 30, "avg": ".313", "babip": 0.3}},
+            {"season": "2021", "stat": {"homeRuns": 12, "inningsPitched": "10.1"}},
+        ]
+        warehouse = save({(1, "hitting"): splits}, [1], fetched_season=2025)
+        assert warehouse.splits(1, "hitting") == splits
+        assert warehouse.splits(1, "pitching") == []
+
+    def test_split_order_kept_for_traded_seasons(self):
+        splits = [
+            {"season": "2021", "team": {"name": "A"}, "stat": {"hits": 40}},
+            {"season": "2021", "team": {"name": "B"}, "stat": {"hits": 60}},
+            {"season": "2021", "stat": {"hits": 100}},
+        ]
+        warehouse = save({(1, "hitting"): splits}, [1], fetched_season=2025)
+        assert warehouse.splits(1, "hitting") == splits
+
+    def test_coverage_comes_from_metadata(self):
+        warehouse = save({(1, "hitting"): []}, [1], fetched_season=2025)
+        assert warehouse.covers(1) and not warehouse.covers(2)
+        assert warehouse.answers(1, 2024)
+        assert not warehouse.answers(1, 2025)
+        assert not warehouse.answers(1, None)
+
+    def test_missing_file_is_none(self):
+        assert load_warehouse() is None
+        assert warehouse_frame() is None
+
+    def test_rewrite_is_picked_up(self):
+        first = save({(1, "hitting"): []}, [1], fetched_season=2025)
+        assert load_warehouse() is first
+        write_table(build_table({(2, "hitting"): []}, [2], fetched_season=2025))
+        path = warehouse_module.WAREHOUSE_PATH
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        assert load_warehouse().covers(2)
+
+    def test_frame_filters_by_group(self):
+        save(all_splits([660000]), [660000], fetched_season=2020)
+        frame = warehouse_frame("pitching")
+        assert isinstance(frame, pd.DataFrame)
+        assert set(frame["group"]) == {"pitching"}
+        assert list(frame["season"]) == list(range(2015, 2020))
+
+
+class TestRefresh:
+    def test_fetches_every_crosswalked_player_in_batches(self, stub, monkeypatch):
+        monkeypatch.setattr(api, "STATS_BATCH_SIZE", 3)
+        crosswalk = pd.DataFrame({"mlbam_id": [660000, 660001, None, 660002, 660003, 660000]})
+        refresh(crosswalk_df=crosswalk)
+        assert stub.requests == 2
+        warehouse = load_warehouse()
+        assert warehouse.mlbam_ids == frozenset(PLAYERS.values())
+        assert warehouse.splits(660003, "pitching") == stub_splits(660003, "pitching")
+
+    def test_players_missing_from_a_batch_fetched_individually(self, monkeypatch):
+        with StubStatsApi(omit_ids={660001}) as stub:
+            monkeypatch.setattr(api, "STATS_API_BASE", stub.base_url)
+            refresh(crosswalk_df=pd.DataFrame({"mlbam_id": list(PLAYERS.values())}))
+        assert sum("/people/660001/stats" in path for path in stub.paths) == 2
+        assert load_warehouse().splits(660001, "hitting") == stub_splits(660001, "hitting")
+
+    def test_limit(self, stub):
+        refresh(limit=2, crosswalk_df=pd.DataFrame({"mlbam_id": list(PLAYERS.values())}))
+        assert load_warehouse().mlbam_ids == frozenset([660000, 660001])
+
+
+class TestStatsToolsReadWarehouse:
+    def live_rows(self, monkeypatch, tmp_path, group, before_year):
+        """The same lookup with no warehouse, for comparison."""
+        monkeypatch.setattr(warehouse_module, "WAREHOUSE_PATH", tmp_path / "none.parquet")
+        monkeypatch.setattr(api, "STATS_CACHE", StatsCache(tmp_path / "live"))
+        return api._query_stats(list(PLAYERS), group, ["gamesPlayed", "avg"], before_year, None, None)
+
+    def test_history_answered_without_network(self, stub, monkeypatch, tmp_path):
+        save(all_splits(PLAYERS.values()), PLAYERS.values(), fetched_season=2026)
+        result = api._query_stats(list(PLAYERS), "hitting", ["gamesPlayed", "avg"], 2024, None, None)
+        assert stub.requests == 0
+        assert result == self.live_rows(monkeypatch, tmp_path, "hitting", 2024)
+
+    def test_later_seasons_fetched_live_and_merged(self, stub, monkeypatch, tmp_path):
+        save(all_splits(PLAYERS.values()), PLAYERS.values(), fetched_season=2022)
+        result = api._query_stats(list(PLAYERS), "pitching", ["gamesPlayed", "avg"], None, None, None)
+        assert stub.requests == 1  # one batched prefetch for the in-progress part
+        assert result == self.live_rows(monkeypatch, tmp_path, "pitching", None)
+
+    def test_uncovered_players_fetched_live(self, stub, monkeypatch, tmp_path):
+        save(all_splits([660000]), [660000], fetched_season=2026)
+        result = api._query_stats(list(PLAYERS), "hitting", ["gamesPlayed", "avg"], 2024, None, None)
+        assert parse_qs(urlparse(stub.paths[0]).query)["personIds"] == ["660001,660002,660003"]
+        assert result == self.live_rows(monkeypatch, tmp_path, "hitting", 2024)
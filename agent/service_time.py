@@ -1,5 +1,6 @@
 """MLB service time normalization, used by the deterministic phase resolver."""
 
+import numpy as np
 import pandas as pd
 
 # Days needed for one year of MLB service time
@@ -35,3 +36,35 @@ def normalize_service_time(service_time):
     days = round((service_time - years) * 1000)
     normalized = years + (days / DAYS_PER_SERVICE_YEAR)
     return normalized
+
+
+def normalize_service_time_array(service_times, unknown=-1):
+    """
+    Vectorized normalize_service_time over a pandas Series or numpy array.
+
+    Same arithmetic as the scalar version, element for element (truncate to
+    whole years, round-half-even the days, divide by 172), so every value is
+    bit-identical to normalize_service_time(value). Entries that are NaN or
+    equal to the `unknown` sentinel (Spotrac's -1 "not tracked") come back as
+    NaN instead of being normalized; pass unknown=None to normalize them too.
+
+    Args:
+        service_times: Series or array-like of years.days service times
+
+    Returns:
+        float64 array of normalized service times, or a Series with the same
+        index if a Series was given
+    """
+    values = np.asarray(service_times, dtype=np.float64)
+    missing = np.isnan(values)
+    if unknown is not None:
+        missing |= values == unknown
+
+    years = np.trunc(values)
+    days = np.round((values - years) * 1000)
+    normalized = years + days / DAYS_PER_SERVICE_YEAR
+    normalized[missing] = np.nan
+
+    if isinstance(service_times, pd.Series):
+        return pd.Series(normalized, index=service_times.index, name=service_times.name)
+    return normalized
@@ -0,0 +1,129 @@
+"""Tests for the shared dataset registry."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from agent import datasets
+
+CONTRACT_COLUMNS = ["contract_id", "player_id", "age", "service_time", "year", "duration", "value", "type"]
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    datasets.clear()
+    yield
+    datasets.clear()
+
+
+@pytest.fixture
+def contracts_csv(tmp_path):
+    path = tmp_path / "contracts.csv"
+    pd.DataFrame(
+        [
+            ["A_1_2020", "A_1", 25, 1.1, 2020, 1, 0.6, "pre-arb"],
+            ["A_1_2020", "A_1", 25, 1.1, 2020, 1, 0.6, "pre-arb"],
+            ["A_1_2021", "A_1", 26, 2.1, 2021, 1, 0.7, "pre-arb"],
+            ["B_2_2021", "B_2", 31, -1, 2021, 3, 30.0, "free-agent"],
+        ],
+        columns=CONTRACT_COLUMNS,
+    ).to_csv(path, index=False)
+    return path
+
+
+class TestLoad:
+    def test_dedupes_on_contract_id(self, contracts_csv):
+        df = datasets.load_contracts(contracts_csv)
+        assert list(df["contract_id"]) == ["A_1_2020", "A_1_2021", "B_2_2021"]
+        assert list(df.index) == [0, 1, 2]
+
+    def test_tight_dtypes(self, contracts_csv):
+        df = datasets.load_contracts(contracts_csv)
+        assert df["year"].dtype == "int16"
+        assert df["age"].dtype == "int16"
+        assert df["duration"].dtype == "int16"
+        assert df["value"].dtype == "float64"
+        assert isinstance(df["type"].dtype, pd.CategoricalDtype)
+
+    def test_dtype_skipped_when_column_has_gaps(self, tmp_path):
+        path = tmp_path / "players.csv"
+        pd.DataFrame(
+            {"player_id": ["A_1", "B_2"], "fangraphs_id": [7, None], "position": ["SP", "C"]}
+        ).to_csv(path, index=False)
+        df = datasets.load_players(path)
+        assert df["fangraphs_id"].dtype == "float64"
+
+    def test_numeric_columns_are_read_only(self, contracts_csv):
+        df = datasets.load_contracts(contracts_csv)
+        with pytest.raises(ValueError):
+            df.loc[0, "value"] = 99.0
+
+    def test_derived_frames_are_writeable(self, contracts_csv):
+        subset = datasets.load_contracts(contracts_csv).query("year == 2021").copy()
+        subset.loc[subset.index[0], "value"] = 99.0
+        assert datasets.load_contracts(contracts_csv)["value"].max() == 30.0
+
+
+class TestCaching:
+    def test_same_frame_until_file_changes(self, contracts_csv):
+        first = datasets.load_contracts(contracts_csv)
+        assert datasets.load_contracts(contracts_csv) is first
+
+    def test_reloads_when_file_changes(self, contracts_csv):
+        first = datasets.load_contracts(contracts_csv)
+        with open(contracts_csv, "a") as file:
+            file.write("C_3_2022,C_3,28,3.0,2022,1,2.0,arb\n")
+        stat = os.stat(contracts_csv)
+        os.utime(contracts_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        second = datasets.load_contracts(contracts_csv)
+        assert second is not first
+        assert "C_3_2022" in set(second["contract_id"])
+
+    def test_cached_per_path(self, contracts_csv, tmp_path):
+        other = tmp_path / "other.csv"
+        other.write_text(contracts_csv.read_text())
+        assert datasets.load_contracts(contracts_csv) is not datasets.load_contracts(other)
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            datasets.load_contracts(tmp_path / "nope.csv")
+
+
+class TestSqliteBackend:
+    @pytest.fixture
+    def database(self, tmp_path, monkeypatch):
+        from data_generation import sqlite_store
+        from data_generation.records import Player, Salary
+
+        path = str(tmp_path / "dataset.sqlite3")
+        monkeypatch.setattr(sqlite_store, "DATABASE_FILE", path)
+        monkeypatch.setattr(datasets, "DATASET_BACKEND", "sqlite")
+        monkeypatch.setattr(datasets, "DATASET_DB_FILE", path)
+        sqlite_store.write_players([Player("A_1", 7, "Ann", "A", "SP", "https://x/id/1/a")])
+        sqlite_store.write_contracts([
+            Salary("A_1_2020", "A_1", 25, 1.1, 2020, 1, 0.6, "pre-arb"),
+            Salary("B_2_2021", "B_2", None, None, 2021, 3, 30.0, "free-agent"),
+        ])
+        return sqlite_store
+
+    def test_reads_database_not_csv(self, database, contracts_csv):
+        df = datasets.load_contracts(contracts_csv)
+        assert list(df["contract_id"]) == ["A_1_2020", "B_2_2021"]
+        assert list(df.columns) == CONTRACT_COLUMNS
+        assert list(datasets.load_players("ignored.csv")["player_id"]) == ["A_1"]
+
+    def test_unknown_age_and_service_time_are_sentinels(self, database, contracts_csv):
+        df = datasets.load_contracts(contracts_csv)
+        assert df["age"].dtype == "int16"
+        assert list(df["age"]) == [25, -1]
+        assert list(df["service_time"]) == [1.1, -1.0]
+
+    def test_reloads_after_a_write(self, database, contracts_csv):
+        from data_generation.records import Salary
+
+        first = datasets.load_contracts(contracts_csv)
+        assert datasets.load_contracts(contracts_csv) is first
+        database.write_contracts([Salary("C_3_2022", "C_3", 28, 3.0, 2022, 1, 2.0, "arb")])
+        assert "C_3_2022" in set(datasets.load_contracts(contracts_csv)["contract_id"])
@@ -11,9 +11,12 @@ from agent.phase import (
     PHASE_ARB,
     PHASE_FA,
     PHASE_PRE_ARB,
+    _resolve_phase_scan,
     load_contract_history,
+    phase_table,
     project_phase_timeline,
     resolve_phase,
+    resolve_phases,
 )
 
 SCHERZER = "Scherzer_5166"
@@ -140,6 +143,64 @@ class TestEdgeCases:
         res = resolve_phase("Doe_4", 2020, df)
         assert res.phase == PHASE_PRE_ARB
 
+    def test_zero_duration_row_has_no_aav(self):
+        df = synthetic_history([["Doe_7_2020", "Doe_7", 27, 2.050, 2020, 0, 0.0, "arb"]])
+        res = resolve_phase("Doe_7", 2020, df)
+        assert res.method == "observed"
+        assert res.known_value["aav_millions"] is None
+
+
+# Histories exercising every resolution branch: observed, covered by an
+# earlier deal, before the first row (tracked and untracked service time),
+# after free agency, untracked latest row, and forward projection.
+BRANCH_HISTORIES = [
+    ["A_1_2015", "A_1", 24, 1.100, 2015, 1, 0.5, "pre-arb"],
+    ["A_1_2017", "A_1", 26, 3.010, 2017, 3, 20.0, "arb"],
+    ["A_1_2021", "A_1", -1, -1, 2021, 5, 100.0, "free-agent"],
+    ["B_1_2019", "B_1", -1, -1, 2019, 1, 4.0, "arb"],
+    ["C_1_2018", "C_1", 22, 0.120, 2018, 1, 0.55, "pre-arb"],
+    ["C_1_2018b", "C_1", 22, 0.150, 2018, 1, 0.56, "pre-arb"],
+    ["C_1_2020", "C_1", 24, 2.100, 2020, 0, 0.0, "pre-arb"],
+    ["D_1_2022", "D_1", 30, 4.171, 2022, 2, 9.0, "arb"],
+]
+
+
+class TestPhaseTable:
+    def test_matches_scan_on_every_branch(self):
+        df = synthetic_history(BRANCH_HISTORIES)
+        for player_id in df["player_id"].unique():
+            for year in range(2010, 2032):
+                assert resolve_phase(player_id, year, df) == _resolve_phase_scan(player_id, year, df), (player_id, year)
+
+    def test_matches_scan_on_real_history(self, contracts):
+        for year in range(2005, 2035):
+            assert resolve_phase(SCHERZER, year, contracts) == _resolve_phase_scan(SCHERZER, year, contracts)
+
+    def test_bulk_matches_single_lookups(self):
+        df = synthetic_history(BRANCH_HISTORIES)
+        pairs = [(player_id, year) for player_id in ["D_1", "A_1", "B_1", "C_1"] for year in range(2012, 2026)]
+        table = resolve_phases([p for p, _ in pairs], [y for _, y in pairs], df)
+        assert len(table) == len(pairs)
+        for record, (player_id, year) in zip(table.to_dict("records"), pairs):
+            single = vars(resolve_phase(player_id, year, df))
+            if single["service_time_estimate"] is None:
+                assert pd.isna(record.pop("service_time_estimate"))
+                single.pop("service_time_estimate")
+            if single["age_estimate"] is None:
+                assert pd.isna(record.pop("age_estimate"))
+                single.pop("age_estimate")
+            assert record == single
+
+    def test_bulk_marks_unknown_players_instead_of_raising(self):
+        df = synthetic_history(BRANCH_HISTORIES)
+        table = resolve_phases(["Nobody_0", "A_1"], [2019, 2019], df)
+        assert table["phase"].tolist() == [None, PHASE_ARB]
+        assert table["method"].tolist() == [None, "known"]
+
+    def test_table_reused_for_the_same_frame(self, contracts):
+        assert phase_table(contracts) is phase_table(contracts)
+        assert phase_table(contracts.copy()) is not phase_table(contracts)
+
 
 class TestPhaseTimeline:
     def test_scherzer_matches_real_career(self, contracts):
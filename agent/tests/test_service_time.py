@@ -0,0 +1,45 @@
+"""Tests for service-time normalization, scalar and vectorized."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent.service_time import normalize_service_time, normalize_service_time_array
+
+
+class TestScalar:
+    def test_years_days_to_linear(self):
+        assert normalize_service_time(2.028) == pytest.approx(2 + 28 / 172)
+
+    def test_nan_passes_through(self):
+        assert pd.isna(normalize_service_time(float("nan")))
+
+
+class TestVectorized:
+    def test_bit_identical_to_scalar(self):
+        rng = np.random.default_rng(0)
+        values = np.concatenate([
+            np.round(rng.uniform(0, 15, 5000), 3),
+            rng.uniform(0, 15, 5000),
+            [0.0, 0.0005, 2.0015, 2.1725, 12.102],
+        ])
+        expected = np.array([normalize_service_time(v) for v in values])
+        assert np.array_equal(normalize_service_time_array(values), expected)
+
+    def test_unknown_sentinel_and_nan_become_nan(self):
+        result = normalize_service_time_array(np.array([2.028, -1, np.nan]))
+        assert result[0] == normalize_service_time(2.028)
+        assert np.isnan(result[1:]).all()
+
+    def test_unknown_none_normalizes_the_sentinel_too(self):
+        result = normalize_service_time_array(np.array([-1.0]), unknown=None)
+        assert result[0] == normalize_service_time(-1.0)
+
+    def test_series_in_series_out(self):
+        series = pd.Series([2.028, -1.0], index=[10, 20], name="service_time")
+        result = normalize_service_time_array(series)
+        assert isinstance(result, pd.Series)
+        assert list(result.index) == [10, 20]
+        assert result.name == "service_time"
+        assert result[10] == normalize_service_time(2.028)
+        assert pd.isna(result[20])
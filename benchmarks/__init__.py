@@ -0,0 +1 @@
+"""Micro-benchmarks for the dataset and agent hot paths (see benchmarks/README.md)."""
@@ -0,0 +1,108 @@
+"""Benchmark: indexed vs full-scan query_comparable_contracts on the real dataset.
+
+Generates a reproducible mix of query specs shaped like the predict agent's
+calls (a player's own history, position/phase/age comparables, service-time
+bands, year windows -- always with a before_year cutoff), runs each through
+the full-scan reference (_scan_comparable_contracts) and the indexed engine
+(_query_comparable_contracts), and all of them at once through the batch
+entry point (_query_comparable_contracts_batch), checks the results are
+identical, and reports per-query latency.
+
+Usage:
+    python -m benchmarks.bench_comparables [--queries N] [--seed S]
+"""
+
+import random
+import time
+from argparse import ArgumentParser
+
+from agent.predict.comparables import (
+    _load_contracts,
+    _load_players,
+    _query_comparable_contracts,
+    _query_comparable_contracts_batch,
+    _scan_comparable_contracts,
+    comparables_view,
+)
+
+POSITIONS = ["SP", "RP", "C", "1B", "2B", "3B", "SS", "OF", "DH", "sp"]
+PHASES = ["pre-arb", "arb", "free-agent"]
+
+
+def random_spec(rng, player_ids):
+    """One query spec, roughly the mix of shapes the predict agent issues."""
+    spec = {"before_year": rng.randint(2012, 2027), "limit": rng.choice([5, 10, 15, 15, 15, 50])}
+    shape = rng.random()
+    if shape < 0.3:
+        spec["player_id"] = rng.choice(player_ids)
+        return spec
+    if rng.random() < 0.7:
+        spec["position"] = rng.choice(POSITIONS)
+    if rng.random() < 0.8:
+        spec["phase"] = rng.choice(PHASES)
+    if rng.random() < 0.6:
+        low = rng.randint(22, 34)
+        spec["min_age"], spec["max_age"] = low, low + rng.randint(1, 4)
+    if spec.get("phase") != "free-agent" and rng.random() < 0.4:
+        low = rng.uniform(0, 5)
+        spec["min_service_time"], spec["max_service_time"] = low, low + rng.uniform(0.5, 2)
+    if rng.random() < 0.4:
+        spec["min_year"] = spec["before_year"] - rng.randint(2, 6)
+    if rng.random() < 0.5:
+        spec["exclude_player_id"] = rng.choice(player_ids)
+    return spec
+
+
+def _time_per_query(fn, contracts, players, specs):
+    start = time.perf_counter()
+    for spec in specs:
+        fn(contracts, players, **spec)
+    return (time.perf_counter() - start) / len(specs)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the comparables query engine")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    contracts, players = _load_contracts(), _load_players()
+    rng = random.Random(args.seed)
+    player_ids = sorted(contracts["player_id"].unique())
+    specs = [random_spec(rng, player_ids) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    comparables_view(contracts, players).index
+    build_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = [
+        spec for spec in specs
+        if _scan_comparable_contracts(contracts, players, **spec) != _query_comparable_contracts(contracts, players, **spec)
+    ]
+
+    batch_results = _query_comparable_contracts_batch(contracts, players, specs)
+    mismatches += [
+        spec for spec, result in zip(specs, batch_results)
+        if result != _query_comparable_contracts(contracts, players, **spec)
+    ]
+
+    scan = _time_per_query(_scan_comparable_contracts, contracts, players, specs)
+    indexed = _time_per_query(_query_comparable_contracts, contracts, players, specs)
+    start = time.perf_counter()
+    _query_comparable_contracts_batch(contracts, players, specs)
+    batch = (time.perf_counter() - start) / len(specs)
+
+    print(f"{len(contracts)} contracts, {len(specs)} query specs (seed {args.seed})")
+    print(f"  view + index build  {build_ms:8.1f} ms (once per dataset version)")
+    print(f"  full scan           {scan * 1e6:8.0f} us/query")
+    print(f"  indexed             {indexed * 1e6:8.0f} us/query")
+    print(f"  batch               {batch * 1e6:8.0f} us/query")
+    print(f"  speedup (indexed)   {scan / indexed:8.1f}x")
+    print(f"  identical results   {2 * len(specs) - len(mismatches)}/{2 * len(specs)}")
+    if mismatches:
+        print(f"  first mismatch: {mismatches[0]}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
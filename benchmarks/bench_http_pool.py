@@ -0,0 +1,68 @@
+"""Benchmark: per-request latency of _get_json with and without connection pooling.
+
+Runs a local stub statsapi (agent/predict/tests/stub_statsapi.py) and issues
+the same sequence of yearByYear requests two ways: one fresh connection per
+request (the old bare requests.get) and through mlb_stats_api's shared
+keep-alive session. Localhost makes a TCP connect nearly free, so a second
+pass injects a per-connection delay standing in for the TCP+TLS handshake
+round trips to statsapi.mlb.com. The process-wide STATS_LIMITER is swapped
+for an effectively unlimited one for the run, so the numbers measure the
+connections, not the request pacing.
+
+Usage:
+    python -m benchmarks.bench_http_pool [--requests N] [--handshake-ms MS]
+"""
+
+import time
+from argparse import ArgumentParser
+
+import requests
+
+from agent.predict import mlb_stats_api as api
+from agent.predict.rate_limit import AdaptiveRateLimiter
+from agent.predict.tests.stub_statsapi import StubStatsApi
+
+
+def _time_requests(stub, n_requests, session_factory):
+    original, original_limiter = api._http_session, api.STATS_LIMITER
+    api._http_session = session_factory
+    api.STATS_LIMITER = AdaptiveRateLimiter(1e6)
+    try:
+        start = time.perf_counter()
+        for i in range(n_requests):
+            api._get_json(f"{stub.base_url}/people/{660000 + i}/stats", {"stats": "yearByYear", "group": "hitting"})
+        return (time.perf_counter() - start) / n_requests
+    finally:
+        api._http_session = original
+        api.STATS_LIMITER = original_limiter
+
+
+def run(n_requests, handshake_seconds):
+    """(cold seconds/request, pooled seconds/request, cold connections, pooled connections)."""
+    results = []
+    for session_factory in (lambda: requests, api._http_session):
+        with StubStatsApi(connect_latency=handshake_seconds) as stub:
+            per_request = _time_requests(stub, n_requests, session_factory)
+            results.append((per_request, stub.connections))
+        api._session = None  # drop connections to the stopped stub
+    (cold, cold_connections), (pooled, pooled_connections) = results
+    return cold, pooled, cold_connections, pooled_connections
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark statsapi connection pooling")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"{args.requests} sequential yearByYear requests against a local stub")
+    for label, handshake in (("localhost", 0.0), (f"+{args.handshake_ms:g}ms handshake", args.handshake_ms / 1000)):
+        cold, pooled, cold_connections, pooled_connections = run(args.requests, handshake)
+        print(f"  {label}")
+        print(f"    new connection per request  {cold * 1e3:7.2f} ms/request ({cold_connections} connections)")
+        print(f"    pooled keep-alive session   {pooled * 1e3:7.2f} ms/request ({pooled_connections} connections)")
+        print(f"    speedup                     {cold / pooled:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: import cost of the data_generation entry modules.
+
+Imports each module in a fresh interpreter under `python -X importtime`,
+several times, and reports the median cumulative import time of the module
+itself (the last line of the importtime log), plus whether pybaseball was
+imported along the way. Importing a module should only load code: dataset
+CSVs are read and pybaseball is imported when something first needs them.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs N] [module ...]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+MODULES = [
+    "data_generation.spotrac",
+    "data_generation.fangraphs_search",
+    "data_generation.review_queue",
+    "data_generation.stats",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module):
+    """(cumulative microseconds for module, set of every module imported) from one fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative, imported = None, set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            imported.add(match.group(4))
+            if match.group(4) == module:
+                cumulative = int(match.group(2))
+    return cumulative, imported
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark data_generation import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    print(f"median cumulative import time over {args.runs} fresh interpreters")
+    for module in args.modules:
+        samples, imported = [], set()
+        for _ in range(args.runs):
+            cumulative, imported = import_profile(module)
+            samples.append(cumulative)
+        pybaseball = "imports pybaseball" if "pybaseball" in imported else "no pybaseball"
+        print(f"  {module:<36} {statistics.median(samples) / 1000:7.0f} ms  ({pybaseball})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: PhaseTable lookups vs the per-player scan in resolve_phase.
+
+Resolves a reproducible sample of (player, year) pairs from the real
+contracts dataset three ways -- the per-call filter-and-sort reference
+(_resolve_phase_scan), single resolve_phase lookups into the PhaseTable, and
+one bulk resolve_phases call -- checks the results are identical, and
+reports per-pair latency.
+
+Usage:
+    python -m benchmarks.bench_phase [--pairs N] [--seed S]
+"""
+
+import random
+import time
+from argparse import ArgumentParser
+
+from agent.phase import _resolve_phase_scan, load_contract_history, phase_table, resolve_phase, resolve_phases
+
+
+def _time_per_pair(fn, pairs, contracts):
+    start = time.perf_counter()
+    results = [fn(player_id, year, contracts) for player_id, year in pairs]
+    return results, (time.perf_counter() - start) / len(pairs)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark bulk phase resolution")
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    contracts = load_contract_history()
+    rng = random.Random(args.seed)
+    player_ids = sorted(contracts["player_id"].unique())
+    pairs = [(rng.choice(player_ids), rng.randint(2008, 2032)) for _ in range(args.pairs)]
+
+    start = time.perf_counter()
+    phase_table(contracts)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    scanned, scan = _time_per_pair(_resolve_phase_scan, pairs, contracts)
+    looked_up, lookup = _time_per_pair(resolve_phase, pairs, contracts)
+    start = time.perf_counter()
+    bulk_table = resolve_phases([p for p, _ in pairs], [y for _, y in pairs], contracts)
+    bulk = (time.perf_counter() - start) / len(pairs)
+
+    mismatches = [pair for pair, a, b in zip(pairs, scanned, looked_up) if a != b]
+    mismatches += [
+        pair for pair, record, expected in zip(pairs, bulk_table.to_dict("records"), looked_up)
+        if (record["phase"], record["method"], record["notes"], record["known_value"])
+        != (expected.phase, expected.method, expected.notes, expected.known_value)
+    ]
+
+    print(f"{len(contracts)} contracts, {len(pairs)} (player, year) pairs (seed {args.seed})")
+    print(f"  table build         {build_ms:8.1f} ms (once per dataset version)")
+    print(f"  per-player scan     {scan * 1e6:8.0f} us/pair")
+    print(f"  table lookup        {lookup * 1e6:8.0f} us/pair")
+    print(f"  bulk                {bulk * 1e6:8.0f} us/pair")
+    print(f"  speedup (lookup)    {scan / lookup:8.1f}x")
+    print(f"  identical results   {2 * len(pairs) - len(mismatches)}/{2 * len(pairs)}")
+    if mismatches:
+        print(f"  first mismatch: {mismatches[0]}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
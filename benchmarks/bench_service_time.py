@@ -0,0 +1,57 @@
+"""Benchmark: scalar vs vectorized service-time normalization over the contracts dataset.
+
+Normalizes every service_time in contracts_spotrac.csv (~15k rows) three ways:
+the old row-wise Series.apply, a list comprehension over the scalar function,
+and normalize_service_time_array. Also checks the vectorized result is
+bit-identical to the scalar one.
+
+Usage:
+    python -m benchmarks.bench_service_time [--repeat N]
+"""
+
+import timeit
+from argparse import ArgumentParser
+
+import numpy as np
+
+from agent import datasets
+from agent.config import CONTRACTS_CSV
+from agent.service_time import normalize_service_time, normalize_service_time_array
+
+UNKNOWN = -1
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark service-time normalization")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    service_times = datasets.load_contracts(CONTRACTS_CSV)["service_time"]
+    values = service_times.to_numpy()
+
+    def apply():
+        return service_times.apply(lambda st: None if st == UNKNOWN else normalize_service_time(st))
+
+    def scalar_loop():
+        return [None if st == UNKNOWN else normalize_service_time(st) for st in values]
+
+    def vectorized():
+        return normalize_service_time_array(values, unknown=UNKNOWN)
+
+    expected = np.array([np.nan if v is None else v for v in scalar_loop()])
+    actual = vectorized()
+    identical = np.array_equal(expected, actual, equal_nan=True)
+
+    print(f"{len(values)} service times, best of {args.repeat}")
+    results = {}
+    for name, fn in [("Series.apply", apply), ("scalar loop", scalar_loop), ("vectorized", vectorized)]:
+        results[name] = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"  {name:<14} {results[name] * 1000:8.3f} ms")
+    print(f"  speedup vs apply: {results['Series.apply'] / results['vectorized']:.0f}x")
+    print(f"  bit-identical: {identical}")
+    if not identical:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: Spotrac contract-table parse throughput.
+
+Parses the same stored fixture pages (benchmarks/spotrac_fixture_server.py:
+rebuilt from the dataset, or real saved pages with --saved-pages) three
+ways -- BeautifulSoup over the whole page (how spotrac.py used to parse), the
+BeautifulSoup fallback restricted to <table> elements by a SoupStrainer, and
+the lxml path with precompiled XPath selectors that parse_table uses --
+checks the parsed tables and the Player/Salary records built from them are
+identical, and reports pages and rows per second.
+
+Usage:
+    python -m benchmarks.bench_spotrac_parse [--years N] [--repeat R] [--saved-pages DIR]
+"""
+
+import contextlib
+import io
+import time
+from argparse import ArgumentParser
+from urllib.parse import urlsplit
+
+from benchmarks.spotrac_fixture_server import build_pages, load_saved_pages
+from data_generation import spotrac
+
+LAST_YEAR = 2025
+
+
+def _time_parse(parse, pages, repeat):
+    """Parsed tables and the best-of-`repeat` seconds for the whole batch"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tables = [parse(body) for body in pages]
+        best = min(best, time.perf_counter() - start)
+    return tables, best
+
+
+def _page_key(path):
+    """(year, salary type) of a CONTRACT_PAGES path"""
+    for year in range(2000, LAST_YEAR + 2):
+        for url_template, salary_type in spotrac.CONTRACT_PAGES:
+            if urlsplit(url_template.format(year=year)).path == path:
+                return year, salary_type
+    raise SystemExit(f"{path} is not a Spotrac contract page")
+
+
+def _records(tables, page_keys):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [spotrac.records_from_table(table, year, salary_type) for table, (year, salary_type) in zip(tables, page_keys)]
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark Spotrac table parsing")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--saved-pages", help="Parse real saved Spotrac pages from this directory instead")
+    args = parser.parse_args()
+
+    years = range(LAST_YEAR - args.years + 1, LAST_YEAR + 1)
+    by_path = load_saved_pages(args.saved_pages) if args.saved_pages else build_pages(years)
+    bodies = list(by_path.values())
+    page_keys = [_page_key(path) for path in by_path]
+
+    variants = [("BeautifulSoup, whole page (before)", spotrac._parse_table_soup),
+                ("BeautifulSoup + SoupStrainer('table')",
+                 lambda body: spotrac._parse_table_soup(body, parse_only=spotrac._TABLES_ONLY))]
+    if spotrac.LXML_AVAILABLE:
+        variants.append(("lxml + precompiled XPath (parse_table)", spotrac._parse_table_lxml))
+
+    megabytes = sum(len(body) for body in bodies) / 1e6
+    print(f"{len(bodies)} pages, {megabytes:.1f} MB, best of {args.repeat}")
+    reference = None
+    for label, parse in variants:
+        tables, seconds = _time_parse(parse, bodies, args.repeat)
+        rows = sum(len(table.rows) for table in tables if table)
+        if reference is None:
+            reference, reference_records, reference_seconds = tables, _records(tables, page_keys), seconds
+            same = True
+        else:
+            same = tables == reference and _records(tables, page_keys) == reference_records
+        print(f"  {label:<40} {seconds / len(bodies) * 1e3:7.1f} ms/page  {rows / seconds:9,.0f} rows/s  "
+              f"{reference_seconds / seconds:5.1f}x  identical: {same}")
+        if not same:
+            raise SystemExit(f"{label} produced different tables or records")
+
+
+if __name__ == "__main__":
+    main()
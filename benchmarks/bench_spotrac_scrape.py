@@ -0,0 +1,120 @@
+"""Benchmark: serial Spotrac scraping vs the concurrent PageScheduler.
+
+Serves every CONTRACT_PAGES page for a range of years from a local fixture
+server (benchmarks/spotrac_fixture_server.py) with per-request latency
+standing in for spotrac.com's response time, then scrapes them two ways:
+serially (bare requests.get + parse, one page after another, as
+spotrac.main did) and through data_generation/scrape.py's PageScheduler
+(pooled session, per-host rate limit, process-pool parsing). Both outputs
+are turned into Player/Salary records in CONTRACT_PAGES order and checked
+for equality. Finally the scheduled scrape is repeated twice with a fresh
+PageCache (data_generation/page_cache.py): once cold, then as a refresh
+after the pages were written, where every request is a conditional 304 and
+no page is parsed.
+
+Usage:
+    python -m benchmarks.bench_spotrac_scrape [--years N] [--latency-ms MS]
+        [--concurrency C] [--min-interval S] [--saved-pages DIR]
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from argparse import ArgumentParser
+
+import requests
+
+from benchmarks.spotrac_fixture_server import SpotracFixtureServer, build_pages, load_saved_pages
+from data_generation import spotrac
+from data_generation.page_cache import PageCache
+from data_generation.scrape import DEFAULT_CONCURRENCY, DEFAULT_MIN_INTERVAL, REQUEST_TIMEOUT, USER_AGENT, PageScheduler
+
+LAST_YEAR = 2025
+
+
+def _records(tables, urls):
+    """Player/Salary records for parsed pages, in page order (player lookups silenced)"""
+    records = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for url, (year, salary_type) in urls.items():
+            records.append(spotrac.records_from_table(tables[url], year, salary_type))
+    return records
+
+
+def _fetch(url):
+    """One bare GET on a new connection, as spotrac.main used to fetch each page"""
+    response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT)
+    return response.text if response.status_code == 200 else None
+
+
+def scrape_serial(urls):
+    start = time.perf_counter()
+    tables = {url: spotrac.parse_table(_fetch(url)) for url in urls}
+    return tables, time.perf_counter() - start
+
+
+def scrape_scheduled(urls, concurrency, min_interval, cache=None):
+    """Parsed tables by url, seconds taken, scheduler counters; marks pages written in the cache"""
+    start = time.perf_counter()
+    with PageScheduler(spotrac.parse_table, concurrency=concurrency, min_interval=min_interval, cache=cache) as scheduler:
+        futures = {url: scheduler.submit(url, skip_unchanged=cache is not None) for url in urls}
+        pages = {url: future.result() for url, future in futures.items()}
+    seconds = time.perf_counter() - start
+    if cache is not None:
+        for page in pages.values():
+            if page.sha256 and not page.unchanged:
+                cache.mark_written(page.url, page.sha256, spotrac.table_hash(page.parsed) if page.parsed else None)
+    return {url: page.parsed for url, page in pages.items()}, seconds, scheduler.counters
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark concurrent Spotrac scraping")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL)
+    parser.add_argument("--saved-pages", help="Serve real saved Spotrac pages from this directory instead")
+    args = parser.parse_args()
+
+    years = range(LAST_YEAR - args.years + 1, LAST_YEAR + 1)
+    pages = load_saved_pages(args.saved_pages) if args.saved_pages else build_pages(years)
+    page_kb = sum(len(body) for body in pages.values()) / len(pages) / 1024
+
+    with SpotracFixtureServer(pages, latency=args.latency_ms / 1000) as server:
+        urls = {
+            server.url_for(url_template.format(year=year)): (year, salary_type)
+            for year in years
+            for url_template, salary_type in spotrac.CONTRACT_PAGES
+        }
+        print(f"{len(urls)} pages ({years.start}-{years.stop - 1}, ~{page_kb:.0f} KB each), "
+              f"{args.latency_ms:g} ms server latency")
+
+        serial_tables, serial_seconds = scrape_serial(urls)
+        server.max_in_flight = 0
+        scheduled_tables, scheduled_seconds, _ = scrape_scheduled(urls, args.concurrency, args.min_interval)
+        peak = server.max_in_flight
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PageCache(cache_dir)
+            _, cold_seconds, cold = scrape_scheduled(urls, args.concurrency, args.min_interval, cache)
+            _, refresh_seconds, refresh = scrape_scheduled(urls, args.concurrency, args.min_interval, cache)
+
+    identical = _records(serial_tables, urls) == _records(scheduled_tables, urls)
+    rows = sum(len(table.rows) for table in serial_tables.values() if table)
+    print(f"  serial (one page at a time)              {serial_seconds:7.2f} s  ({len(urls) / serial_seconds:5.1f} pages/s)")
+    print(f"  PageScheduler (concurrency {args.concurrency}, "
+          f"{args.min_interval:g}s/host)  {scheduled_seconds:7.2f} s  ({len(urls) / scheduled_seconds:5.1f} pages/s, "
+          f"peak {peak} in flight)")
+    print(f"  speedup                                  {serial_seconds / scheduled_seconds:7.1f}x")
+    for label, seconds, counters in (("PageCache, cold", cold_seconds, cold),
+                                     ("PageCache, refresh with no changes", refresh_seconds, refresh)):
+        print(f"  {label:<40} {seconds:7.2f} s  ({counters['bytes'] / 1024:,.0f} KB downloaded, "
+              f"{counters['not_modified']} x 304, {counters['parsed']} parsed, {counters['unchanged']} skipped unchanged)")
+    print(f"  {rows} table rows; Player/Salary records identical: {identical}")
+    if not identical:
+        raise SystemExit("scheduled scrape produced different records")
+
+
+if __name__ == "__main__":
+    main()
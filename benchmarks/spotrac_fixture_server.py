@@ -0,0 +1,202 @@
+"""A local stand-in for spotrac.com contract pages, for benchmarks.
+
+Serves one HTML page per (year, contract page) in data_generation/spotrac.py's
+CONTRACT_PAGES over HTTP/1.1 keep-alive on 127.0.0.1, with an optional
+per-request `latency` standing in for Spotrac's response time. Each page has
+an ETag; a matching If-None-Match gets an empty 304 (still after `latency`).
+Counts requests and 304s and tracks the peak number in flight.
+
+Pages come from either:
+- build_pages(years): rebuilt from dataset/contracts_spotrac.csv and
+  dataset/players.csv in Spotrac's table markup (thead/tbody, a player link
+  per row, "$1,234,567" values) inside a page-sized block of site chrome, so
+  every player on them is already in the players dataset and parsing them
+  needs no FanGraphs lookups; or
+- load_saved_pages(directory): real pages saved from spotrac.com, stored as
+  <percent-encoded url path>.html (urllib.parse.quote(path, safe="")).
+
+    with SpotracFixtureServer(build_pages(range(2020, 2025)), latency=0.3) as server:
+        url = server.url_for(PRE_ARB_URL.format(year=2020))
+"""
+
+import csv
+import hashlib
+import html
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable
+from urllib.parse import unquote, urlsplit
+
+from data_generation.save import CONTRACTS_FILE, PLAYERS_FILE
+from data_generation.spotrac import CONTRACT_PAGES
+
+SPOTRAC_ORIGIN = "https://www.spotrac.com"
+
+# Navigation/script markup around the table; real pages are mostly this
+_CHROME_LINKS = 1500
+
+
+def _page_path(url: str) -> str:
+    return urlsplit(url).path
+
+
+def _chrome() -> str:
+    links = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/mlb/team/_/id/{i}/">Team {i} payroll</a></li>'
+        for i in range(_CHROME_LINKS)
+    )
+    return f'<header><nav><ul class="navbar-nav">{links}</ul></nav></header>'
+
+
+def _has_service_time(url_template: str) -> bool:
+    return "free-agents" not in url_template and "type/extension/" not in url_template
+
+
+def _columns(url_template: str):
+    """Header labels and cell builders for one kind of page"""
+    columns = [
+        ("Player", lambda c, p: f'<a class="link" href="{html.escape(p["spotrac_link"])}">'
+                                f'{html.escape(p["first_name"])} {html.escape(p["last_name"])}</a>'),
+        ("Pos", lambda c, p: html.escape(p["position"])),
+        ("Team", lambda c, p: "MLB"),
+        ("Age", lambda c, p: c["age"]),
+    ]
+    if _has_service_time(url_template):
+        columns.append(("YOS", lambda c, p: c["service_time"]))
+    if "extensions" in url_template or "free-agents" in url_template:
+        columns.append(("Yrs", lambda c, p: c["duration"]))
+    columns.append(("Value", lambda c, p: f"${round(float(c['value']) * 1_000_000):,}"))
+    if "free-agents" in url_template:
+        columns.append(("Type", lambda c, p: "Signed"))
+    return columns
+
+
+def _render(url_template: str, contracts: list, players: Dict[str, dict], chrome: str) -> str:
+    columns = _columns(url_template)
+    head = "".join(f"<th>{label}</th>" for label, _ in columns)
+    rows = "".join(
+        "<tr>" + "".join(f'<td class="text-center">{cell(contract, players[contract["player_id"]])}</td>'
+                         for _, cell in columns) + "</tr>\n"
+        for contract in contracts
+        if contract["player_id"] in players and contract["age"]
+    )
+    return (f"<!DOCTYPE html><html><head><title>Spotrac</title></head><body>{chrome}"
+            f'<main><table class="table dataTable"><thead><tr>{head}</tr></thead>'
+            f"<tbody>\n{rows}</tbody></table></main></body></html>")
+
+
+def _page_for(url_template: str, contract: dict, index: int) -> bool:
+    """Which of a salary type's two pages a contract is listed on"""
+    extension = "extensions" in url_template
+    if contract["type"] == "free-agent":
+        return extension == bool(index % 2)
+    return extension == (int(contract["duration"]) > 1)
+
+
+def build_pages(years: Iterable[int]) -> Dict[str, str]:
+    """URL path -> HTML for every CONTRACT_PAGES page of the given years, from the datasets"""
+    with open(PLAYERS_FILE, newline="") as f:
+        players = {row["player_id"]: row for row in csv.DictReader(f)}
+    with open(CONTRACTS_FILE, newline="") as f:
+        contracts = list(csv.DictReader(f))
+
+    chrome = _chrome()
+    pages = {}
+    for year in years:
+        for url_template, salary_type in CONTRACT_PAGES:
+            listed = [
+                contract
+                for index, contract in enumerate(c for c in contracts if c["year"] == str(year) and c["type"] == salary_type)
+                if _page_for(url_template, contract, index)
+            ]
+            pages[_page_path(url_template.format(year=year))] = _render(url_template, listed, players, chrome)
+    return pages
+
+
+def load_saved_pages(directory: str) -> Dict[str, str]:
+    """URL path -> HTML for pages saved as <quote(path, safe="")>.html"""
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".html"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                pages[unquote(name[:-len(".html")])] = f.read()
+    return pages
+
+
+class SpotracFixtureServer:
+    """Threaded local HTTP server answering GETs for the given page paths."""
+
+    def __init__(self, pages: Dict[str, str], latency: float = 0.0):
+        self.pages = {path: body.encode("utf-8") for path, body in pages.items()}
+        self.etags = {path: f'"{hashlib.sha256(body).hexdigest()[:16]}"' for path, body in self.pages.items()}
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, spotrac_url: str) -> str:
+        """The fixture server's URL for a spotrac.com URL"""
+        return spotrac_url.replace(SPOTRAC_ORIGIN, self.base_url, 1)
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests += 1
+                    fixture.in_flight += 1
+                    fixture.max_in_flight = max(fixture.max_in_flight, fixture.in_flight)
+                try:
+                    if fixture.latency:
+                        time.sleep(fixture.latency)
+                    path = urlsplit(self.path).path
+                    body = fixture.pages.get(path)
+                    if body is not None and self.headers.get("If-None-Match") == fixture.etags[path]:
+                        with fixture._lock:
+                            fixture.not_modified += 1
+                        self.send_response(304)
+                        self.send_header("ETag", fixture.etags[path])
+                        self.end_headers()
+                        return
+                    status = 200 if body is not None else 404
+                    body = body if body is not None else b"not found"
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    if status == 200:
+                        self.send_header("ETag", fixture.etags[path])
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with fixture._lock:
+                        fixture.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "SpotracFixtureServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
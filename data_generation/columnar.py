@@ -0,0 +1,213 @@
+"""
+Columnar Dataset Store
+
+Optional typed Parquet copies of the CSV datasets, written next to them
+(dataset/players.parquet, dataset/pitcher_stats.parquet, ...). CSV stays the
+interchange format and the source of truth: every writer in save.py still
+writes CSV, and a Parquet file is only used while it matches the CSV it was
+converted from (the CSV's mtime/size are stored in the Parquet metadata).
+
+Column types come from the records.py dataclasses, so the Parquet schema and
+the CSV readers in save.py can't drift apart; the CSVs' -1 placeholders for an
+unknown contract age/service time become nulls, as they do in save.py's
+readers. Readers can project just the columns they need; a fresh Parquet
+file is memory-mapped rather than parsed.
+
+Requires pyarrow (installed with pybaseball). Without it, COLUMNAR_AVAILABLE
+is False and callers should stay on the CSV readers.
+
+Key functions:
+- dataset_schema(name) -> pa.Schema
+- convert_dataset(name) / convert_all()
+- read_table(name, columns=None) -> pa.Table
+- read_frame(name, columns=None) -> pd.DataFrame
+
+Usage:
+    python -m data_generation.columnar            # convert every dataset
+    python -m data_generation.columnar players    # convert one
+"""
+
+import os
+import tempfile
+from argparse import ArgumentParser
+from dataclasses import fields
+from typing import Dict, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+from .records import Player, Salary, BatterStats, PitcherStats
+from .save import PLAYERS_FILE, CONTRACTS_FILE, BATTER_STATS_FILE, PITCHER_STATS_FILE, _target_file_mode
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    COLUMNAR_AVAILABLE = True
+except ImportError:  # pragma: no cover - pyarrow ships with pybaseball
+    COLUMNAR_AVAILABLE = False
+
+# dataset name -> (record dataclass, CSV path)
+DATASETS = {
+    "players": (Player, PLAYERS_FILE),
+    "contracts": (Salary, CONTRACTS_FILE),
+    "batter_stats": (BatterStats, BATTER_STATS_FILE),
+    "pitcher_stats": (PitcherStats, PITCHER_STATS_FILE),
+}
+
+# Placeholder values the CSVs use for "unknown"; save.py's readers map them to None
+_NULL_SENTINELS = {
+    "contracts": {"age": -1, "service_time": -1},
+}
+
+# Parquet metadata keys recording which CSV version a file was converted from
+_SOURCE_MTIME_KEY = b"source_mtime_ns"
+_SOURCE_SIZE_KEY = b"source_size"
+
+
+def _require_pyarrow():
+    if not COLUMNAR_AVAILABLE:
+        raise ImportError("The columnar dataset store requires pyarrow (pip install pyarrow)")
+
+
+def _arrow_type(python_type):
+    """Map a dataclass field annotation to an Arrow type (Optional[X] -> nullable X)"""
+    if get_origin(python_type) is Union:
+        python_type = next(arg for arg in get_args(python_type) if arg is not type(None))
+    if python_type is int:
+        return pa.int32()
+    if python_type is float:
+        return pa.float64()
+    if python_type is str:
+        return pa.string()
+    raise TypeError(f"No Arrow type mapping for {python_type}")
+
+
+def dataset_schema(name: str) -> "pa.Schema":
+    """Arrow schema for a dataset, derived from its records.py dataclass"""
+    _require_pyarrow()
+    record_type, _ = DATASETS[name]
+    hints = get_type_hints(record_type)
+    return pa.schema([pa.field(field.name, _arrow_type(hints[field.name])) for field in fields(record_type)])
+
+
+def parquet_path(csv_path: str) -> str:
+    """The Parquet file that sits next to a CSV"""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def _csv_signature(csv_path: str) -> Tuple[int, int]:
+    file_stat = os.stat(csv_path)
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def _read_csv_table(name: str, csv_path: str, columns: Optional[List[str]] = None) -> "pa.Table":
+    """Typed CSV parse with pyarrow (empty cells and sentinels become nulls, as in save.py's readers)"""
+    schema = dataset_schema(name)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={field.name: field.type for field in schema},
+        include_columns=columns,
+        strings_can_be_null=True,
+        null_values=[""],
+    )
+    table = pa_csv.read_csv(csv_path, convert_options=convert_options)
+    for column, sentinel in _NULL_SENTINELS.get(name, {}).items():
+        if column in table.column_names:
+            values = table[column]
+            nulled = pc.if_else(pc.equal(values, sentinel), pa.scalar(None, values.type), values)
+            table = table.set_column(table.column_names.index(column), column, nulled)
+    return table
+
+
+def is_fresh(name: str, csv_path: Optional[str] = None) -> bool:
+    """True if the dataset's Parquet file exists and matches its CSV (which must exist)"""
+    _require_pyarrow()
+    csv_path = csv_path or DATASETS[name][1]
+    path = parquet_path(csv_path)
+    if not os.path.isfile(path) or not os.path.isfile(csv_path):
+        return False
+    metadata = pq.read_schema(path).metadata or {}
+    mtime, size = _csv_signature(csv_path)
+    return (
+        metadata.get(_SOURCE_MTIME_KEY) == str(mtime).encode()
+        and metadata.get(_SOURCE_SIZE_KEY) == str(size).encode()
+    )
+
+
+def convert_dataset(name: str, csv_path: Optional[str] = None) -> Optional[str]:
+    """
+    Convert one CSV dataset to Parquet next to it.
+
+    Returns the Parquet path, or None if the CSV doesn't exist.
+    """
+    _require_pyarrow()
+    csv_path = csv_path or DATASETS[name][1]
+    if not os.path.isfile(csv_path):
+        return None
+
+    mtime, size = _csv_signature(csv_path)
+    table = _read_csv_table(name, csv_path)
+    table = table.replace_schema_metadata({
+        _SOURCE_MTIME_KEY: str(mtime).encode(),
+        _SOURCE_SIZE_KEY: str(size).encode(),
+    })
+
+    path = parquet_path(csv_path)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp_", suffix=".parquet")
+    os.close(fd)
+    try:
+        pq.write_table(table, temp_path)
+        os.chmod(temp_path, _target_file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return path
+
+
+def convert_all() -> Dict[str, Optional[str]]:
+    """Convert every dataset that has a CSV on disk"""
+    return {name: convert_dataset(name) for name in DATASETS}
+
+
+def read_table(name: str, columns: Optional[List[str]] = None, csv_path: Optional[str] = None) -> "pa.Table":
+    """
+    Read a dataset as an Arrow table, optionally projecting to `columns`.
+
+    Uses the memory-mapped Parquet file when it's fresh, otherwise parses the
+    CSV with the same schema. A missing dataset is an empty table.
+    """
+    _require_pyarrow()
+    csv_path = csv_path or DATASETS[name][1]
+    if is_fresh(name, csv_path):
+        table = pq.read_table(parquet_path(csv_path), columns=columns, memory_map=True)
+        return table.replace_schema_metadata(None)
+    if os.path.isfile(csv_path):
+        return _read_csv_table(name, csv_path, columns)
+    schema = dataset_schema(name)
+    if columns is not None:
+        schema = pa.schema([schema.field(column) for column in columns])
+    return schema.empty_table()
+
+
+def read_frame(name: str, columns: Optional[List[str]] = None, csv_path: Optional[str] = None):
+    """read_table() as a pandas DataFrame (nullable ints stay integer-typed)"""
+    import pandas as pd
+
+    table = read_table(name, columns, csv_path)
+    return table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Convert CSV datasets to typed Parquet files next to them")
+    parser.add_argument("datasets", nargs="*", help=f"Datasets to convert: {', '.join(DATASETS)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+
+    for dataset_name in args.datasets or DATASETS:
+        output = convert_dataset(dataset_name)
+        if output:
+            print(f"✓ {dataset_name} -> {output}")
+        else:
+            print(f"- {dataset_name}: no CSV to convert")
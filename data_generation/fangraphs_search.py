@@ -17,11 +17,7 @@ import requests
 import time
 from typing import Dict, List, Optional, Set, Tuple
 
-from pybaseball import batting_stats, pitching_stats, cache
-
-# Enable pybaseball caching to avoid repeated API calls
-cache.enable()
-
+from .leaderboards import get_leaderboard, get_name_index
 from .player_lookup import normalize_name
 
 
@@ -40,7 +36,7 @@ def _ensure_year_cached(year: int):
 
     try:
         # Get all batters for the year (qual=0 means no minimum plate appearances)
-        batting = batting_stats(year, qual=0)
+        batting = get_leaderboard(year, "batting")
         if not batting.empty and 'IDfg' in batting.columns:
             _ACTIVE_PLAYERS_CACHE[year].update(batting['IDfg'].dropna().astype(int).tolist())
     except Exception as e:
@@ -48,7 +44,7 @@ def _ensure_year_cached(year: int):
 
     try:
         # Get all pitchers for the year
-        pitching = pitching_stats(year, qual=0)
+        pitching = get_leaderboard(year, "pitching")
         if not pitching.empty and 'IDfg' in pitching.columns:
             _ACTIVE_PLAYERS_CACHE[year].update(pitching['IDfg'].dropna().astype(int).tolist())
     except Exception as e:
@@ -59,7 +55,7 @@ def get_active_players_for_year(year: int) -> Set[int]:
     """
     Get the set of FanGraphs IDs for all players active in a given year.
 
-    This queries FanGraphs batting and pitching stats for the year.
+    This reads the year's batting and pitching leaderboards (data_generation/leaderboards.py).
 
     Args:
         year: The season year
@@ -86,21 +82,12 @@ def is_player_active_in_year(fg_id: int, year: int) -> bool:
     return fg_id in active_players
 
 
-def _parse_fangraphs_name(full_name: str) -> Tuple[str, str]:
-    """Parse a FanGraphs full name into first and last name components."""
-    if not full_name or not isinstance(full_name, str):
-        return ("", "")
-    parts = full_name.strip().split(" ", 1)
-    if len(parts) == 2:
-        return (parts[0], parts[1])
-    return (parts[0], "")
-
-
 def search_fangraphs_by_name(first_name: str, last_name: str, year: int) -> List[Dict]:
     """
     Search FanGraphs stats for players matching a name in a given year.
 
-    Uses normalized name matching to handle accents, periods, etc.
+    Uses normalized name matching to handle accents, periods, etc. Each
+    lookup is a dict hit in the season's name index (data_generation/leaderboards.py).
 
     Args:
         first_name: Player's first name
@@ -113,47 +100,23 @@ def search_fangraphs_by_name(first_name: str, last_name: str, year: int) -> List
     results = []
     seen_ids = set()
 
-    first_normalized = normalize_name(first_name)
-    last_normalized = normalize_name(last_name)
-
-    try:
-        batting = batting_stats(year, qual=0)
-        if not batting.empty and 'Name' in batting.columns and 'IDfg' in batting.columns:
-            for _, row in batting.iterrows():
-                fg_first, fg_last = _parse_fangraphs_name(row['Name'])
-                # Check if normalized names match
-                if (normalize_name(fg_first) == first_normalized and
-                    normalize_name(fg_last) == last_normalized):
-                    fg_id = int(row['IDfg'])
-                    if fg_id not in seen_ids:
-                        seen_ids.add(fg_id)
-                        results.append({
-                            'fg_id': fg_id,
-                            'name': row['Name'],
-                            'year': year,
-                            'stats_type': 'batting'
-                        })
-    except Exception as e:
-        print(f"Warning: Could not search batting stats for {year}: {e}")
-
-    try:
-        pitching = pitching_stats(year, qual=0)
-        if not pitching.empty and 'Name' in pitching.columns and 'IDfg' in pitching.columns:
-            for _, row in pitching.iterrows():
-                fg_first, fg_last = _parse_fangraphs_name(row['Name'])
-                if (normalize_name(fg_first) == first_normalized and
-                    normalize_name(fg_last) == last_normalized):
-                    fg_id = int(row['IDfg'])
-                    if fg_id not in seen_ids:
-                        seen_ids.add(fg_id)
-                        results.append({
-                            'fg_id': fg_id,
-                            'name': row['Name'],
-                            'year': year,
-                            'stats_type': 'pitching'
-                        })
-    except Exception as e:
-        print(f"Warning: Could not search pitching stats for {year}: {e}")
+    name_key = (normalize_name(first_name), normalize_name(last_name))
+
+    for stats_type in ("batting", "pitching"):
+        try:
+            hits = get_name_index(year, stats_type).get(name_key, [])
+        except Exception as e:
+            print(f"Warning: Could not search {stats_type} stats for {year}: {e}")
+            continue
+        for fg_id, name in hits:
+            if fg_id not in seen_ids:
+                seen_ids.add(fg_id)
+                results.append({
+                    'fg_id': fg_id,
+                    'name': name,
+                    'year': year,
+                    'stats_type': stats_type
+                })
 
     return results
 
@@ -296,14 +259,14 @@ def get_player_age_for_year(fangraphs_id: int, year: int) -> Optional[int]:
     """
     try:
         # Try batting stats first
-        batting = batting_stats(year, qual=0)
+        batting = get_leaderboard(year, "batting")
         if not batting.empty and 'Age' in batting.columns and 'IDfg' in batting.columns:
             player_row = batting[batting['IDfg'] == fangraphs_id]
             if not player_row.empty:
                 return int(player_row['Age'].iloc[0])
 
         # Try pitching stats
-        pitching = pitching_stats(year, qual=0)
+        pitching = get_leaderboard(year, "pitching")
         if not pitching.empty and 'Age' in pitching.columns and 'IDfg' in pitching.columns:
             player_row = pitching[pitching['IDfg'] == fangraphs_id]
             if not player_row.empty:
@@ -18,13 +18,9 @@ import csv
 import os
 import shutil
 
-from .records import Salary, BatterStats, PitcherStats, Player
-from .save import (
-    read_contracts_from_file,
-    read_players_from_file,
-    read_batter_stats,
-    read_pitcher_stats,
-)
+from .records import Salary, Player
+from .save import read_contracts_from_file, read_players_from_file
+from .stats_table import StatsTable, read_batter_stats_table, read_pitcher_stats_table
 
 CURRENT_YEAR = datetime.now().year
 
@@ -76,19 +72,6 @@ def _get_all_headers() -> List[str]:
     return CONTRACT_FIELDS + _generate_stats_headers()
 
 
-def _build_stats_lookup(
-    batter_stats: List[BatterStats],
-    pitcher_stats: List[PitcherStats]
-) -> Tuple[Dict, Dict]:
-    """
-    Build lookup dicts for quick stats access.
-    Key: (player_id, year, window_years)
-    """
-    batter_lookup = {stat.get_key(): stat for stat in batter_stats}
-    pitcher_lookup = {stat.get_key(): stat for stat in pitcher_stats}
-    return batter_lookup, pitcher_lookup
-
-
 def _build_player_lookup(players: List[Player]) -> Dict[str, Player]:
     """Build lookup dict for players by player_id"""
     return {player.player_id: player for player in players}
@@ -97,8 +80,8 @@ def _build_player_lookup(players: List[Player]) -> Dict[str, Player]:
 def _get_all_window_stats(
     player_id: str,
     contract_year: int,
-    batter_lookup: Dict,
-    pitcher_lookup: Dict
+    batter_lookup: StatsTable,
+    pitcher_lookup: StatsTable
 ) -> Tuple[Dict, Optional[int]]:
     """
     Get stats from ALL windows for the year before contract was signed.
@@ -133,8 +116,8 @@ def _get_all_window_stats(
 def create_contract_row(
     contract: Salary,
     player: Optional[Player],
-    batter_lookup: Dict,
-    pitcher_lookup: Dict
+    batter_lookup: StatsTable,
+    pitcher_lookup: StatsTable
 ) -> Dict:
     """Create a single row dict for a contract with all window stats."""
     stats_dict, stats_year = _get_all_window_stats(
@@ -285,17 +268,17 @@ def main(overwrite: bool = False):
     print("Loading datasets...")
     contracts = read_contracts_from_file()
     players = read_players_from_file()
-    batter_stats = read_batter_stats()
-    pitcher_stats = read_pitcher_stats()
+    batter_stats = read_batter_stats_table()
+    pitcher_stats = read_pitcher_stats_table()
 
     print(f"  Contracts: {len(contracts)}")
     print(f"  Players: {len(players)}")
     print(f"  Batter stats: {len(batter_stats)}")
     print(f"  Pitcher stats: {len(pitcher_stats)}")
 
-    # Build lookups
+    # Build lookups (the stats tables are indexed by (player_id, year, window_years) already)
     player_lookup = _build_player_lookup(players)
-    batter_lookup, pitcher_lookup = _build_stats_lookup(batter_stats, pitcher_stats)
+    batter_lookup, pitcher_lookup = batter_stats, pitcher_stats
 
     # Read existing joined data for skip logic
     existing = read_existing_joined_contracts() if not overwrite else {}
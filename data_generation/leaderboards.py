@@ -0,0 +1,180 @@
+"""
+Season Leaderboard Store
+
+One FanGraphs leaderboard per (season, group), fetched once and shared by
+every caller. pybaseball's batting_stats(year, qual=0) / pitching_stats(year,
+qual=0) download the full league leaderboard; stats.py used to request it
+once per player per season only to keep a single IDfg row, thousands of
+full-league downloads per run. Here each leaderboard is fetched at most once
+per process and kept in memory, and completed seasons are also saved under
+dataset/leaderboards/ ({group}_{season}.pkl, the frame exactly as pybaseball
+returned it) so later runs don't download them again. The current season is
+still in progress, so it is never read from disk: the first request in each
+run fetches it fresh.
+
+Each leaderboard also gets a name index, built the first time it's asked
+for and dropped whenever the leaderboard is re-fetched: normalized (first,
+last) name -> the FanGraphs IDs and names on that board. Name searches
+(fangraphs_search.search_fangraphs_by_name) are then a dict lookup per
+season instead of normalizing every row of the board on every search.
+
+Key functions:
+- get_leaderboard(season, group, refresh=False) -> pd.DataFrame
+- get_name_index(season, group) -> Dict[Tuple[str, str], List[Tuple[int, str]]]
+- join_leaderboard(season, group, players) -> pd.DataFrame
+- clear_leaderboards()
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from .player_lookup import normalize_name
+
+LEADERBOARD_DIR = "dataset/leaderboards"
+GROUPS = ("batting", "pitching")
+
+CURRENT_YEAR = datetime.now().year
+
+# (season, group) -> leaderboard, for this process
+_LEADERBOARDS: Dict[Tuple[int, str], pd.DataFrame] = {}
+# (season, group) -> normalized (first, last) -> [(FanGraphs ID, name), ...] in board order
+_NAME_INDEXES: Dict[Tuple[int, str], Dict[Tuple[str, str], List[Tuple[int, str]]]] = {}
+# Whether pybaseball's own request cache has been enabled in this process
+_PYBASEBALL_CACHE_ENABLED = False
+
+
+def _leaderboard_path(season: int, group: str) -> str:
+    return os.path.join(LEADERBOARD_DIR, f"{group}_{season}.pkl")
+
+
+def _download(season: int, group: str) -> pd.DataFrame:
+    """The network call: the full qual=0 leaderboard for one season"""
+    # pybaseball is slow to import, so it's only loaded once something is actually downloaded
+    from pybaseball import batting_stats, cache, pitching_stats
+
+    # Enable pybaseball caching to avoid repeated API calls (once per process)
+    global _PYBASEBALL_CACHE_ENABLED
+    if not _PYBASEBALL_CACHE_ENABLED:
+        cache.enable()
+        _PYBASEBALL_CACHE_ENABLED = True
+
+    # qual=0: Include all players regardless of minimum appearance threshold
+    # Filtering for statistical relevance happens at model-building time
+    fetch = batting_stats if group == "batting" else pitching_stats
+    return fetch(season, qual=0)
+
+
+def _save(frame: pd.DataFrame, path: str):
+    """Atomically persist a leaderboard (temp file + os.replace)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".leaderboard.", suffix=".tmp")
+    os.close(fd)
+    try:
+        frame.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def get_leaderboard(season: int, group: str, refresh: bool = False) -> pd.DataFrame:
+    """
+    The full FanGraphs leaderboard for a season, fetched at most once.
+
+    Args:
+        season: The season year
+        group: "batting" or "pitching"
+        refresh: Ignore the in-memory and on-disk copies and download again
+
+    Returns:
+        The leaderboard DataFrame (one row per player, keyed by IDfg)
+    """
+    if group not in GROUPS:
+        raise ValueError(f"Unknown leaderboard group {group!r} (expected one of {GROUPS})")
+    key = (season, group)
+    if not refresh and key in _LEADERBOARDS:
+        return _LEADERBOARDS[key]
+
+    path = _leaderboard_path(season, group)
+    completed = season < CURRENT_YEAR
+    if not refresh and completed and os.path.exists(path):
+        frame = pd.read_pickle(path)
+    else:
+        frame = _download(season, group)
+        if completed:
+            _save(frame, path)
+    _LEADERBOARDS[key] = frame
+    _NAME_INDEXES.pop(key, None)
+    return frame
+
+
+def split_fangraphs_name(full_name: str) -> Tuple[str, str]:
+    """Parse a FanGraphs full name into first and last name components."""
+    if not full_name or not isinstance(full_name, str):
+        return ("", "")
+    parts = full_name.strip().split(" ", 1)
+    if len(parts) == 2:
+        return (parts[0], parts[1])
+    return (parts[0], "")
+
+
+def get_name_index(season: int, group: str) -> Dict[Tuple[str, str], List[Tuple[int, str]]]:
+    """
+    The season leaderboard's players by normalized name, built once per leaderboard.
+
+    Args:
+        season: The season year
+        group: "batting" or "pitching"
+
+    Returns:
+        (normalize_name(first), normalize_name(last)) -> [(FanGraphs ID, FanGraphs
+        name), ...] in leaderboard order; empty if the board has no Name/IDfg
+    """
+    board = get_leaderboard(season, group)
+    key = (season, group)
+    if key in _NAME_INDEXES:
+        return _NAME_INDEXES[key]
+
+    index: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+    if not board.empty and "Name" in board.columns and "IDfg" in board.columns:
+        fg_ids = pd.to_numeric(board["IDfg"], errors="coerce")
+        for name, fg_id in zip(board["Name"].tolist(), fg_ids.tolist()):
+            if pd.isna(fg_id):
+                continue
+            first, last = split_fangraphs_name(name)
+            index.setdefault((normalize_name(first), normalize_name(last)), []).append((int(fg_id), name))
+    _NAME_INDEXES[key] = index
+    return index
+
+
+def join_leaderboard(season: int, group: str, players: Dict[int, str]) -> pd.DataFrame:
+    """
+    The leaderboard rows for the given players, in one merge on IDfg.
+
+    Args:
+        season: The season year
+        group: "batting" or "pitching"
+        players: FanGraphs ID -> internal player ID
+
+    Returns:
+        Matching leaderboard rows with an added player_id column (empty if
+        none of the players appear that season)
+    """
+    board = get_leaderboard(season, group)
+    tracked = pd.DataFrame({"IDfg": list(players.keys()), "player_id": list(players.values())}, dtype=object)
+    if board.empty or "IDfg" not in board.columns or tracked.empty:
+        return board.iloc[0:0].assign(player_id=pd.Series(dtype=object))
+    tracked["IDfg"] = tracked["IDfg"].astype("int64")
+    keyed = board.assign(IDfg=pd.to_numeric(board["IDfg"], errors="coerce")).dropna(subset=["IDfg"])
+    keyed["IDfg"] = keyed["IDfg"].astype("int64")
+    return keyed.merge(tracked, on="IDfg", how="inner").drop_duplicates("IDfg")
+
+
+def clear_leaderboards():
+    """Forget the in-memory leaderboards and name indexes (on-disk copies are kept)"""
+    _LEADERBOARDS.clear()
+    _NAME_INDEXES.clear()
@@ -0,0 +1,136 @@
+"""
+Scraped Page Cache
+
+On-disk cache of fetched HTML pages keyed by URL, so re-scraping pages that
+haven't changed costs a conditional request and nothing else.
+
+Each entry under dataset/spotrac_pages/ is two files named by the URL's
+sha256: <key>.html (the last body) and <key>.json, holding the URL, the
+response's ETag / Last-Modified validators, the body's sha256, and what was
+last written to the dataset from it (the body and parsed-table hashes).
+
+- Conditional GET: conditional_headers() turns the validators into
+  If-None-Match / If-Modified-Since, so an unchanged page comes back as an
+  empty 304 and the body is read from disk instead.
+- Skipping work: a page whose body hash matches the hash recorded by
+  mark_written() needn't be parsed or written again. Sites that re-render
+  incidental markup (ads, timestamps) on every request change the body hash
+  daily, so mark_written() also records a hash of the parsed table, and
+  callers compare that before rebuilding records.
+
+Writes are atomic (temp file + os.replace) and entries for different URLs
+are independent files, so concurrent fetch threads can share one cache.
+
+Key classes:
+- PageCache(directory)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+PAGE_CACHE_DIR = "dataset/spotrac_pages"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedPage(NamedTuple):
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    sha256: str
+    written_sha256: Optional[str]
+    written_table_sha256: Optional[str]
+
+
+def _write_atomic(path: str, data: str):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".page.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PageCache:
+    """HTML bodies, validators and written-hash markers for scraped URLs"""
+
+    def __init__(self, directory: str = PAGE_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".html", base + ".json"
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """The cached entry for url, or None (also if the body went missing)"""
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        body_path, _ = self._paths(url)
+        try:
+            with open(body_path, encoding="utf-8") as f:
+                body = f.read()
+        except OSError:
+            return None
+        if content_hash(body) != meta["sha256"]:
+            return None
+        return CachedPage(url, body, meta.get("etag"), meta.get("last_modified"), meta["sha256"],
+                          meta.get("written_sha256"), meta.get("written_table_sha256"))
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedPage]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a cached entry"""
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> str:
+        """Save a freshly fetched body and its validators; returns the body hash"""
+        sha256 = content_hash(body)
+        meta = self._read_meta(url) or {}
+        body_path, meta_path = self._paths(url)
+        if meta.get("sha256") != sha256 or not os.path.exists(body_path):
+            _write_atomic(body_path, body)
+        meta.update({
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": sha256,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        _write_atomic(meta_path, json.dumps(meta, indent=1))
+        return sha256
+
+    def mark_written(self, url: str, sha256: str, table_sha256: Optional[str] = None):
+        """Record that the page with this body (and parsed table) hash is in the dataset"""
+        meta = self._read_meta(url)
+        if meta is None:
+            return
+        meta["written_sha256"] = sha256
+        meta["written_table_sha256"] = table_sha256
+        _, meta_path = self._paths(url)
+        _write_atomic(meta_path, json.dumps(meta, indent=1))
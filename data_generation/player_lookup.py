@@ -16,7 +16,8 @@ import unicodedata
 from typing import Dict, List, Optional, Tuple
 
 from .records import Player
-from .save import read_players_from_file, read_batter_stats, read_pitcher_stats
+from .save import read_players_from_file
+from .stats_table import read_batter_stats_table, read_pitcher_stats_table
 
 
 def normalize_name(name: str) -> str:
@@ -129,34 +130,13 @@ def _ensure_career_spans_loaded():
 
     _CAREER_SPANS = {}
 
-    # Build career spans from batter and pitcher stats
-    batter_stats = read_batter_stats()
-    pitcher_stats = read_pitcher_stats()
-
-    # Only use single-year stats (window_years=1) for career span calculation
-    for stat in batter_stats:
-        if stat.window_years != 1:
-            continue
-        player_id = stat.player_id
-        year = stat.year
-
-        if player_id not in _CAREER_SPANS:
-            _CAREER_SPANS[player_id] = (year, year)
-        else:
-            first, last = _CAREER_SPANS[player_id]
-            _CAREER_SPANS[player_id] = (min(first, year), max(last, year))
-
-    for stat in pitcher_stats:
-        if stat.window_years != 1:
-            continue
-        player_id = stat.player_id
-        year = stat.year
-
-        if player_id not in _CAREER_SPANS:
-            _CAREER_SPANS[player_id] = (year, year)
-        else:
-            first, last = _CAREER_SPANS[player_id]
-            _CAREER_SPANS[player_id] = (min(first, year), max(last, year))
+    # Build career spans from single-year (window_years=1) batter and pitcher stats
+    for stats_table in (read_batter_stats_table(), read_pitcher_stats_table()):
+        for player_id, (first, last) in stats_table.year_spans(window_years=1).items():
+            if player_id in _CAREER_SPANS:
+                known_first, known_last = _CAREER_SPANS[player_id]
+                first, last = min(first, known_first), max(last, known_last)
+            _CAREER_SPANS[player_id] = (first, last)
 
 
 def refresh_caches():
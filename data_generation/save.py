@@ -1,12 +1,14 @@
 import csv
 import os
+import tempfile
+from stat import S_IMODE
 from dataclasses import fields
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
 
 import json
 
-from .records import Player, Salary, BatterStats, PitcherStats, ReviewQueueItem
+from .records import Player, Salary, Stats, BatterStats, PitcherStats, ReviewQueueItem
 
 CURRENT_YEAR = datetime.now().year
 
@@ -16,6 +18,15 @@ BATTER_STATS_FILE = "dataset/batter_stats.csv"
 PITCHER_STATS_FILE = "dataset/pitcher_stats.csv"
 REVIEW_QUEUE_FILE = "dataset/review_queue.csv"
 
+REVIEW_QUEUE_HEADERS = ["first_name", "last_name", "contract_year", "spotrac_link", "candidates", "added_at"]
+
+# Storage backend for every reader/writer in this module: "csv" (default) or "sqlite"
+DATASET_BACKENDS = ("csv", "sqlite")
+DATASET_BACKEND = os.environ.get("DATASET_BACKEND", "csv")
+
+# Stats key index: file path -> (file signature, {(player_id, year, window_years)})
+_STATS_KEY_INDEX: Dict[str, Tuple[Tuple[int, int], Set[Tuple[str, int, int]]]] = {}
+
 def _get_dataclass_headers(dataclass_type) -> List[str]:
     """Extract field names from a dataclass to use as CSV headers"""
     return [field.name for field in fields(dataclass_type)]
@@ -26,7 +37,7 @@ def _get_dataclass_values(instance) -> List:
     return [_optional_value(getattr(instance, field.name)) for field in fields(instance)]
 
 
-def write_players_to_file(players: List[Player], overwrite: bool = False):
+def _write_players_csv(players: List[Player], overwrite: bool = False):
     file_exists = os.path.isfile(PLAYERS_FILE)
     if overwrite and file_exists:
         with open(PLAYERS_FILE, mode="w", newline="") as file:
@@ -34,7 +45,7 @@ def write_players_to_file(players: List[Player], overwrite: bool = False):
             file.truncate()
             writer = csv.writer(file)
             writer.writerow(["player_id", "fangraphs_id", "first_name", "last_name", "position", "spotrac_link"])
-    existing_players = {player.player_id: player for player in read_players_from_file()}
+    existing_players = {player.player_id: player for player in _read_players_csv()}
     with open(PLAYERS_FILE, mode="a", newline="") as file:
         writer = csv.writer(file)
         if not file_exists:
@@ -50,7 +61,7 @@ def write_players_to_file(players: List[Player], overwrite: bool = False):
                     player.spotrac_link or "",
                 ])
 
-def read_players_from_file() -> List[Player]:
+def _read_players_csv() -> List[Player]:
     players = []
     if not os.path.isfile(PLAYERS_FILE):
         return players
@@ -67,7 +78,7 @@ def read_players_from_file() -> List[Player]:
             ))
     return players
 
-def write_contracts_to_file(contracts: List[Salary], overwrite: bool = False):
+def _write_contracts_csv(contracts: List[Salary], overwrite: bool = False):
     file_exists = os.path.isfile(CONTRACTS_FILE)
     if overwrite and file_exists:
         with open(CONTRACTS_FILE, mode="w", newline="") as file:
@@ -75,7 +86,7 @@ def write_contracts_to_file(contracts: List[Salary], overwrite: bool = False):
             file.truncate()
             writer = csv.writer(file)
             writer.writerow(["contract_id", "player_id", "age", "service_time", "year", "duration", "value", "type"])
-    existing_contracts = {contract.contract_id: contract for contract in read_contracts_from_file()}
+    existing_contracts = {contract.contract_id: contract for contract in _read_contracts_csv()}
     with open(CONTRACTS_FILE, mode="a", newline="") as file:
         writer = csv.writer(file)
         if not file_exists:
@@ -93,7 +104,7 @@ def write_contracts_to_file(contracts: List[Salary], overwrite: bool = False):
                     contract.type
                 ])
 
-def read_contracts_from_file() -> List[Salary]:
+def _read_contracts_csv() -> List[Salary]:
     contracts = []
     if not os.path.isfile(CONTRACTS_FILE):
         return contracts
@@ -123,95 +134,159 @@ def _parse_optional_int(val):
 def _parse_optional_float(val):
     return float(val) if val != "" else None
 
-def write_batter_stats(batter_stats: List[BatterStats], overwrite: bool = False):
-    """Write batting statistics to CSV file"""
-    file_exists = os.path.isfile(BATTER_STATS_FILE)
-
-    # Get headers directly from BatterStats dataclass
-    headers = _get_dataclass_headers(BatterStats)
+def _file_signature(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file, used to detect writes from outside this process"""
+    file_stat = os.stat(path)
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def _load_stats_key_index(path: str) -> Set[Tuple[str, int, int]]:
+    """
+    Return the set of (player_id, year, window_years) keys already in a stats CSV.
+
+    The index is kept in memory across calls and only rebuilt when the file's
+    signature changes, so stats.main (which writes once per player) doesn't
+    re-parse the whole file on every write. Only the three key columns are read.
+    """
+    if not os.path.isfile(path):
+        _STATS_KEY_INDEX.pop(path, None)
+        return set()
+
+    signature = _file_signature(path)
+    cached = _STATS_KEY_INDEX.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    keys = set()
+    with open(path, mode="r", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header:
+            player_col = header.index("player_id")
+            year_col = header.index("year")
+            window_col = header.index("window_years")
+            for row in reader:
+                keys.add((row[player_col], int(row[year_col]), int(row[window_col])))
 
-    # Handle overwrite
-    if overwrite and file_exists:
-        with open(BATTER_STATS_FILE, mode="w", newline="") as file:
-            file.truncate()
-            writer = csv.writer(file)
-            writer.writerow(headers)
+    _STATS_KEY_INDEX[path] = (signature, keys)
+    return keys
 
-    # Read existing stats
-    existing_stats = {stat.get_key(): stat for stat in read_batter_stats()}
 
-    # Update with new stats
-    needs_rewrite = False
-    for stat in batter_stats:
-        stat_key = stat.get_key()
-        if stat_key not in existing_stats or existing_stats[stat_key].year == CURRENT_YEAR:
-            existing_stats[stat_key] = stat
-            if stat_key in existing_stats:
-                needs_rewrite = True
-
-    # If we updated any current-year records, rewrite entire file
-    if needs_rewrite and file_exists:
-        with open(BATTER_STATS_FILE, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            for stat in existing_stats.values():
-                writer.writerow(_get_dataclass_values(stat))
-    else:
-        # Otherwise just append new records
-        with open(BATTER_STATS_FILE, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            if not file_exists:
-                writer.writerow(headers)
-            for stat in batter_stats:
-                if stat.get_key() not in {s.get_key() for s in read_batter_stats()}:
-                    writer.writerow(_get_dataclass_values(stat))
+def _remember_stats_keys(path: str, keys: Set[Tuple[str, int, int]]):
+    """Record the key index for a file this process just wrote"""
+    _STATS_KEY_INDEX[path] = (_file_signature(path), keys)
 
 
-def write_pitcher_stats(pitcher_stats: List[PitcherStats], overwrite: bool = False):
-    """Write pitching statistics to CSV file"""
-    file_exists = os.path.isfile(PITCHER_STATS_FILE)
+def _target_file_mode(path: str) -> int:
+    """Permission bits for a rewritten file: keep the original's, or the umask default"""
+    if os.path.exists(path):
+        return S_IMODE(os.stat(path).st_mode)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
 
-    # Get headers directly from PitcherStats dataclass
-    headers = _get_dataclass_headers(PitcherStats)
 
-    # Handle overwrite
-    if overwrite and file_exists:
-        with open(PITCHER_STATS_FILE, mode="w", newline="") as file:
-            file.truncate()
+def _atomic_write_rows(path: str, headers: List[str], rows: Iterable[List]):
+    """Write a CSV to a temp file in the same directory, then rename it into place"""
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".csv")
+    try:
+        with os.fdopen(fd, mode="w", newline="") as file:
             writer = csv.writer(file)
             writer.writerow(headers)
+            writer.writerows(rows)
+        os.chmod(temp_path, _target_file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
-    # Read existing stats
-    existing_stats = {stat.get_key(): stat for stat in read_pitcher_stats()}
 
-    # Update with new stats
-    needs_rewrite = False
-    for stat in pitcher_stats:
+def _read_csv_header(path: str) -> List[str]:
+    """The header row of a CSV file (empty if the file is empty)"""
+    with open(path, mode="r", newline="") as file:
+        return next(csv.reader(file), [])
+
+
+def _dedupe_stats_batch(stats: List[Stats]) -> Dict[Tuple[str, int, int], Stats]:
+    """One record per key within a batch: the first, unless a later CURRENT_YEAR record replaces it"""
+    batch = {}
+    for stat in stats:
         stat_key = stat.get_key()
-        if stat_key not in existing_stats or existing_stats[stat_key].year == CURRENT_YEAR:
-            existing_stats[stat_key] = stat
-            if stat_key in existing_stats:
-                needs_rewrite = True
-
-    # If we updated any current-year records, rewrite entire file
-    if needs_rewrite and file_exists:
-        with open(PITCHER_STATS_FILE, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            for stat in existing_stats.values():
-                writer.writerow(_get_dataclass_values(stat))
+        if stat_key not in batch or stat_key[1] == CURRENT_YEAR:
+            batch[stat_key] = stat
+    return batch
+
+
+def _upsert_stats(path: str, stats_type, stats: List[Stats], overwrite: bool = False):
+    """
+    Insert new stats records and refresh current-year ones in a single pass.
+
+    Records are classified against the key index:
+    - key not on file: insert (appended to the end of the file)
+    - key on file for CURRENT_YEAR: update (current-season stats still change)
+    - key on file for a past year: skipped (historical stats are final)
+
+    Inserts alone are a plain append. Any update means rewriting the file; the
+    rewrite streams the existing rows as raw strings (no dataclass parsing),
+    substitutes the updated ones, and is written to a temp file then renamed
+    over the original so a crash never leaves a half-written dataset. Existing
+    rows are mapped onto the dataclass header by column name, and a file whose
+    header differs from it is rewritten rather than appended to.
+    """
+    headers = _get_dataclass_headers(stats_type)
+
+    batch = _dedupe_stats_batch(stats)
+    if overwrite:
+        _atomic_write_rows(path, headers, (_get_dataclass_values(stat) for stat in batch.values()))
+        _remember_stats_keys(path, set(batch))
+        return
+
+    existing_keys = _load_stats_key_index(path)
+    inserts = {}
+    updates = {}
+    for stat_key, stat in batch.items():
+        if stat_key in existing_keys:
+            if stat_key[1] == CURRENT_YEAR:
+                updates[stat_key] = stat
+        else:
+            inserts[stat_key] = stat
+
+    if not inserts and not updates:
+        return
+
+    file_exists = os.path.isfile(path)
+    if updates or (file_exists and _read_csv_header(path) not in ([], headers)):
+        with open(path, mode="r", newline="") as file:
+            reader = csv.reader(file)
+            file_headers = next(reader)
+            key_cols = [file_headers.index(name) for name in ("player_id", "year", "window_years")]
+            # Existing rows are re-emitted by column name, so a file whose column
+            # order differs from the dataclass is rewritten under `headers` intact
+            columns = [file_headers.index(name) if name in file_headers else None for name in headers]
+            rows = []
+            for row in reader:
+                row_key = (row[key_cols[0]], int(row[key_cols[1]]), int(row[key_cols[2]]))
+                updated = updates.get(row_key)
+                if updated is not None:
+                    rows.append(_get_dataclass_values(updated))
+                else:
+                    rows.append(["" if col is None else row[col] for col in columns])
+        rows.extend(_get_dataclass_values(stat) for stat in inserts.values())
+        _atomic_write_rows(path, headers, rows)
     else:
-        # Otherwise just append new records
-        with open(PITCHER_STATS_FILE, mode="a", newline="") as file:
+        with open(path, mode="a", newline="") as file:
             writer = csv.writer(file)
             if not file_exists:
                 writer.writerow(headers)
-            for stat in pitcher_stats:
-                if stat.get_key() not in {s.get_key() for s in read_pitcher_stats()}:
-                    writer.writerow(_get_dataclass_values(stat))
+            for stat in inserts.values():
+                writer.writerow(_get_dataclass_values(stat))
 
+    _remember_stats_keys(path, existing_keys | set(inserts))
 
-def read_batter_stats() -> List[BatterStats]:
+
+def _read_batter_stats_csv() -> List[BatterStats]:
     """Read batting statistics from CSV file"""
     batter_stats = []
 
@@ -253,7 +328,7 @@ def read_batter_stats() -> List[BatterStats]:
     return batter_stats
 
 
-def read_pitcher_stats() -> List[PitcherStats]:
+def _read_pitcher_stats_csv() -> List[PitcherStats]:
     """Read pitching statistics from CSV file"""
     pitcher_stats = []
 
@@ -295,21 +370,21 @@ def read_pitcher_stats() -> List[PitcherStats]:
     return pitcher_stats
 
 
-def write_stats_to_file(batter_stats: List[BatterStats], pitcher_stats: List[PitcherStats], overwrite: bool = False):
-    """Convenience function to write both batting and pitching stats in one call"""
-    write_batter_stats(batter_stats, overwrite)
-    write_pitcher_stats(pitcher_stats, overwrite)
+def _review_queue_row(item: ReviewQueueItem) -> List:
+    return [
+        item.first_name,
+        item.last_name,
+        item.contract_year,
+        item.spotrac_link,
+        json.dumps(item.candidates),  # Store dict as JSON string
+        item.added_at.strftime("%Y-%m-%d %H:%M:%S")
+    ]
 
 
-def read_stats_from_file() -> Tuple[List[BatterStats], List[PitcherStats]]:
-    """Convenience function to read both batting and pitching stats in one call"""
-    return read_batter_stats(), read_pitcher_stats()
-
-
-def write_review_queue_item(item: ReviewQueueItem):
+def _write_review_queue_item_csv(item: ReviewQueueItem):
     """Add a single item to the review queue"""
     file_exists = os.path.isfile(REVIEW_QUEUE_FILE)
-    existing_items = {item.get_key(): item for item in read_review_queue()}
+    existing_items = {item.get_key(): item for item in _read_review_queue_csv()}
 
     # Skip if already in queue
     if item.get_key() in existing_items:
@@ -318,18 +393,11 @@ def write_review_queue_item(item: ReviewQueueItem):
     with open(REVIEW_QUEUE_FILE, mode="a", newline="") as file:
         writer = csv.writer(file)
         if not file_exists:
-            writer.writerow(["first_name", "last_name", "contract_year", "spotrac_link", "candidates", "added_at"])
-        writer.writerow([
-            item.first_name,
-            item.last_name,
-            item.contract_year,
-            item.spotrac_link,
-            json.dumps(item.candidates),  # Store dict as JSON string
-            item.added_at.strftime("%Y-%m-%d %H:%M:%S")
-        ])
+            writer.writerow(REVIEW_QUEUE_HEADERS)
+        writer.writerow(_review_queue_row(item))
 
 
-def read_review_queue() -> List[ReviewQueueItem]:
+def _read_review_queue_csv() -> List[ReviewQueueItem]:
     """Read all items from the review queue"""
     items = []
     if not os.path.isfile(REVIEW_QUEUE_FILE):
@@ -353,21 +421,122 @@ def read_review_queue() -> List[ReviewQueueItem]:
     return items
 
 
-def remove_review_queue_item(item: ReviewQueueItem):
+def _rewrite_review_queue_csv(items: List[ReviewQueueItem]):
+    """Replace the review queue file's contents with `items`"""
+    with open(REVIEW_QUEUE_FILE, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(REVIEW_QUEUE_HEADERS)
+        for item in items:
+            writer.writerow(_review_queue_row(item))
+
+
+def _remove_review_queue_item_csv(item: ReviewQueueItem):
     """Remove an item from the review queue after it's been resolved"""
-    items = read_review_queue()
+    items = _read_review_queue_csv()
     remaining = [i for i in items if i.get_key() != item.get_key()]
 
     # Rewrite the file without the removed item
-    with open(REVIEW_QUEUE_FILE, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["first_name", "last_name", "contract_year", "spotrac_link", "candidates", "added_at"])
-        for i in remaining:
-            writer.writerow([
-                i.first_name,
-                i.last_name,
-                i.contract_year,
-                i.spotrac_link,
-                json.dumps(i.candidates),
-                i.added_at.strftime("%Y-%m-%d %H:%M:%S")
-            ])
+    _rewrite_review_queue_csv(remaining)
+
+
+# Backend dispatch
+#
+# Every public reader/writer below goes to the CSV implementations above by
+# default. DATASET_BACKEND=sqlite routes them to data_generation/sqlite_store.py
+# instead (same records in, same records out); CSVs can then be regenerated
+# from the database with `python -m data_generation.sqlite_store export`.
+
+def _use_sqlite() -> bool:
+    if DATASET_BACKEND not in DATASET_BACKENDS:
+        raise ValueError(f"Unknown DATASET_BACKEND {DATASET_BACKEND!r} (expected one of {DATASET_BACKENDS})")
+    return DATASET_BACKEND == "sqlite"
+
+
+def _sqlite_store():
+    # Deferred: sqlite_store imports this module for the CSV import/export helpers
+    from . import sqlite_store
+    return sqlite_store
+
+
+def write_players_to_file(players: List[Player], overwrite: bool = False):
+    if _use_sqlite():
+        return _sqlite_store().write_players(players, overwrite)
+    _write_players_csv(players, overwrite)
+
+
+def read_players_from_file() -> List[Player]:
+    if _use_sqlite():
+        return _sqlite_store().read_players()
+    return _read_players_csv()
+
+
+def write_contracts_to_file(contracts: List[Salary], overwrite: bool = False):
+    if _use_sqlite():
+        return _sqlite_store().write_contracts(contracts, overwrite)
+    _write_contracts_csv(contracts, overwrite)
+
+
+def read_contracts_from_file() -> List[Salary]:
+    if _use_sqlite():
+        return _sqlite_store().read_contracts()
+    return _read_contracts_csv()
+
+
+def write_batter_stats(batter_stats: List[BatterStats], overwrite: bool = False):
+    """Write batting statistics to the dataset"""
+    if _use_sqlite():
+        return _sqlite_store().write_stats(BatterStats, batter_stats, overwrite)
+    _upsert_stats(BATTER_STATS_FILE, BatterStats, batter_stats, overwrite)
+
+
+def write_pitcher_stats(pitcher_stats: List[PitcherStats], overwrite: bool = False):
+    """Write pitching statistics to the dataset"""
+    if _use_sqlite():
+        return _sqlite_store().write_stats(PitcherStats, pitcher_stats, overwrite)
+    _upsert_stats(PITCHER_STATS_FILE, PitcherStats, pitcher_stats, overwrite)
+
+
+def read_batter_stats() -> List[BatterStats]:
+    """Read batting statistics from the dataset"""
+    if _use_sqlite():
+        return _sqlite_store().read_stats(BatterStats)
+    return _read_batter_stats_csv()
+
+
+def read_pitcher_stats() -> List[PitcherStats]:
+    """Read pitching statistics from the dataset"""
+    if _use_sqlite():
+        return _sqlite_store().read_stats(PitcherStats)
+    return _read_pitcher_stats_csv()
+
+
+def write_stats_to_file(batter_stats: List[BatterStats], pitcher_stats: List[PitcherStats], overwrite: bool = False):
+    """Convenience function to write both batting and pitching stats in one call"""
+    write_batter_stats(batter_stats, overwrite)
+    write_pitcher_stats(pitcher_stats, overwrite)
+
+
+def read_stats_from_file() -> Tuple[List[BatterStats], List[PitcherStats]]:
+    """Convenience function to read both batting and pitching stats in one call"""
+    return read_batter_stats(), read_pitcher_stats()
+
+
+def write_review_queue_item(item: ReviewQueueItem):
+    """Add a single item to the review queue"""
+    if _use_sqlite():
+        return _sqlite_store().write_review_queue_item(item)
+    _write_review_queue_item_csv(item)
+
+
+def read_review_queue() -> List[ReviewQueueItem]:
+    """Read all items from the review queue"""
+    if _use_sqlite():
+        return _sqlite_store().read_review_queue()
+    return _read_review_queue_csv()
+
+
+def remove_review_queue_item(item: ReviewQueueItem):
+    """Remove an item from the review queue after it's been resolved"""
+    if _use_sqlite():
+        return _sqlite_store().remove_review_queue_item(item)
+    _remove_review_queue_item_csv(item)
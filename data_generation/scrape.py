@@ -0,0 +1,219 @@
+"""
+Page Scraping Scheduler
+
+Fetches many pages concurrently and parses them in worker processes, while
+callers still consume the results in the order they asked for them.
+
+- Fetching: a thread pool sending every request through one shared
+  requests.Session, whose HTTPAdapter keeps `concurrency` keep-alive
+  connections per host instead of opening a new connection per page.
+- Politeness: a HostRateLimiter spaces request starts to the same host at
+  least `min_interval` seconds apart, however many threads are fetching, so
+  concurrency overlaps the waiting on responses rather than hitting the site
+  harder.
+- Parsing: HTML -> plain rows is CPU-bound (BeautifulSoup), so it runs in a
+  process pool. The parse function must be a module-level function returning
+  picklable data; anything with side effects (player lookups, prompts,
+  writes) stays with the caller.
+
+- Caching: with a PageCache (data_generation/page_cache.py), requests are
+  conditional and bodies are stored on disk. A page whose body is the one
+  the caller last wrote to the dataset can be submitted with
+  skip_unchanged=True, and comes back unparsed.
+
+submit() returns a Future per page immediately. Callers wait on them in
+their own order, so fetching and parsing of later pages overlap processing
+of earlier ones, and output order never depends on which request finished
+first. A page's parse is chained onto its fetch rather than run inside it,
+so fetch threads never sit waiting on the process pool.
+
+Key classes:
+- HostRateLimiter(min_interval)
+- Page(url, parsed, sha256, unchanged, cached)
+- PageScheduler(parse, concurrency, processes, min_interval, cache)
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .page_cache import CachedPage, PageCache, content_hash
+
+DEFAULT_CONCURRENCY = 4
+# Minimum spacing between request starts to one host (seconds)
+DEFAULT_MIN_INTERVAL = 0.25
+REQUEST_TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0"
+
+
+class HostRateLimiter:
+    """Spaces request starts to each host at least min_interval seconds apart; thread-safe"""
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_start: Dict[str, float] = {}
+        self.waited_seconds = 0.0
+
+    def wait(self, url: str) -> float:
+        """Block until a request to url's host may start; returns seconds waited"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start.get(host, now))
+            # Reserve the slot before sleeping so concurrent callers queue up behind it
+            self._next_start[host] = start + self.min_interval
+            wait = start - now
+            self.waited_seconds += wait
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class Page(NamedTuple):
+    """A scheduled page: parsed is parse(html), or None if it failed or was skipped as unchanged"""
+    url: str
+    parsed: Any
+    sha256: Optional[str]  # body hash; None if the fetch failed
+    unchanged: bool
+    cached: Optional[CachedPage]  # the cache entry from before this fetch
+
+
+def pooled_session(pool_size: int) -> requests.Session:
+    """A requests.Session keeping up to pool_size keep-alive connections per host"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def _start_worker():
+    """No-op task, submitted once so the process pool starts its workers"""
+
+
+class PageScheduler:
+    """
+    Concurrent fetch + process-pool parse for a batch of pages.
+
+    Use as a context manager; submit(url) returns a Future resolving to a Page.
+    """
+
+    def __init__(self, parse: Callable[[str], Any], concurrency: int = DEFAULT_CONCURRENCY,
+                 processes: Optional[int] = None, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 limiter: Optional[HostRateLimiter] = None, cache: Optional[PageCache] = None):
+        self.parse = parse
+        self.concurrency = concurrency
+        self.limiter = limiter if limiter is not None else HostRateLimiter(min_interval)
+        self.cache = cache
+        self.session = pooled_session(concurrency)
+        self.counters = {"fetched": 0, "not_modified": 0, "failed": 0, "bytes": 0, "parsed": 0, "unchanged": 0}
+        self._counter_lock = threading.Lock()
+        # Start the parse workers now: ProcessPoolExecutor forks them on first
+        # submit, which would otherwise happen from a fetch thread while other
+        # threads are mid-request
+        self._parsers = ProcessPoolExecutor(max_workers=processes)
+        self._parsers.submit(_start_worker).result()
+        self._fetchers = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scrape")
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._counter_lock:
+            self.counters[counter] += amount
+
+    def fetch(self, url: str):
+        """
+        One politely paced GET through the shared session, conditional if cached.
+
+        Returns (html, cached entry) -- html is None unless the page came back
+        200, or 304 with a cached body.
+        """
+        entry = self.cache.lookup(url) if self.cache is not None else None
+        self.limiter.wait(url)
+        try:
+            response = self.session.get(url, headers=PageCache.conditional_headers(entry), timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"  ✗ Error fetching {url}: {e}")
+            response = None
+
+        if response is not None and response.status_code == 304 and entry is not None:
+            self._count("not_modified")
+            return entry.body, entry
+        if response is None or response.status_code != 200:
+            self._count("failed")
+            return None, entry
+        self._count("fetched")
+        self._count("bytes", len(response.content))
+        if self.cache is not None:
+            self.cache.store(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response.text, entry
+
+    def _fetch_page(self, url: str, skip_unchanged: bool) -> Tuple[Page, Optional[str]]:
+        """The fetched page, unparsed, and the html still to parse (None if there's nothing to parse)"""
+        html, entry = self.fetch(url)
+        if html is None:
+            return Page(url, None, None, False, entry), None
+        sha256 = content_hash(html)
+        if skip_unchanged and entry is not None and entry.written_sha256 == sha256:
+            self._count("unchanged")
+            return Page(url, None, sha256, True, entry), None
+        return Page(url, None, sha256, False, entry), html
+
+    @staticmethod
+    def _settle(page_future: Future, source: Future, result: Callable[[Any], Any]):
+        """Complete page_future from a finished fetch/parse future: cancelled, failed, or result(value)"""
+        if page_future.done():
+            return
+        if source.cancelled():
+            page_future.cancel()
+        elif source.exception() is not None:
+            page_future.set_exception(source.exception())
+        else:
+            page_future.set_result(result(source.result()))
+
+    def _on_fetched(self, page_future: Future, fetched: Future):
+        if fetched.cancelled() or fetched.exception() is not None or fetched.result()[1] is None:
+            self._settle(page_future, fetched, lambda value: value[0])
+            return
+        page, html = fetched.result()
+        self._count("parsed")
+        try:
+            parsing = self._parsers.submit(self.parse, html)
+        except RuntimeError:  # the pool was shut down by an exceptional exit
+            page_future.cancel()
+            return
+        parsing.add_done_callback(lambda parsed: self._settle(page_future, parsed, lambda value: page._replace(parsed=value)))
+
+    def submit(self, url: str, skip_unchanged: bool = False) -> Future:
+        """
+        Queue a page; the Future resolves to a Page.
+
+        The fetch runs in the thread pool; the parse is chained onto it in the
+        process pool, so a fetch slot is free for the next page as soon as its
+        response is in. With skip_unchanged, a page whose body hash matches
+        the cache's written marker isn't parsed (Page.unchanged is True).
+        """
+        page_future: Future = Future()
+        fetched = self._fetchers.submit(self._fetch_page, url, skip_unchanged)
+        fetched.add_done_callback(lambda done: self._on_fetched(page_future, done))
+        return page_future
+
+    def close(self, cancel: bool = False):
+        """Shut down the pools; with cancel, queued pages that haven't started are dropped"""
+        self._fetchers.shutdown(wait=True, cancel_futures=cancel)
+        self._parsers.shutdown(wait=True, cancel_futures=cancel)
+        self.session.close()
+
+    def __enter__(self) -> "PageScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # On an error or Ctrl-C, don't wait for the rest of the queue to be fetched
+        self.close(cancel=exc_type is not None)
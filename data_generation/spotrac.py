@@ -1,14 +1,24 @@
 from argparse import ArgumentParser
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from bs4.element import Tag
 from datetime import datetime
-import requests
+import hashlib
+import json
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # Global flag for non-interactive mode (set via CLI)
 
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 from .log_stream import LogStream
+from .page_cache import PageCache
+from .scrape import DEFAULT_CONCURRENCY, DEFAULT_MIN_INTERVAL, PageScheduler
 from .records import Player, Salary, ReviewQueueItem
 from .save import write_players_to_file, write_contracts_to_file, read_players_from_file, read_contracts_from_file, write_review_queue_item
 from .player_lookup import (
@@ -33,8 +43,39 @@ PRE_ARB_EXTENSIONS_URL = "https://www.spotrac.com/mlb/contracts/extensions/_/yea
 ARB_EXTENSIONS_URL = "https://www.spotrac.com/mlb/contracts/extensions/_/year/{year}/type/arbitration-extension/"
 VETERAN_EXTENSIONS_URL = "https://www.spotrac.com/mlb/contracts/extensions/_/year/{year}/type/extension/"
 
-PLAYER_OBJECT_CACHE = {player.player_id: player for player in read_players_from_file()}
-CONTRACT_OBJECT_CACHE = {contract.contract_id: contract for contract in read_contracts_from_file()}
+# Every page scraped for a year, in write order: (url template, salary type)
+CONTRACT_PAGES = [
+    (PRE_ARB_URL, "pre-arb"),
+    (PRE_ARB_EXTENSIONS_URL, "pre-arb"),
+    (ARB_URL, "arb"),
+    (ARB_EXTENSIONS_URL, "arb"),
+    (FREE_AGENT_URL, "free-agent"),
+    (VETERAN_EXTENSIONS_URL, "free-agent"),
+]
+
+# Module-level caches of the players/contracts datasets - loaded on first use, not at import
+_PLAYER_OBJECT_CACHE: Optional[Dict[str, Player]] = None  # player_id -> Player
+_CONTRACT_OBJECT_CACHE: Optional[Dict[str, Salary]] = None  # contract_id -> Salary
+
+def get_player_object_cache() -> Dict[str, Player]:
+    """player_id -> Player for every player in the dataset (plus any scraped this run)"""
+    global _PLAYER_OBJECT_CACHE
+    if _PLAYER_OBJECT_CACHE is None:
+        _PLAYER_OBJECT_CACHE = {player.player_id: player for player in read_players_from_file()}
+    return _PLAYER_OBJECT_CACHE
+
+def get_contract_object_cache() -> Dict[str, Salary]:
+    """contract_id -> Salary for every contract in the dataset (plus any scraped this run)"""
+    global _CONTRACT_OBJECT_CACHE
+    if _CONTRACT_OBJECT_CACHE is None:
+        _CONTRACT_OBJECT_CACHE = {contract.contract_id: contract for contract in read_contracts_from_file()}
+    return _CONTRACT_OBJECT_CACHE
+
+def refresh_object_caches():
+    """Drop the player/contract caches; the next access reloads them from disk"""
+    global _PLAYER_OBJECT_CACHE, _CONTRACT_OBJECT_CACHE
+    _PLAYER_OBJECT_CACHE = None
+    _CONTRACT_OBJECT_CACHE = None
 
 LOG_STREAM = LogStream("SPOTRAC DATA GENERATION")
 
@@ -54,25 +95,93 @@ def _year_exists_in_dataset(year: int) -> bool:
 
     Returns True if year exists in dataset, False otherwise.
     """
-    for contract in CONTRACT_OBJECT_CACHE.values():
+    for contract in get_contract_object_cache().values():
         if contract.year == year:
             return True
     return False
 
-def fetch_spotrac_data(url: str) -> BeautifulSoup:
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-    if response.status_code == 200:
-        return BeautifulSoup(response.text, "html.parser")
-    return None
+class Cell(NamedTuple):
+    """A table cell's text and its first link, as parsed out of the page"""
+    text: str
+    href: Optional[str]
+
+class SpotracTable(NamedTuple):
+    headers: Dict[str, int]  # header name -> column index
+    rows: List[List[Cell]]
+
+if LXML_AVAILABLE:
+    # Compiled once: the same lookups as the BeautifulSoup path (first table, first thead/tbody in it)
+    _FIRST_TABLE = etree.XPath("(//table)[1]")
+    _HEADER_CELLS = etree.XPath("(.//thead)[1]//th")
+    _BODY_ROWS = etree.XPath("(.//tbody)[1]//tr")
+    _ROW_CELLS = etree.XPath(".//td")
+    _FIRST_HREF = etree.XPath("(.//a[@href])[1]/@href")
+
+# Only <table> subtrees are built when parsing with BeautifulSoup
+_TABLES_ONLY = SoupStrainer("table")
+
+def _header_key(text: str) -> str:
+    return sanitize_string(text).replace("$", " ").split(" ")[0].lower()
+
+def _parse_table_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> Optional[SpotracTable]:
+    table = BeautifulSoup(html, "html.parser", parse_only=parse_only).find("table")
+    if not table:
+        return None
+    body = table.find("tbody")
+    rows = []
+    for row in body.find_all("tr") if body else []:
+        cells = []
+        for column in row.find_all("td"):
+            link = column.find("a", href=True)
+            cells.append(Cell(column.get_text(), link["href"] if link else None))
+        rows.append(cells)
+    return SpotracTable(get_table_headers(table), rows)
+
+def _parse_table_lxml(html: str) -> Optional[SpotracTable]:
+    tables = _FIRST_TABLE(lxml_html.document_fromstring(html))
+    if not tables:
+        return None
+    table = tables[0]
+    headers = {_header_key(header.text_content()): i for i, header in enumerate(_HEADER_CELLS(table))}
+    rows = []
+    for row in _BODY_ROWS(table):
+        cells = []
+        for column in _ROW_CELLS(row):
+            href = _FIRST_HREF(column)
+            cells.append(Cell(str(column.text_content()), str(href[0]) if href else None))
+        rows.append(cells)
+    return SpotracTable(headers, rows)
+
+def parse_table(html: str) -> Optional[SpotracTable]:
+    """
+    The page's first table (the contracts table) as plain cells, or None if it has no table.
+
+    Pure and picklable so the scraping scheduler can run it in a worker process.
+    Uses lxml with precompiled XPath selectors when available, otherwise
+    BeautifulSoup restricted to <table> elements; both produce the same
+    cells as parsing the whole page with BeautifulSoup (_parse_table_soup).
+    """
+    if not html or not html.strip():
+        return None
+    if LXML_AVAILABLE:
+        try:
+            return _parse_table_lxml(html)
+        except (ValueError, etree.ParserError):
+            pass  # e.g. an XML encoding declaration in a str; the html.parser path copes
+    return _parse_table_soup(html, parse_only=_TABLES_ONLY)
+
+def table_hash(table: SpotracTable) -> str:
+    """Hash of a parsed table's headers and cells, independent of the markup around it"""
+    return hashlib.sha256(json.dumps([table.headers, table.rows]).encode("utf-8")).hexdigest()
 
 def sanitize_string(s: str) -> str:
     return s.replace("\n", "").strip()
 
-def get_player_id(columns: List[Tag], headers: Dict[str, int]) -> str:
-    name = sanitize_string(columns[headers['player']].get_text()).split(" ", 1)
+def get_player_id(columns: List[Cell], headers: Dict[str, int]) -> str:
+    name = sanitize_string(columns[headers['player']].text).split(" ", 1)
     if name[1].endswith("QO"):
         name[1] = name[1][:-2]  # Remove last two characters
-    spotrac_link = sanitize_string(columns[headers['player']].find("a")["href"])
+    spotrac_link = sanitize_string(columns[headers['player']].href)
     # Extract numeric ID from URL: .../id/5166/max-scherzer -> 5166
     link_id = spotrac_link.split("/id/")[1].split("/")[0]
 
@@ -217,29 +326,33 @@ def _queue_for_review(first_name: str, last_name: str, contract_year: int, spotr
     write_review_queue_item(item)
     print(f"  → Queued for review: {first_name} {last_name} ({contract_year})")
 
-def get_table_headers(table: Tag) -> List[str]:
-    LOG_STREAM.write( [ sanitize_string(header.get_text()).replace("$", " ").split(" ")[0].lower() for header in table.find("thead").find_all("th") ] )
-    return { sanitize_string(header.get_text()).replace("$", " ").split(" ")[0].lower() : i for i, header in enumerate(table.find("thead").find_all("th")) }
+def get_table_headers(table: Tag) -> Dict[str, int]:
+    head = table.find("thead")
+    return { _header_key(header.get_text()) : i for i, header in enumerate(head.find_all("th") if head else []) }
 
-def extract_player_data(row: Tag, headers: Dict[str, int], contract_year: int) -> Player:
-    columns = row.find_all('td')
-    name = sanitize_string(columns[headers['player']].get_text()).split(" ", 1)
+def _has_contract_value(columns: List[Cell], headers: Dict[str, int]) -> bool:
+    """False for rows without a contract value (N/A, blank or $0), which are skipped"""
+    value_str = sanitize_string(columns[headers['value']].text)
+    if value_str == 'N/A' or value_str == '':
+        return False
+    return (float(value_str.replace("$", "").replace(",", "")) / 1_000_000) != 0
+
+def extract_player_data(columns: List[Cell], headers: Dict[str, int], contract_year: int) -> Player:
+    name = sanitize_string(columns[headers['player']].text).split(" ", 1)
     if name[1].endswith("QO"):
         name[1] = name[1][:-2]  # Remove last two characters
     player_id = get_player_id(columns, headers)
 
     # if the player doesn't have a contract value, skip them
-    value_str = sanitize_string(columns[headers['value']].get_text())
-    if value_str == 'N/A' or value_str == '':
-        return None
-    if (float(value_str.replace("$", "").replace(",", "")) / 1_000_000) == 0:
+    if not _has_contract_value(columns, headers):
         return None
 
-    if player_id in PLAYER_OBJECT_CACHE:
+    player_cache = get_player_object_cache()
+    if player_id in player_cache:
         LOG_STREAM.write(f"Found player in cache: {player_id}")
-        return PLAYER_OBJECT_CACHE[player_id]
+        return player_cache[player_id]
 
-    spotrac_link = sanitize_string(columns[headers['player']].find("a")["href"])
+    spotrac_link = sanitize_string(columns[headers['player']].href)
     fangraphs_id = get_fangraphs_id(name[0], name[1], contract_year, spotrac_link)
     if fangraphs_id == -1:
         return None
@@ -249,7 +362,7 @@ def extract_player_data(row: Tag, headers: Dict[str, int], contract_year: int) -
         fangraphs_id=fangraphs_id,
         first_name=name[0],
         last_name=name[1],
-        position=sanitize_string(columns[headers['pos']].get_text()),
+        position=sanitize_string(columns[headers['pos']].text),
         spotrac_link=spotrac_link,
     )
 
@@ -258,19 +371,17 @@ def extract_player_data(row: Tag, headers: Dict[str, int], contract_year: int) -
 
     return player
 
-def extract_salary_data(row: Tag, player_obj: Player, year: int, salary_type: str, headers: Dict[str, int]) -> Salary:
-    columns = row.find_all('td')
-
-    value_str = sanitize_string(columns[headers['value']].get_text())
+def extract_salary_data(columns: List[Cell], player_obj: Player, year: int, salary_type: str, headers: Dict[str, int]) -> Salary:
+    value_str = sanitize_string(columns[headers['value']].text)
     if value_str == 'N/A':
         return None
 
     if 'type' in headers:
-        type_string = sanitize_string(columns[headers['type']].get_text())
+        type_string = sanitize_string(columns[headers['type']].text)
         if type_string == 'Estimate':
             return None
 
-    age = int(sanitize_string(columns[headers['age']].get_text())) if 'age' in headers else None
+    age = int(sanitize_string(columns[headers['age']].text)) if 'age' in headers else None
     # If age is not in Spotrac data, get it from FanGraphs stats
     if age is None:
         age = get_player_age_for_year(player_obj.fangraphs_id, year)
@@ -279,62 +390,72 @@ def extract_salary_data(row: Tag, player_obj: Player, year: int, salary_type: st
         contract_id=f"{player_obj.player_id}_{year}",
         player_id=player_obj.player_id,
         age=age,
-        service_time=float(sanitize_string(columns[headers['yos']].get_text())) if 'yos' in headers else None, # TODO: maybe calculate service time? Might not matter for free agents
+        service_time=float(sanitize_string(columns[headers['yos']].text)) if 'yos' in headers else None, # TODO: maybe calculate service time? Might not matter for free agents
         year=year,
-        duration=int(sanitize_string(columns[headers['yrs']].get_text())) if 'yrs' in headers else 1,
+        duration=int(sanitize_string(columns[headers['yrs']].text)) if 'yrs' in headers else 1,
         value=float(value_str.replace("$", "").replace(",", "")) / 1_000_000,
         type=salary_type
     )
 
-def get_records(url: str, year: int, salary_type: str) -> Tuple[List[Player], List[Salary]]:
-    soup = fetch_spotrac_data(url)
-    if not soup:
-        return [], []
-
+def records_from_table(table: Optional[SpotracTable], year: int, salary_type: str) -> Tuple[List[Player], List[Salary], int]:
+    """
+    Player and Salary records for a parsed table, plus the number of rows left
+    unresolved: rows with a contract value whose player couldn't be matched to
+    a FanGraphs ID (skipped, or queued for review in non-interactive mode).
+    """
     players, salaries = [], []
-    table = soup.find("table")
+    unresolved = 0
     if not table:
-        return players, salaries
-    headers = get_table_headers(table)
+        return players, salaries, unresolved
+    headers = table.headers
+    LOG_STREAM.write(list(headers))
     LOG_STREAM.write(headers)
-    for row in table.find("tbody").find_all("tr"):
-        player = extract_player_data(row, headers, year)
+    player_cache = get_player_object_cache()
+    contract_cache = get_contract_object_cache()
+    for columns in table.rows:
+        player = extract_player_data(columns, headers, year)
         if not player:
+            if _has_contract_value(columns, headers):
+                unresolved += 1
             continue
-        if player.player_id not in PLAYER_OBJECT_CACHE:
-            PLAYER_OBJECT_CACHE[player.player_id] = player
+        if player.player_id not in player_cache:
+            player_cache[player.player_id] = player
 
-        salary = extract_salary_data(row, player, year, salary_type, headers)
+        salary = extract_salary_data(columns, player, year, salary_type, headers)
         if not salary:
             continue
-        if salary.contract_id not in CONTRACT_OBJECT_CACHE:
-            CONTRACT_OBJECT_CACHE[salary.contract_id] = salary
+        if salary.contract_id not in contract_cache:
+            contract_cache[salary.contract_id] = salary
 
-        players.append(PLAYER_OBJECT_CACHE[player.player_id])
+        players.append(player_cache[player.player_id])
         if salary:
             salaries.append(salary)
 
-    return players, salaries
-
-def get_pre_arb_records(year: int) -> Tuple[List[Player], List[Salary]]:
-    settled = get_records(PRE_ARB_URL.format(year=year), year, "pre-arb")
-    extensions = get_records(PRE_ARB_EXTENSIONS_URL.format(year=year), year, "pre-arb")
-    return (settled[0]+extensions[0], settled[1]+extensions[1])
-
-def get_arb_records(year: int) -> Tuple[List[Player], List[Salary]]:
-    settled = get_records(ARB_URL.format(year=year), year, "arb")
-    extensions = get_records(ARB_EXTENSIONS_URL.format(year=year), year, "arb")
-    return (settled[0]+extensions[0], settled[1]+extensions[1])
-
-def get_free_agent_records(year: int) -> Tuple[List[Player], List[Salary]]:
-    contracts = get_records(FREE_AGENT_URL.format(year=year), year, "free-agent")
-    extensions = get_records(VETERAN_EXTENSIONS_URL.format(year=year), year, "free-agent")
-    return (contracts[0]+extensions[0], contracts[1]+extensions[1])
+    return players, salaries, unresolved
 
-def main(start_year, end_year=None, overwrite=False, non_interactive=False):
+def main(start_year, end_year=None, overwrite=False, non_interactive=False,
+         concurrency=DEFAULT_CONCURRENCY, min_interval=DEFAULT_MIN_INTERVAL, use_page_cache=True):
+    """
+    Scrape every contract page for the requested years and write them year by year.
+
+    Pages for all years are fetched concurrently and parsed in worker processes
+    (data_generation/scrape.py), but player resolution and writes happen here,
+    one year at a time in CONTRACT_PAGES order, so the output is the same as
+    scraping serially.
+
+    With the page cache (data_generation/page_cache.py), requests are
+    conditional, and for years already in the dataset a page is only parsed
+    if its body changed since it was last written, and only turned into
+    records if its table changed. A refresh with no contract activity is one
+    (usually 304) request per page and no writes. A page with rows whose
+    player couldn't be resolved (e.g. queued for review) isn't marked written,
+    so the next scrape reads it again and picks up contracts for players
+    resolved in the meantime. --overwrite skips nothing.
+    """
     global NON_INTERACTIVE
     NON_INTERACTIVE = non_interactive
 
+    years = []
     for year in range(start_year, end_year+1 if end_year else start_year+1):
         # Skip fetching if year already exists and is not the current year
         if not overwrite and _year_exists_in_dataset(year) and year != CURRENT_YEAR:
@@ -343,17 +464,63 @@ def main(start_year, end_year=None, overwrite=False, non_interactive=False):
             print(f"Skipping scrape for year {year}")
             print(f"{'='*60}\n")
             continue
-
-        pre_arb_players, pre_arb_salaries = get_pre_arb_records(year)
-        arb_players, arb_salaries = get_arb_records(year)
-        free_agent_players, free_agent_salaries = get_free_agent_records(year)
-        print(f"Year {year} Pre-Arb Players: {len(pre_arb_players)}")
-        print(f"Year {year} Arb Players: {len(arb_players)}")
-        print(f"Year {year} Free Agent Players: {len(free_agent_players)}")
-        print(f"Writing {year} records to file...")
-        write_players_to_file(pre_arb_players + arb_players + free_agent_players)
-        write_contracts_to_file(pre_arb_salaries + arb_salaries + free_agent_salaries)
-        print(f"Finished writing {year} records to file.")
+        years.append(year)
+    if not years:
+        return
+
+    cache = PageCache() if use_page_cache else None
+    # Unchanged pages can only be skipped if what they held is already in the dataset
+    skip_unchanged = {year: cache is not None and not overwrite and _year_exists_in_dataset(year) for year in years}
+    with PageScheduler(parse_table, concurrency=concurrency, min_interval=min_interval, cache=cache) as scheduler:
+        pages = {
+            year: [
+                (salary_type, scheduler.submit(url.format(year=year), skip_unchanged=skip_unchanged[year]))
+                for url, salary_type in CONTRACT_PAGES
+            ]
+            for year in years
+        }
+        for year in years:
+            records_by_type = {salary_type: ([], []) for _, salary_type in CONTRACT_PAGES}
+            written, changed = [], 0
+            for salary_type, future in pages[year]:
+                page = future.result()
+                if page.sha256 is None or page.unchanged:
+                    continue
+                digest = table_hash(page.parsed) if page.parsed else None
+                if skip_unchanged[year] and page.cached and page.cached.written_table_sha256 == digest:
+                    written.append((page.url, page.sha256, digest))
+                    continue  # markup changed, contracts didn't
+                changed += 1
+                players, salaries, unresolved = records_from_table(page.parsed, year, salary_type)
+                if unresolved:
+                    # Re-read this page next time, once those players may have been resolved
+                    print(f"⚠ {unresolved} player(s) on {page.url} unresolved; the page will be re-read next scrape")
+                else:
+                    written.append((page.url, page.sha256, digest))
+                records_by_type[salary_type][0].extend(players)
+                records_by_type[salary_type][1].extend(salaries)
+
+            if skip_unchanged[year] and not changed:
+                print(f"Year {year}: no changes on Spotrac since the last scrape, nothing to write.")
+            else:
+                pre_arb_players, pre_arb_salaries = records_by_type["pre-arb"]
+                arb_players, arb_salaries = records_by_type["arb"]
+                free_agent_players, free_agent_salaries = records_by_type["free-agent"]
+                print(f"Year {year} Pre-Arb Players: {len(pre_arb_players)}")
+                print(f"Year {year} Arb Players: {len(arb_players)}")
+                print(f"Year {year} Free Agent Players: {len(free_agent_players)}")
+                print(f"Writing {year} records to file...")
+                write_players_to_file(pre_arb_players + arb_players + free_agent_players)
+                write_contracts_to_file(pre_arb_salaries + arb_salaries + free_agent_salaries)
+                print(f"Finished writing {year} records to file.")
+            if cache is not None:
+                for url, sha256, digest in written:
+                    cache.mark_written(url, sha256, digest)
+
+        counters = scheduler.counters
+        print(f"Fetched {counters['fetched']} pages, {counters['not_modified']} not modified, "
+              f"{counters['failed']} failed; parsed {counters['parsed']}, skipped {counters['unchanged']} unchanged; "
+              f"{scheduler.limiter.waited_seconds:.1f}s spent waiting on the per-host rate limit")
 
 if __name__ == "__main__":
     args = ArgumentParser()
@@ -361,5 +528,11 @@ if __name__ == "__main__":
     args.add_argument("--end-year", type=int)
     args.add_argument("--overwrite", action="store_true", help="Force re-fetch of data even if year exists in dataset")
     args.add_argument("--non-interactive", action="store_true", help="Queue ambiguous players for review instead of prompting")
+    args.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Pages fetched at once")
+    args.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL,
+                      help="Minimum seconds between requests to spotrac.com")
+    args.add_argument("--no-page-cache", action="store_true",
+                      help="Fetch and parse every page in full, ignoring dataset/spotrac_pages")
     args = args.parse_args()
-    main(args.start_year, args.end_year, args.overwrite, args.non_interactive)
\ No newline at end of file
+    main(args.start_year, args.end_year, args.overwrite, args.non_interactive, args.concurrency, args.min_interval,
+         use_page_cache=not args.no_page_cache)
@@ -0,0 +1,265 @@
+"""
+SQLite Dataset Backend
+
+The same records save.py reads and writes, stored in one SQLite database
+(dataset/mlb_contracts.sqlite3) instead of flat CSVs. Selected with
+DATASET_BACKEND=sqlite; save.py's public functions dispatch here, so callers
+don't change.
+
+What the database buys over the CSVs:
+- Primary keys match each record's get_key() (contract_id for contracts), so
+  duplicates can't be written and upserts are index lookups, not file re-reads
+- Secondary indexes on player_id, year and type for the agent-side queries
+- WAL journaling, so data_generation writers can run while readers (the web
+  server, the agent) read a consistent snapshot
+
+Write semantics mirror the CSV writers: players, contracts and review queue
+items are insert-if-absent; stats records are inserted, or replaced only when
+the existing record is for CURRENT_YEAR (historical stats are final).
+
+Key functions:
+- read_players() / write_players(players, overwrite)
+- read_contracts() / write_contracts(contracts, overwrite)
+- read_stats(stats_type) / write_stats(stats_type, stats, overwrite)
+- read_review_queue() / write_review_queue_item(item) / remove_review_queue_item(item)
+- import_csv() / export_csv()
+
+Usage:
+    python -m data_generation.sqlite_store import   # load the CSVs into the database
+    python -m data_generation.sqlite_store export   # regenerate the CSVs from the database
+"""
+
+import json
+import os
+import sqlite3
+from argparse import ArgumentParser
+from contextlib import closing
+from dataclasses import fields
+from datetime import datetime
+from typing import List, Optional, Set, Union, get_args, get_origin, get_type_hints
+
+from .records import Player, Salary, BatterStats, PitcherStats, ReviewQueueItem
+from . import save
+
+DATABASE_FILE = os.environ.get("DATASET_DB_FILE", "dataset/mlb_contracts.sqlite3")
+
+# Seconds a writer waits on a lock held by another writer before failing
+BUSY_TIMEOUT_SECONDS = 30
+
+_STATS_TABLES = {BatterStats: "batter_stats", PitcherStats: "pitcher_stats"}
+_STATS_KEY_COLUMNS = ["player_id", "year", "window_years"]
+
+
+def _column_type(field_type) -> str:
+    """SQLite column affinity for a dataclass field annotation (Optional[X] -> X)"""
+    if get_origin(field_type) is Union:
+        field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+    return {int: "INTEGER", float: "REAL"}.get(field_type, "TEXT")
+
+
+def _stats_table_sql(stats_type, table: str) -> str:
+    hints = get_type_hints(stats_type)
+    columns = ",\n    ".join(f"{field.name} {_column_type(hints[field.name])}" for field in fields(stats_type))
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    {columns},
+    PRIMARY KEY (player_id, year, window_years)
+);
+CREATE INDEX IF NOT EXISTS idx_{table}_year ON {table}(year);
+"""
+
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    fangraphs_id INTEGER,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    spotrac_link TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_players_fangraphs_id ON players(fangraphs_id);
+
+CREATE TABLE IF NOT EXISTS contracts (
+    contract_id TEXT PRIMARY KEY,
+    player_id TEXT NOT NULL,
+    age INTEGER,
+    service_time REAL,
+    year INTEGER NOT NULL,
+    duration INTEGER,
+    value REAL,
+    type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contracts_player_id ON contracts(player_id);
+CREATE INDEX IF NOT EXISTS idx_contracts_year ON contracts(year);
+CREATE INDEX IF NOT EXISTS idx_contracts_type ON contracts(type);
+
+CREATE TABLE IF NOT EXISTS review_queue (
+    first_name TEXT,
+    last_name TEXT,
+    contract_year INTEGER,
+    spotrac_link TEXT,
+    candidates TEXT,
+    added_at TEXT,
+    PRIMARY KEY (first_name, last_name, contract_year)
+);
+""" + "".join(_stats_table_sql(stats_type, table) for stats_type, table in _STATS_TABLES.items())
+# Stats tables need no separate player_id index: it's the leading primary key column.
+
+_INITIALIZED: Set[str] = set()
+
+
+def connect(database_file: Optional[str] = None) -> sqlite3.Connection:
+    """Open the dataset database in WAL mode, creating the schema on first use"""
+    path = database_file or DATABASE_FILE
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if path not in _INITIALIZED:
+        conn.executescript(SCHEMA_SQL)
+        _INITIALIZED.add(path)
+    return conn
+
+
+def _field_names(record_type) -> List[str]:
+    return [field.name for field in fields(record_type)]
+
+
+def _insert_if_absent(table: str, columns: List[str], rows, overwrite: bool):
+    placeholders = ", ".join("?" for _ in columns)
+    with closing(connect()) as conn, conn:
+        if overwrite:
+            conn.execute(f"DELETE FROM {table}")
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            rows,
+        )
+
+
+def _select(table: str, columns: List[str]):
+    # rowid order = insertion order, matching the append order of the CSVs
+    with closing(connect()) as conn:
+        return conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid").fetchall()
+
+
+def write_players(players: List[Player], overwrite: bool = False):
+    columns = _field_names(Player)
+    _insert_if_absent("players", columns, ([getattr(p, c) for c in columns] for p in players), overwrite)
+
+
+def read_players() -> List[Player]:
+    return [Player(*row) for row in _select("players", _field_names(Player))]
+
+
+def write_contracts(contracts: List[Salary], overwrite: bool = False):
+    columns = _field_names(Salary)
+    _insert_if_absent("contracts", columns, ([getattr(c, name) for name in columns] for c in contracts), overwrite)
+
+
+def read_contracts() -> List[Salary]:
+    return [Salary(*row) for row in _select("contracts", _field_names(Salary))]
+
+
+def write_stats(stats_type, stats, overwrite: bool = False):
+    """
+    Upsert stats records: insert new keys, replace existing CURRENT_YEAR ones.
+
+    One statement per record against the primary key -- an O(log n) index
+    probe each, no matter how large the table is.
+    """
+    table = _STATS_TABLES[stats_type]
+    columns = _field_names(stats_type)
+    value_columns = [column for column in columns if column not in _STATS_KEY_COLUMNS]
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT ({', '.join(_STATS_KEY_COLUMNS)}) DO UPDATE SET "
+        + ", ".join(f"{column} = excluded.{column}" for column in value_columns)
+        + f" WHERE {table}.year = ?"
+    )
+    with closing(connect()) as conn, conn:
+        if overwrite:
+            conn.execute(f"DELETE FROM {table}")
+        conn.executemany(
+            sql,
+            ([getattr(stat, column) for column in columns] + [save.CURRENT_YEAR] for stat in stats),
+        )
+
+
+def read_stats(stats_type) -> list:
+    table = _STATS_TABLES[stats_type]
+    return [stats_type(*row) for row in _select(table, _field_names(stats_type))]
+
+
+def _review_queue_values(item: ReviewQueueItem) -> list:
+    return [
+        item.first_name,
+        item.last_name,
+        item.contract_year,
+        item.spotrac_link,
+        json.dumps(item.candidates),
+        item.added_at.strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+def write_review_queue_item(item: ReviewQueueItem):
+    _insert_if_absent("review_queue", save.REVIEW_QUEUE_HEADERS, [_review_queue_values(item)], overwrite=False)
+
+
+def read_review_queue() -> List[ReviewQueueItem]:
+    items = []
+    for first_name, last_name, contract_year, spotrac_link, candidates, added_at in _select(
+        "review_queue", save.REVIEW_QUEUE_HEADERS
+    ):
+        candidates_raw = json.loads(candidates) if candidates else {}
+        items.append(ReviewQueueItem(
+            first_name=first_name,
+            last_name=last_name,
+            contract_year=contract_year,
+            spotrac_link=spotrac_link,
+            candidates={int(k): v for k, v in candidates_raw.items()},
+            added_at=datetime.strptime(added_at, "%Y-%m-%d %H:%M:%S"),
+        ))
+    return items
+
+
+def remove_review_queue_item(item: ReviewQueueItem):
+    with closing(connect()) as conn, conn:
+        conn.execute(
+            "DELETE FROM review_queue WHERE first_name = ? AND last_name = ? AND contract_year = ?",
+            item.get_key(),
+        )
+
+
+def import_csv():
+    """Load every CSV dataset into the database (existing keys are kept)"""
+    write_players(save._read_players_csv())
+    write_contracts(save._read_contracts_csv())
+    write_stats(BatterStats, save._read_batter_stats_csv())
+    write_stats(PitcherStats, save._read_pitcher_stats_csv())
+    for item in save._read_review_queue_csv():
+        write_review_queue_item(item)
+
+
+def export_csv():
+    """Regenerate every CSV dataset from the database, in the CSV writers' formats"""
+    save._write_players_csv(read_players(), overwrite=True)
+    save._write_contracts_csv(read_contracts(), overwrite=True)
+    save._upsert_stats(save.BATTER_STATS_FILE, BatterStats, read_stats(BatterStats), overwrite=True)
+    save._upsert_stats(save.PITCHER_STATS_FILE, PitcherStats, read_stats(PitcherStats), overwrite=True)
+    save._rewrite_review_queue_csv(read_review_queue())
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Move datasets between the CSV files and the SQLite database")
+    parser.add_argument("command", choices=["import", "export"])
+    args = parser.parse_args()
+
+    if args.command == "import":
+        import_csv()
+        print(f"Imported CSV datasets into {DATABASE_FILE}")
+    else:
+        export_csv()
+        print(f"Exported {DATABASE_FILE} to CSV datasets")
@@ -1,12 +1,14 @@
-from pybaseball import batting_stats, pitching_stats, cache
+from collections import defaultdict
 from typing import Dict, List, Tuple
 from datetime import datetime
 import pandas as pd
 
 from data_generation.records import BatterStats, PitcherStats
 from data_generation.save import read_players_from_file, write_stats_to_file, read_batter_stats, read_pitcher_stats
-from data_generation.player_lookup import get_career_span_from_stats, get_all_fangraphs_ids
-from data_generation.fangraphs_search import get_active_players_for_year, is_player_active_in_year, get_career_span_from_fangraphs
+from data_generation.player_lookup import get_career_span_from_stats
+from data_generation.fangraphs_search import get_active_players_for_year, get_career_span_from_fangraphs
+from data_generation.leaderboards import join_leaderboard
+from data_generation.windows import WINDOW_SIZES, window_stats
 
 CURRENT_YEAR = datetime.now().year
 
@@ -124,15 +126,101 @@ def create_pitcher_stat_record(player_id: str, year: int, window_years: int, row
     )
 
 
-def assemble_stat_records(internal_player_id: str, fangraphs_player_id: str, start_year: int, end_year: int, existing_batter_stats: List[BatterStats], existing_pitcher_stats: List[PitcherStats]) -> Tuple[List[BatterStats], List[PitcherStats]]:
+def collect_season_rows(players: Dict[str, Tuple[int, int, int]]) -> Dict[str, pd.DataFrame]:
+    """
+    Collects the single-season leaderboard rows for every tracked player at once.
+
+    Each season's batting and pitching leaderboards are fetched once from the
+    leaderboard store (data_generation/leaderboards.py) and joined on IDfg
+    against every player whose career span covers that season.
+
+    Args:
+        players: Internal player ID -> (FanGraphs ID, first year, last year)
+
+    Returns:
+        "batting" / "pitching" -> leaderboard rows with player_id and Season
+        columns, in season order
     """
-    Collects both individual year stats and accumulated window stats for a player.
+    joined_by_group: Dict[str, List[pd.DataFrame]] = {"batting": [], "pitching": []}
+    if not players:
+        return {group: pd.DataFrame(columns=["player_id", "Season"]) for group in joined_by_group}
+
+    first_season = min(start for _, start, _ in players.values())
+    last_season = max(end for _, _, end in players.values())
+    print(f"Collecting individual year stats for {len(players)} players ({first_season}-{last_season})...")
 
-    Windows collected:
-    - Individual years: window_years=1
+    for year in range(first_season, last_season + 1):
+        active = {fangraphs_id: player_id for player_id, (fangraphs_id, start, end) in players.items() if start <= year <= end}
+        if not active:
+            continue
+        found = {}
+        for group in joined_by_group:
+            try:
+                joined = join_leaderboard(year, group, active)
+            except Exception as e:
+                print(f"  ✗ Error fetching {group} leaderboard for {year}: {e}")
+                continue
+            joined_by_group[group].append(joined.assign(Season=year))
+            found[group] = len(joined)
+        print(f"  {year}: {found.get('batting', 0)} batting, {found.get('pitching', 0)} pitching "
+              f"of {len(active)} active players")
+
+    return {
+        group: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["player_id", "Season"])
+        for group, frames in joined_by_group.items()
+    }
+
+
+def collect_stat_records(players: Dict[str, Tuple[int, int, int]]) -> Tuple[Dict[str, List[BatterStats]], Dict[str, List[PitcherStats]]]:
+    """
+    Collects individual year stats and accumulated window stats for every tracked player.
+
+    Windows collected (data_generation/windows.py):
     - 3-year windows: Recent performance
     - 5-year windows: Medium-term track record
-    - 10-year windows: Long-term success (max to avoid FanGraphs 500 error)
+    - 10-year windows: Long-term success
+
+    Window stats are aggregated locally from the single-season rows, so they
+    cost no requests beyond the per-season leaderboards.
+
+    Args:
+        players: Internal player ID -> (FanGraphs ID, first year, last year)
+
+    Returns:
+        Tuple of (batter_stats_by_player, pitcher_stats_by_player), each
+        player's single-year records in season order followed by their window
+        records by year and window
+    """
+    batter_stats_by_player: Dict[str, List[BatterStats]] = defaultdict(list)
+    pitcher_stats_by_player: Dict[str, List[PitcherStats]] = defaultdict(list)
+    season_rows = collect_season_rows(players)
+    spans = {player_id: (start, end) for player_id, (_, start, end) in players.items()}
+
+    print(f"\nAggregating accumulated stats (windows: {list(WINDOW_SIZES)})...")
+    for group, create_record, stats_by_player in (
+        ("batting", create_batter_stat_record, batter_stats_by_player),
+        ("pitching", create_pitcher_stat_record, pitcher_stats_by_player),
+    ):
+        rows = season_rows[group]
+        for row in rows.to_dict("records"):
+            stats_by_player[row["player_id"]].append(create_record(row["player_id"], int(row["Season"]), window_years=1, row=row))
+
+        windows = window_stats(rows, group, spans)
+        for row in windows.to_dict("records"):
+            stats_by_player[row["player_id"]].append(
+                create_record(row["player_id"], int(row["year"]), window_years=int(row["window_years"]), row=row)
+            )
+        print(f"  ✓ {len(windows)} {group} window records")
+
+    return batter_stats_by_player, pitcher_stats_by_player
+
+
+def assemble_stat_records(internal_player_id: str, fangraphs_player_id: str, start_year: int, end_year: int, existing_batter_stats: List[BatterStats], existing_pitcher_stats: List[PitcherStats]) -> Tuple[List[BatterStats], List[PitcherStats]]:
+    """
+    Collects both individual year stats and accumulated window stats for one player.
+
+    main() collects stats for every player in one pass instead; this is the
+    same pipeline for a single player.
 
     Args:
         internal_player_id: Your internal player ID
@@ -145,141 +233,32 @@ def assemble_stat_records(internal_player_id: str, fangraphs_player_id: str, sta
     Returns:
         Tuple of (batter_stats_list, pitcher_stats_list)
     """
-    # Skip fetching if player already in dataset and not playing in current year
-    # This clause operates on the assumption that if a player is in the dataset in any capacity, their full career has already been fetched
-    if _player_stats_exist(internal_player_id, existing_batter_stats, existing_pitcher_stats) and end_year != CURRENT_YEAR:
-        print(f"\n{'='*60}")
-        print(f"Stats already exist for {internal_player_id} (not playing in {CURRENT_YEAR})")
-        print(f"Skipping pybaseball fetch")
-        print(f"{'='*60}\n")
+    if _should_skip(internal_player_id, end_year, existing_batter_stats, existing_pitcher_stats):
         return [], []
 
-    # Note that we cannot for greater than 10 year windows due to a fangraphs limitation: https://github.com/jldbc/pybaseball/issues/492#issuecomment-3741471714
-    WINDOW_SIZES = [3, 5, 10]  # Different lookback periods for model
+    batting, pitching = collect_stat_records({internal_player_id: (fangraphs_player_id, start_year, end_year)})
+    return batting.get(internal_player_id, []), pitching.get(internal_player_id, [])
 
-    batter_stats_list = []
-    pitcher_stats_list = []
 
-    print(f"\n{'='*60}")
-    print(f"Processing {internal_player_id} (FanGraphs ID: {fangraphs_player_id})")
-    print(f"Career span: {start_year}-{end_year}")
-    print(f"{'='*60}\n")
-
-    # Step 1: Get individual year stats (window_years = 1)
-    # Track years where player has single-year stats (for window stats filtering)
-    years_with_batting_stats = set()
-    years_with_pitching_stats = set()
-
-    print("Collecting individual year stats...")
-    for year in range(start_year, end_year + 1):
-        try:
-            # Batting stats for this year
-            # qual=0: Include all players regardless of minimum appearance threshold
-            # Filtering for statistical relevance happens at model-building time
-            raw_batting_stats = batting_stats(year, qual=0)
-            player_batting = raw_batting_stats[raw_batting_stats['IDfg'] == fangraphs_player_id]
-
-            if not player_batting.empty:
-                print(f"  ✓ Found batting stats for {year}")
-                years_with_batting_stats.add(year)
-                batter_record = create_batter_stat_record(
-                    internal_player_id,
-                    year,
-                    window_years=1,
-                    row=player_batting.iloc[0]
-                )
-                batter_stats_list.append(batter_record)
-            else:
-                print(f"  - No batting stats for {year}")
-
-            # Pitching stats for this year
-            raw_pitching_stats = pitching_stats(year, qual=0)
-            player_pitching = raw_pitching_stats[raw_pitching_stats['IDfg'] == fangraphs_player_id]
-
-            if not player_pitching.empty:
-                print(f"  ✓ Found pitching stats for {year}")
-                years_with_pitching_stats.add(year)
-                pitcher_record = create_pitcher_stat_record(
-                    internal_player_id,
-                    year,
-                    window_years=1,
-                    row=player_pitching.iloc[0]
-                )
-                pitcher_stats_list.append(pitcher_record)
-            else:
-                print(f"  - No pitching stats for {year}")
-
-        except Exception as e:
-            print(f"  ✗ Error fetching year {year}: {e}")
-            continue
-
-    # Step 2: Get accumulated stats in rolling windows
-    # Only create window stats for years where single-year stats exist
-    print(f"\nCollecting accumulated stats (windows: {WINDOW_SIZES})...")
-
-    for year in range(start_year, end_year + 1):
-        for window in WINDOW_SIZES:
-            if year - window + 1 < start_year:
-                print(f"  - Skipping {window}yr window ending {year} (insufficient years played)")
-                continue  # Not enough years played yet for this window
-            window_start = max(start_year, year - window + 1)
-
-            # Only query if we have a valid range (at least 2 years)
-            if window_start >= year:
-                continue
-
-            try:
-                # Accumulated batting stats
-                # For current year: only create if player has single-year stats (avoid misleading windows)
-                # For historical years: always create (handles gap years like Tommy John)
-                if year != CURRENT_YEAR or year in years_with_batting_stats:
-                    raw_accumulated_batting = batting_stats(window_start, year, ind=0, qual=0)
-                    player_accumulated_batting = raw_accumulated_batting[
-                        raw_accumulated_batting['IDfg'] == fangraphs_player_id
-                    ]
-
-                    if not player_accumulated_batting.empty:
-                        print(f"  ✓ Found {window}yr batting window ending {year}")
-                        batter_record = create_batter_stat_record(
-                            internal_player_id,
-                            year,
-                            window_years=window,
-                            row=player_accumulated_batting.iloc[0]
-                        )
-                        batter_stats_list.append(batter_record)
-
-                # Accumulated pitching stats
-                # For current year: only create if player has single-year stats (avoid misleading windows)
-                # For historical years: always create (handles gap years like Tommy John)
-                if year != CURRENT_YEAR or year in years_with_pitching_stats:
-                    raw_accumulated_pitching = pitching_stats(window_start, year, ind=0, qual=0)
-                    player_accumulated_pitching = raw_accumulated_pitching[
-                        raw_accumulated_pitching['IDfg'] == fangraphs_player_id
-                    ]
-
-                    if not player_accumulated_pitching.empty:
-                        print(f"  ✓ Found {window}yr pitching window ending {year}")
-                        pitcher_record = create_pitcher_stat_record(
-                            internal_player_id,
-                            year,
-                            window_years=window,
-                            row=player_accumulated_pitching.iloc[0]
-                        )
-                        pitcher_stats_list.append(pitcher_record)
-
-            except Exception as e:
-                print(f"  ✗ Error fetching {window}yr window ending {year}: {e}")
-                continue
-
-    print(f"\nCompleted {internal_player_id}:")
-    print(f"  - {len(batter_stats_list)} batting records")
-    print(f"  - {len(pitcher_stats_list)} pitching records")
+def _should_skip(internal_player_id: str, end_year: int, existing_batter_stats: List[BatterStats], existing_pitcher_stats: List[PitcherStats]) -> bool:
+    """
+    Skip fetching if player already in dataset and not playing in current year.
 
-    return batter_stats_list, pitcher_stats_list
+    This clause operates on the assumption that if a player is in the dataset in any capacity, their full career has already been fetched
+    """
+    if _player_stats_exist(internal_player_id, existing_batter_stats, existing_pitcher_stats) and end_year != CURRENT_YEAR:
+        print(f"\n{'='*60}")
+        print(f"Stats already exist for {internal_player_id} (not playing in {CURRENT_YEAR})")
+        print(f"Skipping pybaseball fetch")
+        print(f"{'='*60}\n")
+        return True
+    return False
 
 
 def main():
     """Main execution: process all players with FanGraphs IDs"""
+    from pybaseball import cache
+
     # Clear stale cached data from previous runs to ensure fresh current-year stats
     print("Clearing pybaseball cache...")
     cache.purge()
@@ -300,6 +279,8 @@ def main():
     print(f"Starting stats collection for {total_players} players")
     print(f"{'='*60}\n")
 
+    # Step 1: Career span for every player, deciding who needs fetching
+    tracked: Dict[str, Tuple[int, int, int]] = {}
     for idx, fangraphs_id in enumerate(fg_player_ids.keys(), 1):
         internal_player_id = fg_player_ids.get(fangraphs_id)
 
@@ -315,50 +296,39 @@ def main():
 
             print(f"\n[{idx}/{total_players}] Processing player {internal_player_id}")
             print(f"Career: {mlb_played_first}-{mlb_played_last} (from local stats)")
-
-            player_batter_stats, player_pitching_stats = assemble_stat_records(
-                internal_player_id,
-                fangraphs_id,
-                mlb_played_first,
-                mlb_played_last,
-                existing_batter_stats,
-                existing_pitcher_stats
-            )
-
-            if not player_batter_stats and not player_pitching_stats:
-                print(f"⚠ No new stats to write for {internal_player_id}")
-                continue
-            print(f"Writing records to file...")
-            write_stats_to_file(player_batter_stats, player_pitching_stats)
-            print(f"✓ Completed {internal_player_id}")
         else:
             # No local stats - try to get career span from FanGraphs
             print(f"\n[{idx}/{total_players}] No local stats for {internal_player_id}")
             print(f"Searching FanGraphs for career span...")
 
             career_span = get_career_span_from_fangraphs(fangraphs_id)
-
-            if career_span:
-                mlb_played_first, mlb_played_last = career_span
-                print(f"Career: {mlb_played_first}-{mlb_played_last} (from FanGraphs)")
-
-                player_batter_stats, player_pitching_stats = assemble_stat_records(
-                    internal_player_id,
-                    fangraphs_id,
-                    mlb_played_first,
-                    mlb_played_last,
-                    existing_batter_stats,
-                    existing_pitcher_stats
-                )
-
-                if player_batter_stats or player_pitching_stats:
-                    print(f"Writing records to file...")
-                    write_stats_to_file(player_batter_stats, player_pitching_stats)
-                    print(f"✓ Completed {internal_player_id}")
-                else:
-                    print(f"⚠ No stats found for {internal_player_id}")
-            else:
+            if not career_span:
                 print(f"⚠ Could not determine career span for FanGraphs ID {fangraphs_id} ({internal_player_id})")
+                continue
+            mlb_played_first, mlb_played_last = career_span
+            print(f"Career: {mlb_played_first}-{mlb_played_last} (from FanGraphs)")
+
+        if _should_skip(internal_player_id, mlb_played_last, existing_batter_stats, existing_pitcher_stats):
+            continue
+        tracked[internal_player_id] = (fangraphs_id, mlb_played_first, mlb_played_last)
+
+    # Step 2: Individual year and window stats for every tracked player, one leaderboard per (season, group)
+    print(f"\n{'='*60}")
+    all_batting, all_pitching = collect_stat_records(tracked)
+
+    # Step 3: Write one player at a time
+    for idx, (internal_player_id, (fangraphs_id, mlb_played_first, mlb_played_last)) in enumerate(tracked.items(), 1):
+        player_batter_stats = all_batting.get(internal_player_id, [])
+        player_pitching_stats = all_pitching.get(internal_player_id, [])
+        print(f"\n[{idx}/{len(tracked)}] {internal_player_id} (FanGraphs ID: {fangraphs_id}), career {mlb_played_first}-{mlb_played_last}: "
+              f"{len(player_batter_stats)} batting records, {len(player_pitching_stats)} pitching records")
+
+        if not player_batter_stats and not player_pitching_stats:
+            print(f"⚠ No new stats to write for {internal_player_id}")
+            continue
+        print(f"Writing records to file...")
+        write_stats_to_file(player_batter_stats, player_pitching_stats)
+        print(f"✓ Completed {internal_player_id}")
 
     print(f"\n{'='*60}")
     print(f"Stats collection complete!")
@@ -366,6 +336,8 @@ def main():
 
 
 if __name__ == "__main__":
+    from pybaseball import cache
+
     print("Enabling pybaseball cache...")
     cache.enable()
     main()
\ No newline at end of file
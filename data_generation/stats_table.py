@@ -0,0 +1,350 @@
+"""
+Compact Stats Table
+
+A struct-of-arrays container for a full BatterStats/PitcherStats dataset.
+read_batter_stats()/read_pitcher_stats() build one dataclass per row, each
+with its own attribute storage and boxed float values -- ~800 bytes a row,
+~17MB for the 21k-row pitcher_stats.csv. StatsTable keeps one numpy array per
+field instead, ~2.5MB for the same file:
+
+- player_id as int32 codes into a list of unique ids
+- int fields in the narrowest signed dtype that holds them, with the dtype's
+  minimum value as the missing-value sentinel
+- float fields as float32 plus a decimal scale when rounding the float32 back
+  to that many decimals reproduces every value exactly (the stats are
+  published to a few decimals), otherwise as float64; NaN means missing
+
+Rows are exposed through StatsRow, a __slots__ view with the same attribute
+names and get_key()/is_single_year()/is_accumulated() as the dataclasses, so
+code written against the records (join._get_all_window_stats) works unchanged.
+Values read back exactly as the record readers return them, with None for
+missing. get(key) is a hash lookup on player_id plus a binary search over that
+player's (year, window_years) keys.
+
+Tables are read-only; writers keep using the record lists in save.py.
+
+Key functions:
+- read_stats_table(stats_type) -> StatsTable
+- StatsTable.from_records(stats_type, records) / StatsTable.from_arrow(stats_type, table)
+- StatsTable.get(key) -> Optional[StatsRow]
+- StatsTable.year_spans(window_years=1) -> Dict[str, Tuple[int, int]]
+"""
+
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+import numpy as np
+
+from .records import BatterStats, PitcherStats, Stats
+from . import columnar, save
+
+_DATASET_NAMES = {BatterStats: "batter_stats", PitcherStats: "pitcher_stats"}
+
+# Most decimals tried when looking for an exact float32 encoding of a column
+_MAX_DECIMALS = 6
+
+
+def _field_kind(field_type) -> type:
+    """int or float for a stats field annotation (Optional[X] -> X)"""
+    if get_origin(field_type) is Union:
+        field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+    return field_type
+
+
+def _encode_int(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Narrowest signed int array holding `values`, with iinfo.min marking invalid rows"""
+    present = values[valid]
+    low = int(present.min()) if len(present) else 0
+    high = int(present.max()) if len(present) else 0
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min < low and high <= info.max:
+            break
+    encoded = values.astype(dtype)
+    encoded[~valid] = np.iinfo(dtype).min
+    return encoded
+
+
+def _encode_float(values: np.ndarray) -> Tuple[np.ndarray, Optional[int]]:
+    """(array, decimals): float32 + decimals if that round-trips exactly, else float64 + None"""
+    narrow = values.astype(np.float32)
+    widened = narrow.astype(np.float64)
+    missing = np.isnan(values)
+    for decimals in range(_MAX_DECIMALS + 1):
+        decoded = np.round(widened, decimals)
+        if np.array_equal(decoded[~missing], values[~missing]):
+            return narrow, decimals
+    return values, None
+
+
+class StatsRow:
+    """Read-only view of one row of a StatsTable, shaped like a Stats record"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "StatsTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        return self._table._value(name, self._index)
+
+    def get_key(self) -> Tuple[str, int, int]:
+        return (self.player_id, self.year, self.window_years)
+
+    def is_single_year(self) -> bool:
+        return self.window_years == 1
+
+    def is_accumulated(self) -> bool:
+        return self.window_years > 1
+
+    def to_record(self) -> Stats:
+        """Materialize the row as its BatterStats/PitcherStats dataclass"""
+        return self._table.stats_type(**{name: getattr(self, name) for name in self._table.field_names})
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, StatsRow):
+            return self.to_record() == other.to_record()
+        if isinstance(other, Stats):
+            return self.to_record() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"StatsRow({self.to_record()!r})"
+
+
+class StatsTable:
+    """Columnar, read-only collection of BatterStats or PitcherStats rows"""
+
+    def __init__(
+        self,
+        stats_type,
+        player_ids: List[str],
+        player_codes: np.ndarray,
+        int_columns: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        float_columns: Dict[str, np.ndarray],
+    ):
+        """
+        Args:
+            stats_type: BatterStats or PitcherStats
+            player_ids: Unique player ids; player_codes index into it
+            player_codes: Per-row index into player_ids
+            int_columns: field -> (values, valid mask) for int fields
+            float_columns: field -> float64 values (NaN = missing) for float fields
+        """
+        self.stats_type = stats_type
+        self.field_names = [field.name for field in fields(stats_type)]
+        self._player_ids = player_ids
+        self._player_codes = player_codes.astype(np.int32)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._decimals: Dict[str, Optional[int]] = {}
+
+        for name, (values, valid) in int_columns.items():
+            self._columns[name] = _encode_int(values, valid)
+        for name, values in float_columns.items():
+            self._columns[name], self._decimals[name] = _encode_float(values)
+        for array in [self._player_codes, *self._columns.values()]:
+            array.flags.writeable = False
+
+        self._code_by_player: Optional[Dict[str, int]] = None
+        self._sorted_keys: Optional[np.ndarray] = None
+        self._sorted_rows: Optional[np.ndarray] = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, stats_type, records: Iterable[Stats]) -> "StatsTable":
+        """Build a table from BatterStats/PitcherStats records"""
+        records = list(records)
+        hints = get_type_hints(stats_type)
+
+        code_by_player: Dict[str, int] = {}
+        codes = np.fromiter(
+            (code_by_player.setdefault(record.player_id, len(code_by_player)) for record in records),
+            dtype=np.int32,
+            count=len(records),
+        )
+
+        int_columns = {}
+        float_columns = {}
+        for field in fields(stats_type):
+            name = field.name
+            if name == "player_id":
+                continue
+            values = [getattr(record, name) for record in records]
+            if _field_kind(hints[name]) is float:
+                float_columns[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                valid = np.array([v is not None for v in values], dtype=bool)
+                int_columns[name] = (np.array([0 if v is None else v for v in values], dtype=np.int64), valid)
+
+        return cls(stats_type, list(code_by_player), codes, int_columns, float_columns)
+
+    @classmethod
+    def from_arrow(cls, stats_type, table) -> "StatsTable":
+        """Build a table from a pyarrow Table with the dataset's schema (see columnar.py)"""
+        import pyarrow as pa
+
+        hints = get_type_hints(stats_type)
+        encoded = table.column("player_id").combine_chunks().dictionary_encode()
+        codes = encoded.indices.to_numpy(zero_copy_only=False)
+        player_ids = encoded.dictionary.to_pylist()
+
+        int_columns = {}
+        float_columns = {}
+        for field in fields(stats_type):
+            name = field.name
+            if name == "player_id":
+                continue
+            column = table.column(name).combine_chunks()
+            if _field_kind(hints[name]) is float:
+                float_columns[name] = column.cast(pa.float64()).to_numpy(zero_copy_only=False)
+            else:
+                values = column.fill_null(0).cast(pa.int64()).to_numpy(zero_copy_only=False)
+                int_columns[name] = (values, column.is_valid().to_numpy(zero_copy_only=False))
+
+        return cls(stats_type, player_ids, codes, int_columns, float_columns)
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._player_codes)
+
+    def __getitem__(self, index: int) -> StatsRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StatsTable index out of range")
+        return StatsRow(self, index)
+
+    def __iter__(self) -> Iterator[StatsRow]:
+        for index in range(len(self)):
+            yield StatsRow(self, index)
+
+    def _value(self, name: str, index: int):
+        if name == "player_id":
+            return self._player_ids[self._player_codes[index]]
+        column = self._columns.get(name)
+        if column is None:
+            raise AttributeError(f"{self.stats_type.__name__} has no field {name!r}")
+        value = column[index]
+        if column.dtype.kind == "f":
+            if np.isnan(value):
+                return None
+            decimals = self._decimals[name]
+            if decimals is None:
+                return float(value)
+            return float(np.round(np.float64(value), decimals))
+        if value == np.iinfo(column.dtype).min:
+            return None
+        return int(value)
+
+    def _packed_keys(self) -> np.ndarray:
+        # year and window_years each fit in 16 bits
+        return (
+            (self._player_codes.astype(np.int64) << 32)
+            | (self._columns["year"].astype(np.int64) << 16)
+            | self._columns["window_years"].astype(np.int64)
+        )
+
+    def _build_index(self):
+        self._code_by_player = {player_id: code for code, player_id in enumerate(self._player_ids)}
+        packed = self._packed_keys()
+        # Stable sort keeps repeated keys in file order, so the last one sits rightmost
+        order = np.argsort(packed, kind="stable")
+        self._sorted_keys = packed[order]
+        self._sorted_rows = order.astype(np.int32)
+
+    def get(self, key: Tuple[str, int, int], default=None) -> Optional[StatsRow]:
+        """
+        Row for a (player_id, year, window_years) key, like dict.get.
+
+        If the dataset repeats a key, the last row wins -- the same result as
+        building {stat.get_key(): stat for stat in records}.
+        """
+        if self._code_by_player is None:
+            self._build_index()
+        player_id, year, window_years = key
+        code = self._code_by_player.get(player_id)
+        if code is None:
+            return default
+        packed = (code << 32) | (year << 16) | window_years
+        position = int(np.searchsorted(self._sorted_keys, packed, side="right")) - 1
+        if position < 0 or self._sorted_keys[position] != packed:
+            return default
+        return StatsRow(self, int(self._sorted_rows[position]))
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def to_records(self) -> List[Stats]:
+        return [row.to_record() for row in self]
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        A field's values as an array: float fields decoded to float64 (NaN =
+        missing), int fields as stored (see valid() for missing rows).
+        """
+        if name == "player_id":
+            return np.asarray(self._player_ids, dtype=object)[self._player_codes]
+        column = self._columns[name]
+        if column.dtype.kind == "f" and self._decimals[name] is not None:
+            return np.round(column.astype(np.float64), self._decimals[name])
+        return column
+
+    def valid(self, name: str) -> np.ndarray:
+        """Boolean mask of rows where a field has a value"""
+        column = self._columns[name]
+        if column.dtype.kind == "f":
+            return ~np.isnan(column)
+        return column != np.iinfo(column.dtype).min
+
+    def year_spans(self, window_years: int = 1) -> Dict[str, Tuple[int, int]]:
+        """(first year, last year) per player, over rows with the given window size"""
+        selected = self._columns["window_years"] == window_years
+        codes = self._player_codes[selected]
+        years = self._columns["year"][selected].astype(np.int32)
+        first = np.full(len(self._player_ids), np.iinfo(np.int32).max, dtype=np.int32)
+        last = np.full(len(self._player_ids), np.iinfo(np.int32).min, dtype=np.int32)
+        np.minimum.at(first, codes, years)
+        np.maximum.at(last, codes, years)
+        return {
+            self._player_ids[code]: (int(first[code]), int(last[code]))
+            for code in np.unique(codes).tolist()
+        }
+
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (excluding player id strings and the key index)"""
+        return self._player_codes.nbytes + sum(array.nbytes for array in self._columns.values())
+
+
+def read_stats_table(stats_type) -> StatsTable:
+    """
+    Load a full stats dataset as a StatsTable.
+
+    Reads through the columnar store (Parquet when fresh, else a typed CSV
+    parse) when pyarrow is available; otherwise, or on the SQLite backend,
+    builds the table from save.py's record readers.
+    """
+    if save.DATASET_BACKEND == "csv" and columnar.COLUMNAR_AVAILABLE:
+        return StatsTable.from_arrow(stats_type, columnar.read_table(_DATASET_NAMES[stats_type]))
+    reader = save.read_batter_stats if stats_type is BatterStats else save.read_pitcher_stats
+    return StatsTable.from_records(stats_type, reader())
+
+
+def read_batter_stats_table() -> StatsTable:
+    return read_stats_table(BatterStats)
+
+
+def read_pitcher_stats_table() -> StatsTable:
+    return read_stats_table(PitcherStats)
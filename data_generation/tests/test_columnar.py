@@ -0,0 +1,81 @@
+"""Tests for the Parquet copies of the CSV datasets."""
+
+import os
+
+import pytest
+
+from data_generation import columnar
+
+pytest.importorskip("pyarrow")
+
+CONTRACTS_CSV = """contract_id,player_id,age,service_time,year,duration,value,type
+A_1_2020,A_1,25,1.1,2020,1,0.6,pre-arb
+B_2_2021,B_2,31,-1,2021,3,30.0,free-agent
+C_3_2021,C_3,-1,-1,2021,1,0.7,pre-arb
+"""
+
+
+@pytest.fixture
+def contracts_csv(tmp_path):
+    path = tmp_path / "contracts.csv"
+    path.write_text(CONTRACTS_CSV)
+    return str(path)
+
+
+def _append_row(path, row):
+    with open(path, "a") as f:
+        f.write(row + "\n")
+
+
+class TestFreshness:
+    def test_unconverted_is_not_fresh(self, contracts_csv):
+        assert not columnar.is_fresh("contracts", contracts_csv)
+
+    def test_convert_then_read_uses_parquet(self, contracts_csv, monkeypatch):
+        path = columnar.convert_dataset("contracts", contracts_csv)
+        assert path == columnar.parquet_path(contracts_csv) and os.path.isfile(path)
+        assert columnar.is_fresh("contracts", contracts_csv)
+        monkeypatch.setattr(columnar, "_read_csv_table", lambda *args: pytest.fail("CSV parsed"))
+        assert columnar.read_table("contracts", csv_path=contracts_csv).num_rows == 3
+
+    def test_touched_csv_falls_back_to_csv(self, contracts_csv):
+        columnar.convert_dataset("contracts", contracts_csv)
+        stat = os.stat(contracts_csv)
+        os.utime(contracts_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert not columnar.is_fresh("contracts", contracts_csv)
+
+    def test_appended_csv_falls_back_to_csv(self, contracts_csv):
+        columnar.convert_dataset("contracts", contracts_csv)
+        _append_row(contracts_csv, "D_4_2022,D_4,27,3.0,2022,1,4.5,arb")
+        assert not columnar.is_fresh("contracts", contracts_csv)
+        table = columnar.read_table("contracts", csv_path=contracts_csv)
+        assert table.column("contract_id").to_pylist()[-1] == "D_4_2022"
+
+    def test_deleted_csv_is_not_fresh(self, contracts_csv):
+        columnar.convert_dataset("contracts", contracts_csv)
+        os.remove(contracts_csv)
+        assert not columnar.is_fresh("contracts", contracts_csv)
+        assert columnar.read_table("contracts", csv_path=contracts_csv).num_rows == 0
+
+
+class TestRead:
+    @pytest.mark.parametrize("converted", [False, True])
+    def test_projection(self, contracts_csv, converted):
+        if converted:
+            columnar.convert_dataset("contracts", contracts_csv)
+        table = columnar.read_table("contracts", columns=["player_id", "value"], csv_path=contracts_csv)
+        assert table.column_names == ["player_id", "value"]
+        assert table.column("value").to_pylist() == [0.6, 30.0, 0.7]
+
+    @pytest.mark.parametrize("converted", [False, True])
+    def test_contract_sentinels_are_null(self, contracts_csv, converted):
+        if converted:
+            columnar.convert_dataset("contracts", contracts_csv)
+        table = columnar.read_table("contracts", csv_path=contracts_csv)
+        assert table.column("age").to_pylist() == [25, 31, None]
+        assert table.column("service_time").to_pylist() == [1.1, None, None]
+        assert table.schema.field("age").type == columnar.pa.int32()
+
+    def test_missing_dataset_is_empty_with_schema(self, tmp_path):
+        table = columnar.read_table("contracts", columns=["age"], csv_path=str(tmp_path / "none.csv"))
+        assert table.num_rows == 0 and table.column_names == ["age"]
@@ -0,0 +1,88 @@
+"""Tests for the season leaderboard store."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from data_generation import leaderboards
+
+CURRENT = 2025
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    """(season, group) of every _download call; each download returns a two-player board"""
+    calls = []
+
+    def download(season, group):
+        calls.append((season, group))
+        return pd.DataFrame({
+            "IDfg": [101, 202], "Name": ["Ann Able", "Bob Baker"], "Season": [season, season], "G": [10 + len(calls), 20],
+        })
+
+    monkeypatch.setattr(leaderboards, "_download", download)
+    monkeypatch.setattr(leaderboards, "LEADERBOARD_DIR", str(tmp_path / "leaderboards"))
+    monkeypatch.setattr(leaderboards, "CURRENT_YEAR", CURRENT)
+    leaderboards.clear_leaderboards()
+    yield calls
+    leaderboards.clear_leaderboards()
+
+
+class TestGetLeaderboard:
+    def test_completed_season_downloaded_once_and_reread_from_disk(self, downloads):
+        first = leaderboards.get_leaderboard(2023, "batting")
+        assert leaderboards.get_leaderboard(2023, "batting") is first
+        assert os.path.isfile(leaderboards._leaderboard_path(2023, "batting"))
+
+        leaderboards.clear_leaderboards()
+        reread = leaderboards.get_leaderboard(2023, "batting")
+        assert downloads == [(2023, "batting")]
+        pd.testing.assert_frame_equal(reread, first)
+
+    def test_current_season_never_read_from_disk(self, downloads):
+        leaderboards.get_leaderboard(CURRENT, "pitching")
+        assert not os.path.exists(leaderboards._leaderboard_path(CURRENT, "pitching"))
+        # Even a stale copy on disk is ignored
+        leaderboards._save(pd.DataFrame({"IDfg": [999]}), leaderboards._leaderboard_path(CURRENT, "pitching"))
+        leaderboards.clear_leaderboards()
+        board = leaderboards.get_leaderboard(CURRENT, "pitching")
+        assert downloads == [(CURRENT, "pitching"), (CURRENT, "pitching")]
+        assert list(board["IDfg"]) == [101, 202]
+
+    def test_refresh_downloads_again_and_drops_name_index(self, downloads):
+        index = leaderboards.get_name_index(2023, "batting")
+        assert index[("ann", "able")] == [(101, "Ann Able")]
+        refreshed = leaderboards.get_leaderboard(2023, "batting", refresh=True)
+        assert (2023, "batting") not in leaderboards._NAME_INDEXES
+        assert downloads == [(2023, "batting"), (2023, "batting")]
+        assert list(refreshed["G"]) == [12, 20]
+        assert leaderboards.get_name_index(2023, "batting") is not index
+
+    def test_unknown_group(self, downloads):
+        with pytest.raises(ValueError):
+            leaderboards.get_leaderboard(2023, "fielding")
+
+
+class TestJoinLeaderboard:
+    def test_joins_tracked_players(self, downloads):
+        joined = leaderboards.join_leaderboard(2023, "batting", {202: "Baker_2", 303: "Cole_3"})
+        assert list(joined["IDfg"]) == [202]
+        assert list(joined["player_id"]) == ["Baker_2"]
+
+    def test_non_numeric_and_duplicate_idfg(self, downloads, monkeypatch):
+        board = pd.DataFrame({"IDfg": ["101", "sa3011", "101", None], "Name": ["A", "B", "A again", "C"]})
+        monkeypatch.setattr(leaderboards, "_download", lambda season, group: board)
+        joined = leaderboards.join_leaderboard(2023, "batting", {101: "Able_1"})
+        assert list(joined["IDfg"]) == [101]
+        assert list(joined["Name"]) == ["A"]
+        assert list(joined["player_id"]) == ["Able_1"]
+
+    def test_empty_board(self, downloads, monkeypatch):
+        monkeypatch.setattr(leaderboards, "_download", lambda season, group: pd.DataFrame())
+        joined = leaderboards.join_leaderboard(2023, "batting", {101: "Able_1"})
+        assert joined.empty and "player_id" in joined.columns
+
+    def test_no_players(self, downloads):
+        joined = leaderboards.join_leaderboard(2023, "batting", {})
+        assert joined.empty and "player_id" in joined.columns
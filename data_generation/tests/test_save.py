@@ -0,0 +1,81 @@
+"""Tests for the stats CSV upsert path."""
+
+import csv
+
+import pytest
+
+from data_generation import save
+from data_generation.records import PitcherStats
+
+CURRENT = 2025
+PAST = 2023
+
+
+@pytest.fixture(autouse=True)
+def current_year(monkeypatch):
+    monkeypatch.setattr(save, "CURRENT_YEAR", CURRENT)
+    save._STATS_KEY_INDEX.clear()
+    yield
+    save._STATS_KEY_INDEX.clear()
+
+
+@pytest.fixture
+def stats_csv(tmp_path):
+    return str(tmp_path / "pitcher_stats.csv")
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return {(row["player_id"], int(row["year"]), int(row["window_years"])): row for row in csv.DictReader(f)}
+
+
+class TestUpsertStats:
+    def test_inserts_new_keys(self, stats_csv):
+        save._upsert_stats(stats_csv, PitcherStats, [PitcherStats("A_1", PAST, 1, games=30),
+                                                     PitcherStats("A_1", CURRENT, 1, games=5)])
+        rows = _rows(stats_csv)
+        assert set(rows) == {("A_1", PAST, 1), ("A_1", CURRENT, 1)}
+        assert rows[("A_1", PAST, 1)]["games"] == "30"
+
+    def test_updates_current_year_and_keeps_completed_seasons(self, stats_csv):
+        save._upsert_stats(stats_csv, PitcherStats, [PitcherStats("A_1", PAST, 1, games=30, era=3.5),
+                                                     PitcherStats("A_1", CURRENT, 1, games=5, era=2.0)])
+        save._upsert_stats(stats_csv, PitcherStats, [PitcherStats("A_1", PAST, 1, games=99, era=9.9),
+                                                     PitcherStats("A_1", CURRENT, 1, games=6, era=2.5),
+                                                     PitcherStats("B_2", CURRENT, 1, games=1)])
+        rows = _rows(stats_csv)
+        assert (rows[("A_1", PAST, 1)]["games"], rows[("A_1", PAST, 1)]["era"]) == ("30", "3.5")
+        assert (rows[("A_1", CURRENT, 1)]["games"], rows[("A_1", CURRENT, 1)]["era"]) == ("6", "2.5")
+        assert rows[("B_2", CURRENT, 1)]["games"] == "1"
+
+    def test_rewrite_maps_existing_rows_by_column_name(self, stats_csv):
+        save._upsert_stats(stats_csv, PitcherStats, [PitcherStats("A_1", PAST, 1, games=30, era=3.5),
+                                                     PitcherStats("A_1", CURRENT, 1, games=5)])
+        with open(stats_csv, newline="") as f:
+            reader = csv.reader(f)
+            headers = next(reader)
+            body = list(reader)
+        # Same data, columns in a different order than the dataclass
+        order = list(reversed(range(len(headers))))
+        with open(stats_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([headers[i] for i in order])
+            writer.writerows([row[i] for i in order] for row in body)
+        save._STATS_KEY_INDEX.clear()
+
+        save._upsert_stats(stats_csv, PitcherStats, [PitcherStats("A_1", CURRENT, 1, games=6)])
+        with open(stats_csv, newline="") as f:
+            assert next(csv.reader(f)) == save._get_dataclass_headers(PitcherStats)
+        rows = _rows(stats_csv)
+        assert (rows[("A_1", PAST, 1)]["games"], rows[("A_1", PAST, 1)]["era"]) == ("30", "3.5")
+        assert rows[("A_1", CURRENT, 1)]["games"] == "6"
+
+    @pytest.mark.parametrize("overwrite", [False, True])
+    def test_batch_duplicates_resolve_the_same_with_and_without_overwrite(self, stats_csv, overwrite):
+        save._upsert_stats(stats_csv, PitcherStats, [PitcherStats("A_1", PAST, 1, games=30),
+                                                     PitcherStats("A_1", PAST, 1, games=31),
+                                                     PitcherStats("A_1", CURRENT, 1, games=5),
+                                                     PitcherStats("A_1", CURRENT, 1, games=6)], overwrite=overwrite)
+        rows = _rows(stats_csv)
+        assert rows[("A_1", PAST, 1)]["games"] == "30"
+        assert rows[("A_1", CURRENT, 1)]["games"] == "6"
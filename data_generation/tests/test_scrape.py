@@ -0,0 +1,150 @@
+"""Tests for the page scraping scheduler."""
+
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+import requests
+
+from data_generation import scrape
+from data_generation.page_cache import PageCache
+from data_generation.scrape import HostRateLimiter, PageScheduler
+
+
+def _parse_upper(html):
+    """Module-level so the process pool can pickle it"""
+    return html.upper()
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+
+
+class _Session:
+    """Answers GETs from a url -> handler(headers) map, recording the order requests finish in"""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.headers = {}
+        self.requested = []
+        self.finished = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None):
+        with self._lock:
+            self.requested.append(url)
+        response = self.handlers[url](headers or {})
+        with self._lock:
+            self.finished.append(url)
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = _Session({})
+    monkeypatch.setattr(scrape, "pooled_session", lambda pool_size: fake)
+    return fake
+
+
+def _scheduler(**kwargs):
+    kwargs.setdefault("processes", 1)
+    kwargs.setdefault("min_interval", 0)
+    return PageScheduler(_parse_upper, **kwargs)
+
+
+class TestHostRateLimiter:
+    def test_spaces_each_host_independently(self):
+        now = [100.0]
+        slept = []
+        limiter = HostRateLimiter(0.25, clock=lambda: now[0], sleep=slept.append)
+
+        assert limiter.wait("https://a.example/1") == 0
+        assert limiter.wait("https://a.example/2") == pytest.approx(0.25)
+        assert limiter.wait("https://b.example/1") == 0
+        assert limiter.wait("https://a.example/3") == pytest.approx(0.5)
+        assert slept == pytest.approx([0.25, 0.5])
+        assert limiter.waited_seconds == pytest.approx(0.75)
+
+        now[0] = 200.0
+        assert limiter.wait("https://a.example/4") == 0
+
+
+class TestPageScheduler:
+    def test_results_in_submit_order(self, session):
+        def slow_then_fast(delay, body):
+            def handler(headers):
+                time.sleep(delay)
+                return _Response(200, body)
+            return handler
+
+        urls = [f"https://a.example/{i}" for i in range(4)]
+        session.handlers = {url: slow_then_fast(0.2 - 0.05 * i, f"page {i}") for i, url in enumerate(urls)}
+        with _scheduler(concurrency=4) as scheduler:
+            futures = [scheduler.submit(url) for url in urls]
+            pages = [future.result() for future in futures]
+        assert session.finished != urls  # later pages finished first
+        assert [page.url for page in pages] == urls
+        assert [page.parsed for page in pages] == [f"PAGE {i}" for i in range(4)]
+        assert scheduler.counters["parsed"] == 4
+
+    def test_304_served_from_cache(self, session, tmp_path):
+        url = "https://a.example/page"
+        cache = PageCache(str(tmp_path))
+        cache.store(url, "cached body", '"v1"', None)
+        session.handlers = {url: lambda headers: _Response(304 if headers.get("If-None-Match") == '"v1"' else 200, "new")}
+
+        with _scheduler(cache=cache) as scheduler:
+            page = scheduler.submit(url).result()
+        assert page.parsed == "CACHED BODY"
+        assert page.cached.body == "cached body"
+        assert not page.unchanged
+        assert scheduler.counters["not_modified"] == 1 and scheduler.counters["bytes"] == 0
+
+    def test_unchanged_page_not_parsed(self, session, tmp_path):
+        url = "https://a.example/page"
+        cache = PageCache(str(tmp_path))
+        sha256 = cache.store(url, "cached body", '"v1"', None)
+        cache.mark_written(url, sha256)
+        session.handlers = {url: lambda headers: _Response(304)}
+
+        with _scheduler(cache=cache) as scheduler:
+            page = scheduler.submit(url, skip_unchanged=True).result()
+        assert page.unchanged and page.parsed is None and page.sha256 == sha256
+        assert scheduler.counters["parsed"] == 0
+
+    def test_failed_fetch_has_no_hash(self, session):
+        def refuse(headers):
+            raise requests.ConnectionError("refused")
+
+        session.handlers = {"https://a.example/500": lambda headers: _Response(500), "https://a.example/down": refuse}
+        with _scheduler() as scheduler:
+            pages = [scheduler.submit(url).result() for url in session.handlers]
+        assert [(page.sha256, page.parsed) for page in pages] == [(None, None), (None, None)]
+        assert scheduler.counters["failed"] == 2
+
+    def test_exceptional_exit_cancels_queued_fetches(self, session):
+        release = threading.Event()
+
+        def blocked(headers):
+            release.wait(5)
+            return _Response(200, "page")
+
+        urls = [f"https://a.example/{i}" for i in range(10)]
+        session.handlers = {url: blocked for url in urls}
+        threading.Timer(0.2, release.set).start()
+        with pytest.raises(KeyboardInterrupt):
+            with _scheduler(concurrency=1) as scheduler:
+                futures = [scheduler.submit(url) for url in urls]
+                raise KeyboardInterrupt
+        assert session.requested == urls[:1]
+        for future in futures[1:]:
+            with pytest.raises(CancelledError):
+                future.result(timeout=1)
@@ -0,0 +1,93 @@
+"""Tests for spotrac.main's page cache handling of unresolved players."""
+
+import csv
+import hashlib
+
+import pytest
+
+from data_generation import player_lookup, review_queue, save, scrape, spotrac
+from data_generation.page_cache import PageCache
+from data_generation.records import Player
+
+YEAR = spotrac.CURRENT_YEAR
+PAGE_URL = spotrac.PRE_ARB_URL.format(year=YEAR)
+
+PAGE = f"""<html><body><table>
+<thead><tr><th>Player</th><th>Pos</th><th>Age</th><th>YOS</th><th>Value</th></tr></thead>
+<tbody>
+<tr><td><a href="https://www.spotrac.com/mlb/player/_/id/101/known-player">Known Player</a></td>
+    <td>SP</td><td>25</td><td>1.1</td><td>$800,000</td></tr>
+<tr><td><a href="https://www.spotrac.com/mlb/player/_/id/202/new-rookie">New Rookie</a></td>
+    <td>RP</td><td>24</td><td>0.2</td><td>$760,000</td></tr>
+</tbody></table></body></html>"""
+ETAG = f'"{hashlib.sha256(PAGE.encode()).hexdigest()[:16]}"'
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+
+
+class _SpotracSession:
+    """Serves PAGE (with an ETag, answering 304 when it matches) and 404s everything else"""
+
+    def __init__(self, *args):
+        self.headers = {}
+
+    def get(self, url, headers=None, timeout=None):
+        if url != PAGE_URL:
+            return _Response(404)
+        if (headers or {}).get("If-None-Match") == ETAG:
+            return _Response(304, headers={"ETag": ETAG})
+        return _Response(200, PAGE, {"ETag": ETAG})
+
+    def close(self):
+        pass
+
+
+def _refresh():
+    spotrac.refresh_object_caches()
+    player_lookup.refresh_caches()
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.setattr(save, "DATASET_BACKEND", "csv")
+    for name in ("PLAYERS_FILE", "CONTRACTS_FILE", "REVIEW_QUEUE_FILE", "BATTER_STATS_FILE", "PITCHER_STATS_FILE"):
+        monkeypatch.setattr(save, name, str(tmp_path / f"{name.lower()}.csv"))
+    page_dir = str(tmp_path / "pages")
+    monkeypatch.setattr(spotrac, "PageCache", lambda: PageCache(page_dir))
+    monkeypatch.setattr(scrape, "pooled_session", _SpotracSession)
+    # Nobody new can be found on FanGraphs, so New Rookie is queued for review
+    monkeypatch.setattr(spotrac, "search_fangraphs_by_name_range", lambda *args: [])
+
+    save.write_players_to_file([Player("Player_101", 1001, "Known", "Player", "SP", "https://www.spotrac.com/mlb/player/_/id/101/known-player")])
+    _refresh()
+    yield PageCache(page_dir)
+    _refresh()
+
+
+def _contract_ids():
+    with open(save.CONTRACTS_FILE, newline="") as f:
+        return {row["contract_id"] for row in csv.DictReader(f)}
+
+
+def test_queued_player_contract_written_after_resolution(dataset):
+    spotrac.main(YEAR, non_interactive=True, min_interval=0)
+    assert _contract_ids() == {f"Player_101_{YEAR}"}
+    [item] = save.read_review_queue()
+    assert dataset.lookup(PAGE_URL).written_sha256 is None  # not marked: a row is unresolved
+
+    # Resolve the queued player, as review_queue.process_queue does
+    player = review_queue.create_player_from_queue_item(item, 2002, {})
+    save.write_players_to_file([player])
+    save.remove_review_queue_item(item)
+    _refresh()
+
+    # Same page body (a 304): it is still re-read, and the resolved player's contract is written
+    spotrac.main(YEAR, non_interactive=True, min_interval=0)
+    assert _contract_ids() == {f"Player_101_{YEAR}", f"Rookie_202_{YEAR}"}
+    assert dataset.lookup(PAGE_URL).written_sha256 is not None
@@ -0,0 +1,101 @@
+"""Tests for the SQLite dataset backend, through save.py's dispatch."""
+
+import csv
+from datetime import datetime
+
+import pytest
+
+from data_generation import save, sqlite_store
+from data_generation.records import BatterStats, Player, PitcherStats, ReviewQueueItem, Salary
+
+CURRENT = 2025
+PAST = 2023
+
+
+@pytest.fixture(autouse=True)
+def sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(save, "DATASET_BACKEND", "sqlite")
+    monkeypatch.setattr(save, "CURRENT_YEAR", CURRENT)
+    monkeypatch.setattr(sqlite_store, "DATABASE_FILE", str(tmp_path / "dataset.sqlite3"))
+    for name in ("PLAYERS_FILE", "CONTRACTS_FILE", "REVIEW_QUEUE_FILE", "BATTER_STATS_FILE", "PITCHER_STATS_FILE"):
+        monkeypatch.setattr(save, name, str(tmp_path / f"{name.lower()}.csv"))
+    save._STATS_KEY_INDEX.clear()
+    yield
+    save._STATS_KEY_INDEX.clear()
+
+
+def _player(player_id, fangraphs_id=1, position="SP"):
+    return Player(player_id, fangraphs_id, "First", player_id.split("_")[0], position, f"https://x/id/{player_id}")
+
+
+def _queue_item(last_name, year=CURRENT):
+    return ReviewQueueItem("First", last_name, year, f"https://x/id/1/{last_name}", {10: "A", 20: "B"},
+                           datetime(2025, 3, 1, 12, 0, 0))
+
+
+class TestStats:
+    def test_past_year_kept_current_year_replaced(self):
+        save.write_pitcher_stats([PitcherStats("A_1", PAST, 1, games=30), PitcherStats("A_1", CURRENT, 1, games=5)])
+        save.write_pitcher_stats([PitcherStats("A_1", PAST, 1, games=99), PitcherStats("A_1", CURRENT, 1, games=6),
+                                  PitcherStats("B_2", CURRENT, 3, games=1)])
+        stats = {stat.get_key(): stat.games for stat in save.read_pitcher_stats()}
+        assert stats == {("A_1", PAST, 1): 30, ("A_1", CURRENT, 1): 6, ("B_2", CURRENT, 3): 1}
+
+    def test_batter_and_pitcher_tables_are_separate(self):
+        save.write_stats_to_file([BatterStats("A_1", PAST, 1, hits=100)], [PitcherStats("A_1", PAST, 1, wins=3)])
+        assert [stat.hits for stat in save.read_batter_stats()] == [100]
+        assert [stat.wins for stat in save.read_pitcher_stats()] == [3]
+
+
+class TestInsertIfAbsent:
+    def test_players_keep_first_write(self):
+        save.write_players_to_file([_player("A_1", position="SP")])
+        save.write_players_to_file([_player("A_1", position="RP"), _player("B_2")])
+        assert [(p.player_id, p.position) for p in save.read_players_from_file()] == [("A_1", "SP"), ("B_2", "SP")]
+
+    def test_duplicate_contract_ids_dropped(self):
+        first = Salary("A_1_2024", "A_1", 25, 1.1, 2024, 1, 0.7, "pre-arb")
+        save.write_contracts_to_file([first, Salary("A_1_2024", "A_1", 25, 1.1, 2024, 1, 9.9, "pre-arb")])
+        save.write_contracts_to_file([Salary("A_1_2024", "A_1", 25, 1.1, 2024, 1, 5.0, "arb")])
+        assert save.read_contracts_from_file() == [first]
+
+    def test_overwrite_replaces_everything(self):
+        save.write_players_to_file([_player("A_1")])
+        save.write_players_to_file([_player("B_2")], overwrite=True)
+        assert [p.player_id for p in save.read_players_from_file()] == ["B_2"]
+
+
+class TestReviewQueue:
+    def test_write_read_remove(self):
+        save.write_review_queue_item(_queue_item("Doe"))
+        save.write_review_queue_item(_queue_item("Doe"))
+        save.write_review_queue_item(_queue_item("Roe"))
+        assert save.read_review_queue() == [_queue_item("Doe"), _queue_item("Roe")]
+        save.remove_review_queue_item(_queue_item("Doe"))
+        assert save.read_review_queue() == [_queue_item("Roe")]
+
+
+class TestCsvRoundTrip:
+    def test_import_then_export_reproduces_the_csvs(self, monkeypatch):
+        monkeypatch.setattr(save, "DATASET_BACKEND", "csv")
+        save.write_players_to_file([_player("A_1"), _player("B_2", fangraphs_id=2)])
+        save.write_contracts_to_file([Salary("A_1_2024", "A_1", 25, 1.1, 2024, 1, 0.7, "pre-arb"),
+                                      Salary("B_2_2024", "B_2", None, None, 2024, 3, 30.0, "free-agent")])
+        save.write_stats_to_file([BatterStats("A_1", PAST, 1, hits=100, batting_avg=0.25)],
+                                 [PitcherStats("B_2", CURRENT, 3, innings_pitched=150.1, era=3.21)])
+        save.write_review_queue_item(_queue_item("Doe"))
+        paths = [save.PLAYERS_FILE, save.CONTRACTS_FILE, save.BATTER_STATS_FILE, save.PITCHER_STATS_FILE,
+                 save.REVIEW_QUEUE_FILE]
+        before = {path: _read(path) for path in paths}
+
+        sqlite_store.import_csv()
+        monkeypatch.setattr(save, "DATASET_BACKEND", "sqlite")
+        assert len(save.read_contracts_from_file()) == 2
+        sqlite_store.export_csv()
+
+        assert {path: _read(path) for path in paths} == before
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
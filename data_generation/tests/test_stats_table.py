@@ -0,0 +1,90 @@
+"""Tests for the columnar StatsTable and its StatsRow views."""
+
+import numpy as np
+import pytest
+
+from data_generation import columnar, save
+from data_generation.records import PitcherStats
+from data_generation.stats_table import StatsTable, _encode_float, _encode_int
+
+RECORDS = [
+    PitcherStats("A_1", 2021, 1, games=30, innings_pitched=180.1, era=3.21, whip=1.105, k_pct=0.25),
+    PitcherStats("A_1", 2022, 1, games=28, innings_pitched=150.2, era=None, whip=1.2, k_pct=0.231),
+    PitcherStats("A_1", 2022, 3, games=58, innings_pitched=331.0, era=3.5, war=4.7),
+    PitcherStats("B_2", 2019, 1, games=None, holds=40000, era=9.99),
+    PitcherStats("B_2", 2023, 1, games=70, saves=-3),
+]
+
+
+@pytest.fixture
+def table():
+    return StatsTable.from_records(PitcherStats, RECORDS)
+
+
+class TestEncoding:
+    def test_float32_with_decimals_round_trips(self, table):
+        assert table._columns["era"].dtype == np.float32
+        assert table._decimals["whip"] == 3
+        assert table.to_records() == RECORDS
+
+    def test_unrepresentable_floats_stay_float64(self):
+        values = np.array([0.1 + 1e-12, np.nan, 1 / 3])
+        encoded, decimals = _encode_float(values)
+        assert decimals is None and encoded.dtype == np.float64
+
+    def test_int_narrowest_dtype_and_sentinel(self):
+        values = np.array([1, 0, 127, -5])
+        valid = np.array([True, False, True, True])
+        encoded = _encode_int(values, valid)
+        assert encoded.dtype == np.int8
+        assert encoded[1] == np.iinfo(np.int8).min
+        # -128 itself is the sentinel, so a present -128 needs the next size up
+        assert _encode_int(np.array([-128]), np.array([True])).dtype == np.int16
+
+    def test_missing_values(self, table):
+        assert table._columns["holds"].dtype == np.int32
+        assert list(table.valid("games")) == [True, True, True, False, True]
+        assert list(table.valid("era")) == [True, False, True, True, False]
+        assert table[3].games is None and table[1].era is None
+        assert table[4].saves == -3
+
+
+class TestLookup:
+    def test_get_and_contains(self, table):
+        assert table.get(("A_1", 2022, 3)) == RECORDS[2]
+        assert ("B_2", 2023, 1) in table
+        assert ("A_1", 2022, 5) not in table
+        assert ("A_1", 2020, 1) not in table
+        assert table.get(("Z_9", 2022, 1), "missing") == "missing"
+
+    def test_repeated_key_last_row_wins(self):
+        records = RECORDS + [PitcherStats("A_1", 2021, 1, games=31)]
+        assert StatsTable.from_records(PitcherStats, records).get(("A_1", 2021, 1)).games == 31
+
+    def test_year_spans(self, table):
+        assert table.year_spans() == {"A_1": (2021, 2022), "B_2": (2019, 2023)}
+        assert table.year_spans(3) == {"A_1": (2022, 2022)}
+        assert table.year_spans(10) == {}
+
+
+class TestEmpty:
+    def test_empty_table(self):
+        table = StatsTable.from_records(PitcherStats, [])
+        assert len(table) == 0
+        assert table.to_records() == []
+        assert table.get(("A_1", 2021, 1)) is None
+        assert table.year_spans() == {}
+
+
+class TestFromArrow:
+    def test_matches_from_records(self, tmp_path, monkeypatch):
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / "pitcher_stats.csv")
+        save._upsert_stats(path, PitcherStats, RECORDS, overwrite=True)
+        monkeypatch.setattr(save, "PITCHER_STATS_FILE", path)
+
+        from_csv = StatsTable.from_records(PitcherStats, save._read_pitcher_stats_csv())
+        from_arrow = StatsTable.from_arrow(PitcherStats, columnar.read_table("pitcher_stats", csv_path=path))
+        assert from_arrow.to_records() == from_csv.to_records() == RECORDS
+        assert from_arrow.get(("A_1", 2022, 1)) == from_csv.get(("A_1", 2022, 1))
+        assert from_arrow.year_spans() == from_csv.year_spans()
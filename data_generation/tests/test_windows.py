@@ -0,0 +1,103 @@
+"""Tests for window stats built from single-season rows (hand-computed fixtures)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_generation import windows
+
+BATTING_SEASONS = pd.DataFrame([
+    # 2020 is a gap year (no row)
+    {"player_id": "A_1", "Season": 2019, "G": 30, "PA": 100, "AB": 90, "H": 27, "2B": 5, "3B": 1, "HR": 3,
+     "BB": 8, "SO": 20, "HBP": 1, "SF": 1, "WAR": 1.0, "wRC+": 110},
+    {"player_id": "A_1", "Season": 2021, "G": 60, "PA": 200, "AB": 180, "H": 45, "2B": 10, "3B": 0, "HR": 7,
+     "BB": 15, "SO": 40, "HBP": 2, "SF": 3, "WAR": 0.5, "wRC+": 95},
+])
+
+PITCHING_SEASONS = pd.DataFrame([
+    {"player_id": "P_1", "Season": 2022, "IP": 5.1, "ER": 2, "BB": 1, "H": 4, "SO": 6, "TBF": 22, "FIP": 3.0},
+    {"player_id": "P_1", "Season": 2023, "IP": 4.2, "ER": 1, "BB": 2, "H": 3, "SO": 5, "TBF": 20, "FIP": 4.5},
+    {"player_id": "P_1", "Season": 2024, "IP": 0.0, "ER": 1, "BB": 1, "H": 1, "SO": 0, "TBF": 3, "FIP": 99.0},
+    # Zero denominators everywhere
+    {"player_id": "Z_9", "Season": 2022, "IP": 0.0, "ER": 0, "BB": 0, "H": 0, "SO": 0, "TBF": 0, "FIP": 5.0},
+    {"player_id": "Z_9", "Season": 2023, "IP": 0.0, "ER": 0, "BB": 0, "H": 0, "SO": 0, "TBF": 0, "FIP": 5.0},
+    {"player_id": "Z_9", "Season": 2024, "IP": 0.0, "ER": 0, "BB": 0, "H": 0, "SO": 0, "TBF": 0, "FIP": 5.0},
+])
+
+
+@pytest.fixture(autouse=True)
+def completed_seasons(monkeypatch):
+    monkeypatch.setattr(windows, "CURRENT_YEAR", 2030)
+
+
+def _row(frame, player_id, year, window):
+    match = frame[(frame["player_id"] == player_id) & (frame["year"] == year) & (frame["window_years"] == window)]
+    assert len(match) == 1
+    return match.iloc[0]
+
+
+class TestInnings:
+    def test_round_trip(self):
+        assert list(windows._innings_to_outs(np.array([5.1, 4.2, 180.0]))) == [16, 14, 540]
+        assert list(windows._outs_to_innings(np.array([30, 31, 32]))) == [10.0, 10.1, 10.2]
+
+    def test_ratio_zero_denominator(self):
+        result = windows._ratio(np.array([1.0, 2.0, 3.0]), np.array([2.0, 0.0, np.nan]))
+        assert result[0] == 0.5 and np.isnan(result[1]) and np.isnan(result[2])
+
+
+class TestBatting:
+    def test_windows_truncated_at_career_start(self):
+        result = windows.window_stats(BATTING_SEASONS, "batting", {"A_1": (2019, 2021)})
+        # Only the 3-year window ending 2021 lies inside the career
+        assert list(zip(result["year"], result["window_years"])) == [(2021, 3)]
+
+    def test_gap_year_and_rate_stats(self):
+        result = windows.window_stats(BATTING_SEASONS, "batting", {"A_1": (2019, 2021)}, window_sizes=(3,))
+        row = _row(result, "A_1", 2021, 3)
+        assert (row["PA"], row["AB"], row["H"], row["HR"], row["G"]) == (300, 270, 72, 10, 90)
+        assert row["AVG"] == pytest.approx(72 / 270)
+        assert row["OBP"] == pytest.approx(98 / 300)
+        assert row["SLG"] == pytest.approx(119 / 270)
+        assert row["OPS"] == pytest.approx(98 / 300 + 119 / 270)
+        assert row["ISO"] == pytest.approx(47 / 270)
+        assert row["BABIP"] == pytest.approx(62 / 204)
+        assert row["BB%"] == pytest.approx(23 / 300)
+        assert row["K%"] == pytest.approx(60 / 300)
+        assert row["WAR"] == pytest.approx(1.5)
+        assert row["wRC+"] == pytest.approx((110 * 100 + 95 * 200) / 300)
+
+    def test_missing_column_is_nan_not_zero(self):
+        result = windows.window_stats(BATTING_SEASONS, "batting", {"A_1": (2019, 2021)}, window_sizes=(3,))
+        assert np.isnan(_row(result, "A_1", 2021, 3)["HardHit%"])
+
+
+class TestPitching:
+    @pytest.fixture
+    def result(self):
+        return windows.window_stats(PITCHING_SEASONS, "pitching", {"P_1": (2022, 2024), "Z_9": (2022, 2024)},
+                                    window_sizes=(3,))
+
+    def test_innings_summed_as_outs(self, result):
+        row = _row(result, "P_1", 2024, 3)
+        # 5.1 + 4.2 + 0.0 = 16 + 14 outs = 10.0 innings
+        assert row["IP"] == pytest.approx(10.0)
+
+    def test_rate_stats_per_inning(self, result):
+        row = _row(result, "P_1", 2024, 3)
+        assert row["ERA"] == pytest.approx(9 * 4 / 10)
+        assert row["WHIP"] == pytest.approx((4 + 8) / 10)
+        assert row["K/9"] == pytest.approx(9 * 11 / 10)
+        assert row["BB/9"] == pytest.approx(9 * 4 / 10)
+        assert row["K%"] == pytest.approx(11 / 45)
+        assert row["K/BB"] == pytest.approx(11 / 4)
+
+    def test_ip_weighted_fip(self, result):
+        # The 0-inning season carries no weight
+        assert _row(result, "P_1", 2024, 3)["FIP"] == pytest.approx((3.0 * 16 + 4.5 * 14) / 30)
+
+    def test_zero_denominators_are_nan(self, result):
+        row = _row(result, "Z_9", 2024, 3)
+        assert row["IP"] == 0
+        for column in ("ERA", "WHIP", "K/9", "K%", "K/BB", "FIP"):
+            assert np.isnan(row[column]), column
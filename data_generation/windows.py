@@ -0,0 +1,223 @@
+"""
+Local Window Aggregator
+
+Builds the 3/5/10-year window stats (window_years > 1) from single-season
+leaderboard rows instead of asking FanGraphs for a multi-season aggregated
+leaderboard (batting_stats(start, end, ind=0)) per player, year and window.
+No remote calls: every window for every player comes out of one vectorized
+pass over a (player x season) grid of the season rows stats.py already has.
+
+How each stat is built from the seasons in a window:
+- Counting stats (G, PA, AB, H, 2B, 3B, HR, R, RBI, SB, CS, BB, SO, HBP, SF;
+  GS, W, L, SV, HLD, ER, TBF) are summed. IP is summed in outs, since
+  FanGraphs writes 180.1 for 180 1/3 innings, and written back the same way.
+- Rate stats are recomputed from the summed components, exactly as FanGraphs
+  defines them:
+  - AVG, OBP, SLG, OPS and ISO
+  - BABIP
+  - batting K% and BB% (per PA)
+  - ERA, WHIP, K/9 and BB/9 (per IP)
+  - pitching K% and BB% (per TBF)
+  - K/BB
+- Proprietary metrics can't be rebuilt from counting stats, so they are
+  approximated:
+  - WAR is summed (FanGraphs' multi-season WAR is a sum too, up to rounding)
+  - wRC+, HardHit% and Barrel% are PA-weighted means of the season values
+  - FIP, xFIP, SIERA, GB%, FB% and pitching HardHit% are IP-weighted means
+  FanGraphs computes these from pooled components against each season's
+  league constants, so the weighted means can differ slightly in the last
+  decimals.
+
+A missing column or season value counts as absent, not zero: a window stat
+is NaN when none of its seasons has the inputs.
+
+Key functions:
+- window_stats(season_rows, group, spans, window_sizes=WINDOW_SIZES) -> pd.DataFrame
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Different lookback periods for model
+WINDOW_SIZES = (3, 5, 10)
+
+CURRENT_YEAR = datetime.now().year
+
+BATTING_SUMMED = ["G", "PA", "AB", "H", "2B", "3B", "HR", "R", "RBI", "SB", "CS", "BB", "SO", "HBP", "SF", "WAR"]
+BATTING_PA_WEIGHTED = ["wRC+", "HardHit%", "Barrel%"]
+
+PITCHING_SUMMED = ["G", "GS", "W", "L", "SV", "HLD", "SO", "BB", "H", "HR", "ER", "TBF", "WAR"]
+PITCHING_IP_WEIGHTED = ["FIP", "xFIP", "SIERA", "GB%", "FB%", "HardHit%"]
+
+
+def _innings_to_outs(innings: np.ndarray) -> np.ndarray:
+    """FanGraphs IP notation (180.1 = 180 1/3) to outs"""
+    whole = np.floor(innings + 1e-9)
+    return whole * 3 + np.round((innings - whole) * 10)
+
+
+def _outs_to_innings(outs: np.ndarray) -> np.ndarray:
+    """Outs back to FanGraphs IP notation"""
+    return np.floor(outs / 3) + (outs % 3) / 10
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, NaN where the denominator is zero or missing"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+class _SeasonGrid:
+    """Season rows laid out as (player, season) arrays with window sums by cumulative sum"""
+
+    def __init__(self, season_rows: pd.DataFrame, players: list, first_season: int, last_season: int):
+        self.players = players
+        self.first_season = first_season
+        self.n_seasons = last_season - first_season + 1
+        codes = {player_id: i for i, player_id in enumerate(players)}
+        self._rows = season_rows["player_id"].map(codes).to_numpy()
+        self._cols = season_rows["Season"].to_numpy(dtype=np.int64) - first_season
+        self._frame = season_rows
+        present = np.zeros((len(players), self.n_seasons), dtype=bool)
+        present[self._rows, self._cols] = True
+        self.present = present
+        self._present_sums = self._cumulative(present.astype(np.float64))
+
+    def values(self, column: str) -> np.ndarray:
+        """(player, season) grid of one column, NaN where absent"""
+        grid = np.full((len(self.players), self.n_seasons), np.nan)
+        if column in self._frame.columns:
+            grid[self._rows, self._cols] = pd.to_numeric(self._frame[column], errors="coerce").to_numpy(dtype=np.float64)
+        return grid
+
+    @staticmethod
+    def _cumulative(grid: np.ndarray) -> np.ndarray:
+        padded = np.zeros((grid.shape[0], grid.shape[1] + 1))
+        np.cumsum(grid, axis=1, out=padded[:, 1:])
+        return padded
+
+    def window_sum(self, grid: np.ndarray, window: int) -> np.ndarray:
+        """Sum over each window ending at every season; NaN where no season had a value"""
+        totals = self._cumulative(np.nan_to_num(grid))
+        counts = self._cumulative((~np.isnan(grid)).astype(np.float64))
+        ends = np.arange(1, self.n_seasons + 1)
+        starts = np.maximum(ends - window, 0)
+        summed = totals[:, ends] - totals[:, starts]
+        return np.where(counts[:, ends] - counts[:, starts] > 0, summed, np.nan)
+
+    def window_seasons(self, window: int) -> np.ndarray:
+        """Number of seasons with a row in each window"""
+        ends = np.arange(1, self.n_seasons + 1)
+        starts = np.maximum(ends - window, 0)
+        return self._present_sums[:, ends] - self._present_sums[:, starts]
+
+    def weighted_mean(self, column: str, weights: np.ndarray, window: int) -> np.ndarray:
+        """Weight-averaged column over each window, using seasons that have both"""
+        values = self.values(column)
+        usable = ~np.isnan(values) & ~np.isnan(weights)
+        weighted = self.window_sum(np.where(usable, values * weights, np.nan), window)
+        total_weight = self.window_sum(np.where(usable, weights, np.nan), window)
+        return _ratio(weighted, total_weight)
+
+
+def _batting_window(grid: _SeasonGrid, window: int) -> Dict[str, np.ndarray]:
+    out = {column: grid.window_sum(grid.values(column), window) for column in BATTING_SUMMED}
+    pa_weights = grid.values("PA")
+    for column in BATTING_PA_WEIGHTED:
+        out[column] = grid.weighted_mean(column, pa_weights, window)
+
+    h, ab, bb, so, hr = out["H"], out["AB"], out["BB"], out["SO"], out["HR"]
+    hbp, sf = np.nan_to_num(out["HBP"]), np.nan_to_num(out["SF"])
+    total_bases = h + out["2B"] + 2 * out["3B"] + 3 * hr
+    out["AVG"] = _ratio(h, ab)
+    out["OBP"] = _ratio(h + bb + hbp, ab + bb + hbp + sf)
+    out["SLG"] = _ratio(total_bases, ab)
+    out["OPS"] = out["OBP"] + out["SLG"]
+    out["ISO"] = out["SLG"] - out["AVG"]
+    out["BABIP"] = _ratio(h - hr, ab - so - hr + sf)
+    out["BB%"] = _ratio(bb, out["PA"])
+    out["K%"] = _ratio(so, out["PA"])
+    return out
+
+
+def _pitching_window(grid: _SeasonGrid, window: int) -> Dict[str, np.ndarray]:
+    out = {column: grid.window_sum(grid.values(column), window) for column in PITCHING_SUMMED}
+    season_outs = _innings_to_outs(grid.values("IP"))
+    outs = grid.window_sum(season_outs, window)
+    for column in PITCHING_IP_WEIGHTED:
+        out[column] = grid.weighted_mean(column, season_outs, window)
+
+    innings = outs / 3
+    out["IP"] = _outs_to_innings(outs)
+    out["ERA"] = _ratio(9 * out["ER"], innings)
+    out["WHIP"] = _ratio(out["BB"] + out["H"], innings)
+    out["K/9"] = _ratio(9 * out["SO"], innings)
+    out["BB/9"] = _ratio(9 * out["BB"], innings)
+    out["K%"] = _ratio(out["SO"], out["TBF"])
+    out["BB%"] = _ratio(out["BB"], out["TBF"])
+    out["K/BB"] = _ratio(out["SO"], out["BB"])
+    return out
+
+
+def window_stats(season_rows: pd.DataFrame, group: str, spans: Dict[str, Tuple[int, int]],
+                 window_sizes: Iterable[int] = WINDOW_SIZES) -> pd.DataFrame:
+    """
+    Window stats for every player, year and window size, from single-season rows.
+
+    A window ending in `year` covers seasons year-window+1..year and is only
+    built when that whole range lies inside the player's career span. Gap
+    years inside it (injury, minors) simply contribute nothing. For the
+    current season it is only built if the player has a row this season,
+    so a partial year doesn't masquerade as a window ending now.
+
+    Args:
+        season_rows: One row per (player_id, Season) with FanGraphs leaderboard
+            columns (G, PA, AVG, ...), as joined by data_generation/leaderboards.py
+        group: "batting" or "pitching"
+        spans: Internal player ID -> (first year, last year) of their career
+        window_sizes: Window lengths in seasons
+
+    Returns:
+        One row per (player_id, year, window_years) that has at least one
+        season in the window, with FanGraphs column names, sorted by player,
+        year and window
+    """
+    players = [player_id for player_id in spans if player_id in set(season_rows["player_id"])]
+    if not players:
+        return pd.DataFrame(columns=["player_id", "year", "window_years"])
+
+    first_season = min(int(season_rows["Season"].min()), min(spans[p][0] for p in players))
+    last_season = max(int(season_rows["Season"].max()), max(spans[p][1] for p in players))
+    grid = _SeasonGrid(season_rows[season_rows["player_id"].isin(players)], players, first_season, last_season)
+    build = _batting_window if group == "batting" else _pitching_window
+
+    years = np.arange(first_season, last_season + 1)
+    span_starts = np.array([spans[p][0] for p in players])[:, None]
+    span_ends = np.array([spans[p][1] for p in players])[:, None]
+    current = years == CURRENT_YEAR
+
+    frames = []
+    for window in window_sizes:
+        eligible = (years - window + 1 >= span_starts) & (years <= span_ends)
+        eligible &= ~current | grid.present
+        eligible &= grid.window_seasons(window) > 0
+        player_idx, season_idx = np.nonzero(eligible)
+        if not len(player_idx):
+            continue
+        columns = {name: values[player_idx, season_idx] for name, values in build(grid, window).items()}
+        frames.append(pd.DataFrame({
+            "player_id": [players[i] for i in player_idx],
+            "year": years[season_idx],
+            "window_years": window,
+            **columns,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=["player_id", "year", "window_years"])
+    order = {player_id: i for i, player_id in enumerate(players)}
+    result = pd.concat(frames, ignore_index=True)
+    result["_order"] = result["player_id"].map(order)
+    return result.sort_values(["_order", "year", "window_years"]).drop(columns="_order").reset_index(drop=True)